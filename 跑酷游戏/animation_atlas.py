@@ -0,0 +1,167 @@
+# animation_atlas.py
+"""角色动画帧图集。
+
+把一组动画帧拼接到一张大图上，并记录每一帧在大图中的位置，
+绘制时只需要从同一张 Surface 中 blit 子区域。
+拼好的图集会保存到资源缓存目录，下次启动时源文件未修改就直接读取，
+同一组帧在内存中也只保留一份，多个角色可以共用。
+
+每个角色用到哪些帧、每帧持续多久以及碰撞框，由动画清单 animations.json 描述，
+清单只解析一次，角色的帧在第一次用到时才加载。
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+
+import pygame
+
+from asset_manager import BAKED_DIR, assets, source_signature
+
+
+# 角色动画清单文件
+ANIMATION_MANIFEST = 'animations.json'
+
+# 内存中的图集缓存：键为 (帧路径元组, 帧尺寸)
+_atlas_cache = {}
+
+# 已解析的动画清单：键为清单路径
+_manifest_cache = {}
+
+
+def natural_sort_key(path):
+    """按自然顺序排序的键，frame_2 排在 frame_10 前面"""
+    return [int(part) if part.isdigit() else part.lower()
+            for part in re.split(r'(\d+)', os.path.basename(path))]
+
+
+class AnimationAtlas:
+    """一张拼接好的动画图集和对应的帧位置表。"""
+
+    def __init__(self, surface, frame_rects):
+        self.surface = surface
+        self.frame_rects = frame_rects
+
+    def __len__(self):
+        return len(self.frame_rects)
+
+    @classmethod
+    def build(cls, image_paths, frame_size=(50, 50), columns=8):
+        """加载所有帧并拼接成图集，加载失败的帧会被跳过"""
+        frames = []
+        for path in image_paths:
+            image = assets.load(path, frame_size)
+            if image:
+                frames.append(image)
+                print(f"加载动画帧: {os.path.basename(path)}")
+
+        width, height = frame_size
+        columns = max(1, min(columns, len(frames)))
+        rows = max(1, math.ceil(len(frames) / columns))
+        surface = pygame.Surface((columns * width, rows * height), pygame.SRCALPHA)
+
+        frame_rects = []
+        for i, frame in enumerate(frames):
+            rect = pygame.Rect((i % columns) * width, (i // columns) * height, width, height)
+            surface.blit(frame, rect)
+            frame_rects.append(rect)
+
+        return cls(surface, frame_rects)
+
+    def save(self, sheet_path, table_path, sources):
+        """把图集和帧位置表保存到磁盘"""
+        pygame.image.save(self.surface, sheet_path)
+        table = {
+            "sources": sources,
+            "frames": [list(rect) for rect in self.frame_rects],
+        }
+        with open(table_path, 'w', encoding='utf-8') as f:
+            json.dump(table, f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, sheet_path, table_path, sources):
+        """读取磁盘上的图集，源文件有变化或文件缺失时返回 None"""
+        if not os.path.exists(sheet_path) or not os.path.exists(table_path):
+            return None
+        try:
+            with open(table_path, 'r', encoding='utf-8') as f:
+                table = json.load(f)
+            if table.get("sources") != sources:
+                return None
+            surface = assets.convert_surface(pygame.image.load(sheet_path))
+        except Exception as e:
+            print(f"读取动画图集失败: {e}")
+            return None
+        return cls(surface, [pygame.Rect(rect) for rect in table["frames"]])
+
+
+def get_animation_atlas(image_paths, frame_size=(50, 50), cache_dir=BAKED_DIR):
+    """获取动画图集：优先使用内存缓存，其次是磁盘缓存，最后重新拼接"""
+    key = (tuple(image_paths), tuple(frame_size))
+    if key in _atlas_cache:
+        return _atlas_cache[key]
+
+    sources = []
+    for path in image_paths:
+        try:
+            sources.append([path] + source_signature(path))
+        except OSError:
+            sources.append([path, None, None])
+    sources.append(list(frame_size))
+
+    # 文件名只由帧列表和尺寸决定，源文件修改后会覆盖旧的缓存文件
+    name = json.dumps([list(image_paths), list(frame_size)], ensure_ascii=False)
+    digest = hashlib.sha1(name.encode('utf-8')).hexdigest()[:16]
+    sheet_path = os.path.join(cache_dir, f"atlas_{digest}.png")
+    table_path = os.path.join(cache_dir, f"atlas_{digest}.json")
+
+    atlas = AnimationAtlas.load(sheet_path, table_path, sources)
+    if atlas is None:
+        atlas = AnimationAtlas.build(image_paths, frame_size)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            atlas.save(sheet_path, table_path, sources)
+        except Exception as e:
+            print(f"保存动画图集失败: {e}")
+
+    _atlas_cache[key] = atlas
+    return atlas
+
+
+def load_animation_manifest(manifest_path=ANIMATION_MANIFEST):
+    """读取动画清单（每个清单文件只解析一次），读取失败时返回空字典"""
+    if manifest_path in _manifest_cache:
+        return _manifest_cache[manifest_path]
+
+    manifest = {}
+    if os.path.exists(manifest_path):
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except Exception as e:
+            print(f"读取动画清单失败: {e}")
+
+    _manifest_cache[manifest_path] = manifest
+    return manifest
+
+
+def get_character_animation(name, manifest_path=ANIMATION_MANIFEST):
+    """按名称获取角色动画，返回 (图集, 每帧持续帧数, 碰撞框)
+
+    清单中没有该角色时返回 None。
+    """
+    spec = load_animation_manifest(manifest_path).get(name)
+    if not spec:
+        return None
+
+    frame_size = tuple(spec.get("frame_size", (50, 50)))
+    atlas = get_animation_atlas(spec["frames"], frame_size)
+
+    durations = spec.get("frame_durations")
+    if not durations or len(durations) != len(atlas):
+        durations = [spec.get("frame_duration", 10)] * len(atlas)
+
+    hitbox = tuple(spec.get("hitbox", (0, 0) + frame_size))
+    return atlas, durations, hitbox
@@ -0,0 +1,93 @@
+# asset_loader.py
+"""分阶段的后台资源加载器。
+
+资源按阶段（例如 menu、gameplay）排好优先级，在后台线程中依次加载，
+主线程每帧调用 collect_results() 取回加载好的结果并应用，
+同时可以通过 progress / current_task 显示加载进度。
+后台线程只做解码、缩放这类不依赖显示器的工作，转换像素格式、合成图片等
+需要在主线程中进行的工作放在任务的完成函数中，由 collect_results() 调用。
+"""
+
+import threading
+
+
+class AssetLoader:
+    """按阶段顺序在后台线程中执行加载任务。
+
+    每个任务是 (名称, 函数) 或 (名称, 函数, 完成函数)，函数返回 {属性名: 值} 字典，
+    由主线程通过 collect_results() 取回后设置到游戏对象上。
+    主线程取回结果后先调用 prepare()，有完成函数的任务再用完成函数把结果转换成最终的字典。
+    """
+
+    def __init__(self, prepare=None):
+        self.stages = []  # [(阶段名, [(任务名, 函数, 完成函数), ...]), ...]
+        self.prepare = prepare  # 调用完成函数前在主线程中调用（例如统一转换图片的像素格式）
+        self.finished_stages = set()
+        self.results = []
+        self.error = None
+        self.current_task = None
+        self.done_count = 0
+
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def add_stage(self, stage_name, tasks):
+        """添加一个加载阶段，阶段按添加顺序加载"""
+        self.stages.append((stage_name, [(task[0], task[1], task[2] if len(task) > 2 else None)
+                                         for task in tasks]))
+
+    @property
+    def total_count(self):
+        return sum(len(tasks) for _, tasks in self.stages)
+
+    @property
+    def progress(self):
+        """加载进度（0.0 ~ 1.0）"""
+        total = self.total_count
+        return self.done_count / total if total else 1.0
+
+    def start(self):
+        """启动后台加载线程"""
+        self._thread = threading.Thread(target=self.run, name="asset-loader", daemon=True)
+        self._thread.start()
+
+    def run(self):
+        """依次执行所有阶段的任务（后台线程入口，也可以直接同步调用）"""
+        for stage_name, tasks in self.stages:
+            for task_name, func, finish in tasks:
+                self.current_task = task_name
+                try:
+                    result = func()
+                except Exception as e:
+                    print(f"加载资源失败({task_name}): {e}")
+                    with self._lock:
+                        self.error = e
+                    return
+                with self._lock:
+                    self.results.append((finish, result))
+                    self.done_count += 1
+            with self._lock:
+                self.finished_stages.add(stage_name)
+        self.current_task = None
+
+    def wait(self):
+        """等待后台加载全部完成"""
+        if self._thread:
+            self._thread.join()
+
+    def collect_results(self):
+        """取回已经加载完成的结果（主线程调用），加载出错时在主线程重新抛出"""
+        with self._lock:
+            if self.error:
+                raise self.error
+            results, self.results = self.results, []
+        if results and self.prepare:
+            self.prepare()
+        merged = {}
+        for finish, result in results:
+            merged.update(finish(result) if finish else result)
+        return merged
+
+    def is_stage_ready(self, stage_name):
+        with self._lock:
+            return stage_name in self.finished_stages and not self.results
@@ -0,0 +1,241 @@
+# asset_manager.py
+"""统一的图片资源管理模块。
+
+所有图片都通过 AssetManager 加载，按 (路径, 尺寸, 是否透明) 去重缓存：
+- 同一个键只解码、缩放一次，之后直接返回同一个 Surface
+- acquire/release 维护引用计数，被引用的资源不会被淘汰
+- 超出内存预算时按最近最少使用（LRU）顺序淘汰未被引用的资源
+- 记录命中/未命中/淘汰次数，方便观察缓存效果
+- 优先使用 bake_assets 离线预处理好的小尺寸图片（源文件未修改时）
+- 所有操作加锁，可以在后台加载线程中使用
+- 像素格式转换（convert/convert_alpha）只在主线程中进行：后台线程只解码和缩放，
+  由主线程调用 convert_pending() 统一转换，再用 resolve() 替换结果中引用的原图片
+"""
+
+import json
+import os
+import threading
+import weakref
+from collections import OrderedDict
+
+import pygame
+
+
+# 离线预处理资源的输出目录和清单文件名
+BAKED_DIR = 'asset_cache'
+MANIFEST_NAME = 'manifest.json'
+
+
+def baked_key(path, size, alpha):
+    """预处理清单中的键，例如 image/ob1.png|90x90|rgba"""
+    mode = 'rgba' if alpha else 'rgb'
+    return f"{os.path.normpath(os.path.relpath(path))}|{size[0]}x{size[1]}|{mode}"
+
+
+def source_signature(path):
+    """源文件签名（大小和修改时间），用于判断预处理结果是否过期"""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class BakedAssets:
+    """离线预处理资源的索引，读取 bake_assets 生成的清单。"""
+
+    def __init__(self, baked_dir=BAKED_DIR):
+        self.baked_dir = baked_dir
+        self.entries = self.load_manifest()
+
+    def load_manifest(self):
+        manifest_path = os.path.join(self.baked_dir, MANIFEST_NAME)
+        if not os.path.exists(manifest_path):
+            return {}
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get("entries", {})
+        except Exception as e:
+            print(f"读取资源清单失败: {e}")
+            return {}
+
+    def lookup(self, path, size, alpha):
+        """返回未过期的预处理文件路径，没有或已过期时返回 None"""
+        if not size or not self.entries:
+            return None
+
+        entry = self.entries.get(baked_key(path, size, alpha))
+        if not entry:
+            return None
+
+        try:
+            if source_signature(path) != entry["source"]:
+                return None
+        except OSError:
+            return None
+
+        baked_path = os.path.join(self.baked_dir, entry["file"])
+        return baked_path if os.path.exists(baked_path) else None
+
+
+class AssetManager:
+    """带引用计数和LRU淘汰的图片缓存。"""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, baked_dir=BAKED_DIR):
+        self.max_bytes = max_bytes
+        self.baked = BakedAssets(baked_dir)
+        self._lock = threading.RLock()
+        self.entries = OrderedDict()  # 键 -> Surface（加载失败时为 None）
+        self.refcounts = {}
+        self.total_bytes = 0
+        self.convert_images = True  # 无界面模式下不转换像素格式
+        self.pending = set()  # 后台线程加载、还没有转换像素格式的键
+        self.converted = weakref.WeakKeyDictionary()  # 原图片 -> 转换后的图片
+
+        # 统计信息
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(path, size=None, alpha=True):
+        return path, tuple(size) if size else None, alpha
+
+    @staticmethod
+    def surface_bytes(surface):
+        if surface is None:
+            return 0
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def load(self, path, size=None, alpha=True):
+        """加载图片（借用，不增加引用计数）
+
+        加载失败时返回 None，失败结果同样会被缓存，避免重复读取文件。
+        """
+        key = self.make_key(path, size, alpha)
+        with self._lock:
+            if key in self.entries:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return self.entries[key]
+
+            self.misses += 1
+            surface = self._decode(path, size, alpha)
+            self.entries[key] = surface
+            self.total_bytes += self.surface_bytes(surface)
+            self.evict()
+            return surface
+
+    def acquire(self, path, size=None, alpha=True):
+        """加载图片并增加引用计数，被引用的图片不会被淘汰"""
+        key = self.make_key(path, size, alpha)
+        with self._lock:
+            surface = self.load(path, size, alpha)
+            self.refcounts[key] = self.refcounts.get(key, 0) + 1
+            return surface
+
+    def release(self, path, size=None, alpha=True):
+        """减少引用计数，计数归零后图片可以被淘汰"""
+        key = self.make_key(path, size, alpha)
+        with self._lock:
+            count = self.refcounts.get(key, 0) - 1
+            if count > 0:
+                self.refcounts[key] = count
+            else:
+                self.refcounts.pop(key, None)
+            self.evict()
+
+    def evict(self):
+        """超出内存预算时，按LRU顺序淘汰没有被引用的图片"""
+        with self._lock:
+            if self.total_bytes <= self.max_bytes:
+                return
+
+            for key in list(self.entries):
+                if self.total_bytes <= self.max_bytes:
+                    break
+                if self.refcounts.get(key, 0) > 0:
+                    continue
+                surface = self.entries.pop(key)
+                self.total_bytes -= self.surface_bytes(surface)
+                self.evictions += 1
+
+    def clear(self):
+        """清空缓存（包括被引用的图片）"""
+        with self._lock:
+            self.entries.clear()
+            self.refcounts.clear()
+            self.pending.clear()
+            self.total_bytes = 0
+
+    def get_stats(self):
+        """获取缓存统计信息"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+            "total_bytes": self.total_bytes,
+        }
+
+    def convert_surface(self, image, alpha=True):
+        """转换为显示器的像素格式（无界面模式下跳过）"""
+        if not self.convert_images:
+            return image
+        return image.convert_alpha() if alpha else image.convert()
+
+    def convert_pending(self):
+        """把后台线程加载的图片转换为显示器的像素格式（主线程调用）"""
+        with self._lock:
+            for key in self.pending:
+                surface = self.entries.get(key)
+                if surface is None:
+                    continue
+                converted = self.convert_surface(surface, key[2])
+                self.entries[key] = converted
+                self.total_bytes += self.surface_bytes(converted) - self.surface_bytes(surface)
+                self.converted[surface] = converted
+            self.pending.clear()
+
+    def resolve(self, value):
+        """把值（可以是嵌套的字典）中引用的原图片替换为 convert_pending() 转换后的图片"""
+        if isinstance(value, dict):
+            return {name: self.resolve(item) for name, item in value.items()}
+        if isinstance(value, pygame.Surface):
+            return self.converted.get(value, value)
+        return value
+
+    def _decode(self, path, size, alpha):
+        """从磁盘解码并缩放图片（有预处理结果时直接读取，无需缩放）
+
+        在后台线程中调用时不转换像素格式，记录到 pending 中等待主线程转换。
+        """
+        try:
+            baked_path = self.baked.lookup(path, size, alpha)
+            if baked_path:
+                image = pygame.image.load(baked_path)
+            else:
+                image = pygame.image.load(path)
+                if size:
+                    image = pygame.transform.scale(image, size)
+
+            if self.convert_images and threading.current_thread() is not threading.main_thread():
+                self.pending.add(self.make_key(path, size, alpha))
+                return image
+            return self.convert_surface(image, alpha)
+        except Exception as e:
+            print(f"加载图片失败: {path}, 错误: {e}")
+            return None
+
+
+# 全局共享的资源管理器
+assets = AssetManager()
+
+
+def load_image(path, size=None, alpha=True):
+    """从全局资源管理器加载图片"""
+    return assets.load(path, size, alpha)
+
+
+def clear_cache():
+    """清空图片缓存"""
+    assets.clear()
@@ -0,0 +1,75 @@
+# background.py
+"""三层视差背景合成器。
+
+每一层背景预先横向拼接成 1600 宽的长条，滚动时只需要从长条中 blit 出
+当前可见的 800 宽区域，每层一次 blit：
+- 完全不透明的层用 convert() 转换，blit 时不需要做透明混合
+- 带透明的层只保留有内容的水平区域，透明的部分不参与 blit
+- 背景静止（打怪模式）时，把三层合成为一张不透明的图缓存起来，每帧只 blit 一次
+"""
+
+import pygame
+
+
+class ParallaxLayer:
+    """一层预先拼接好的背景长条。"""
+
+    def __init__(self, image, screen_size=(800, 600)):
+        self.width, self.height = screen_size
+        image = pygame.transform.scale(image, screen_size)
+
+        # 检查是否完全不透明
+        opaque_pixels = pygame.mask.from_surface(image, 254).count()
+        self.opaque = opaque_pixels == self.width * self.height
+
+        if self.opaque:
+            self.strip = pygame.Surface((self.width * 2, self.height)).convert()
+            self.top = 0
+            self.band_height = self.height
+            self.strip.blit(image, (0, 0))
+            self.strip.blit(image, (self.width, 0))
+        else:
+            # 只保留有内容的水平区域
+            bounds = image.get_bounding_rect()
+            self.top = bounds.top
+            self.band_height = bounds.height
+            self.strip = pygame.Surface((self.width * 2, self.band_height), pygame.SRCALPHA).convert_alpha()
+            self.strip.blit(image, (0, -self.top))
+            self.strip.blit(image, (self.width, -self.top))
+
+    def draw(self, screen, offset):
+        """绘制这一层，offset 为长条中可见区域的起点（0 ~ 799）"""
+        if self.band_height <= 0:
+            return
+        area = pygame.Rect(offset % self.width, 0, self.width, self.band_height)
+        screen.blit(self.strip, (0, self.top), area)
+
+
+class ParallaxBackground:
+    """按从远到近的顺序绘制多层背景。"""
+
+    def __init__(self, images, screen_size=(800, 600)):
+        self.screen_size = screen_size
+        self.layers = [ParallaxLayer(image, screen_size) for image in images]
+
+        # 静止背景的合成缓存
+        self.cached_offsets = None
+        self.cached_surface = None
+
+    def draw(self, screen, offsets):
+        """绘制滚动中的背景"""
+        # 最远一层不透明时会覆盖整个屏幕，不需要先清屏
+        if not self.layers or not self.layers[0].opaque:
+            screen.fill((0, 0, 0))
+        for layer, offset in zip(self.layers, offsets):
+            layer.draw(screen, offset)
+
+    def draw_static(self, screen, offsets):
+        """绘制静止的背景：相同位置只合成一次，之后每帧只 blit 一次"""
+        offsets = tuple(offsets)
+        if offsets != self.cached_offsets:
+            if self.cached_surface is None:
+                self.cached_surface = pygame.Surface(self.screen_size).convert()
+            self.draw(self.cached_surface, offsets)
+            self.cached_offsets = offsets
+        screen.blit(self.cached_surface, (0, 0))
@@ -0,0 +1,156 @@
+# bake_assets.py
+"""离线资源预处理工具。
+
+把 main.py、player.py（animations.json）、obstacle.py、enemy.py 用到的图片预先缩放到运行时尺寸，
+按运行时的像素格式（透明/不透明）保存到缓存目录，并生成清单文件。
+AssetManager 在源文件未修改时会直接读取这些小图，不再解码原始大图。
+
+用法（在游戏目录下运行）:
+    python -m bake_assets            # 只处理新增或修改过的图片
+    python -m bake_assets --force    # 全部重新处理
+    python -m bake_assets --out DIR  # 指定输出目录
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from animation_atlas import load_animation_manifest
+from asset_manager import BAKED_DIR, MANIFEST_NAME, baked_key, source_signature
+
+MANIFEST_VERSION = 1
+
+
+def collect_targets():
+    """列出所有需要预处理的图片: [(路径, 尺寸, 是否透明), ...]"""
+    targets = []
+
+    # main.py: 三层游戏背景、UI背景、商店背景
+    for path in ('image/像素背景_远层.png', 'image/像素背景_中层.png', 'image/像素背景.png'):
+        targets.append((path, (800, 600), True))
+    targets.append(('image/背景.jpg', (800, 600), False))
+    targets.append(('image/shop.png', (800, 600), False))
+
+    # main.py: 商店物品图片、菜单角色头像
+    for path in ('image/heart.png', 'image/coin.png', 'image/star.png',
+                 'image/nick.png', 'image/judy.png'):
+        targets.append((path, (80, 80), True))
+
+    # main.py: 战斗图片
+    targets.append(('image/player_bullet.png', (20, 10), True))
+    targets.append(('image/monster_bullet.png', (20, 10), True))
+    targets.append(('image/monster.png', (80, 80), True))
+    targets.append(('image/player_shoot.png', (50, 50), True))
+
+    # player.py: 动画清单中各角色用到的动画帧
+    for spec in load_animation_manifest().values():
+        for path in spec["frames"]:
+            targets.append((path, tuple(spec.get("frame_size", (50, 50))), True))
+
+    # obstacle.py: 障碍物母版图片（ObstacleImageCache 的最大尺寸）
+    for path in ('image/ob1.png', 'image/ob2.png', 'image/ob3.png'):
+        targets.append((path, (90, 90), True))
+
+    # enemy.py: 绵羊和子弹（路径相对于 enemy.py 所在目录）
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    targets.append((os.path.join(base_dir, "assets", "sheep.png"), (60, 60), True))
+    targets.append((os.path.join(base_dir, "image", "player_bullet.png"), (20, 10), True))
+
+    # coin.py 的金币是程序绘制的（CoinSpriteAtlas），没有需要预处理的图片
+    return targets
+
+
+def load_manifest(out_dir):
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return {}
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except Exception:
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("entries", {})
+
+
+def bake_image(path, size, alpha, out_path):
+    """缩放单张图片并按运行时像素格式保存"""
+    image = pygame.transform.scale(pygame.image.load(path), size)
+    if alpha:
+        baked = pygame.Surface(size, pygame.SRCALPHA)
+    else:
+        baked = pygame.Surface(size, 0, 24)
+    baked.blit(image, (0, 0))
+    pygame.image.save(baked, out_path)
+
+
+def bake(out_dir=BAKED_DIR, force=False):
+    """预处理所有图片，返回 (处理数量, 跳过数量, 缺失数量)"""
+    os.makedirs(out_dir, exist_ok=True)
+    old_entries = load_manifest(out_dir)
+    entries = {}
+    baked = skipped = missing = 0
+
+    for path, size, alpha in collect_targets():
+        if not os.path.exists(path):
+            print(f"缺少源文件，跳过: {path}")
+            missing += 1
+            continue
+
+        key = baked_key(path, size, alpha)
+        file_name = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16] + '.png'
+        out_path = os.path.join(out_dir, file_name)
+        signature = source_signature(path)
+
+        old = old_entries.get(key)
+        if not force and old and old["source"] == signature and os.path.exists(out_path):
+            entries[key] = old
+            skipped += 1
+            continue
+
+        try:
+            bake_image(path, size, alpha, out_path)
+        except Exception as e:
+            print(f"处理失败: {path}, 错误: {e}")
+            continue
+
+        entries[key] = {"file": file_name, "source": signature}
+        baked += 1
+        print(f"已处理: {key}")
+
+    # 删除已经不再使用的旧文件
+    used_files = {entry["file"] for entry in entries.values()}
+    for entry in old_entries.values():
+        stale_path = os.path.join(out_dir, entry["file"])
+        if entry["file"] not in used_files and os.path.exists(stale_path):
+            os.remove(stale_path)
+
+    with open(os.path.join(out_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump({"version": MANIFEST_VERSION, "entries": entries}, f, ensure_ascii=False, indent=2)
+
+    return baked, skipped, missing
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="把游戏图片预处理为运行时尺寸")
+    parser.add_argument("--out", default=BAKED_DIR, help="输出目录（默认: %(default)s）")
+    parser.add_argument("--force", action="store_true", help="忽略清单，全部重新处理")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    baked, skipped, missing = bake(args.out, args.force)
+    pygame.quit()
+
+    print(f"预处理完成: 处理 {baked} 张，未修改跳过 {skipped} 张，缺失 {missing} 张")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
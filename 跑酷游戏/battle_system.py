@@ -2,8 +2,15 @@ import pygame
 
 
 class BattleBullet:
+    __slots__ = ("rect", "speed", "direction", "image", "damage", "active")
+
     def __init__(self, x, y, speed, direction="right", image=None, damage=1):
         self.rect = pygame.Rect(x, y, 20, 10)
+        self.reset(x, y, speed, direction, image, damage)
+
+    def reset(self, x, y, speed, direction="right", image=None, damage=1):
+        """重新初始化子弹（对象池重复使用时调用，沿用原来的 Rect）"""
+        self.rect.update(x, y, 20, 10)
         self.speed = speed
         self.direction = direction
         self.image = image
@@ -31,6 +38,8 @@ class BattleBullet:
 
 
 class BattleMonster:
+    __slots__ = ("rect", "image", "health", "max_health", "fire_cooldown")
+
     def __init__(self, x, y, image=None, health=20):
         self.rect = pygame.Rect(x, y, 80, 80)
         self.image = image
@@ -0,0 +1,11 @@
+# benchmarks/__init__.py
+"""性能测试套件。
+
+在游戏目录下运行:
+    python -m benchmarks                     # 运行所有场景，并与 benchmarks/baseline.json 比较
+    python -m benchmarks --quick             # 缩小工作量，快速检查
+    python -m benchmarks --only update_playing draw_game_screen
+    python -m benchmarks --save-baseline     # 把本次结果保存为新的基准
+    python -m benchmarks --check             # 有场景退化时以退出码 1 结束（用于自动检查）
+    python -m benchmarks.store_check         # 只检查实体存储逐个更新和批量运算的结果一致
+"""
@@ -0,0 +1,65 @@
+# benchmarks/__main__.py
+import argparse
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from benchmarks.harness import (compare, load_baseline, print_comparison, print_results,
+                                save_results)
+from benchmarks.scenarios import SCENARIOS
+from benchmarks.store_check import check_stores
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="运行性能测试并与基准比较")
+    parser.add_argument("--only", nargs="+", choices=list(SCENARIOS), help="只运行指定场景")
+    parser.add_argument("--quick", action="store_true", help="工作量缩小为 1/10")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="基准文件（默认: %(default)s）")
+    parser.add_argument("--save-baseline", action="store_true", help="把本次结果保存为基准")
+    parser.add_argument("--output", help="把本次结果保存为 JSON 文件")
+    parser.add_argument("--threshold", type=float, default=0.10, help="p50 延迟变慢多少视为退化（默认: %(default)s）")
+    parser.add_argument("--check", action="store_true",
+                        help="有场景退化、或实体存储的两种更新方式结果不一致时返回退出码 1")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        failures = check_stores()
+        if failures:
+            for seed, threshold, frame in failures:
+                print(f"实体存储结果不一致: 种子 {seed}，阈值 {threshold}，第 {frame} 帧")
+            return 1
+
+    scale = 0.1 if args.quick else 1.0
+    results = []
+    for name in args.only or SCENARIOS:
+        print(f"运行场景: {name}", flush=True)
+        results.append(SCENARIOS[name](scale))
+
+    print()
+    print_results(results)
+
+    if args.output:
+        save_results(args.output, results)
+    if args.save_baseline:
+        save_results(args.baseline, results)
+        print(f"\n基准已保存: {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"\n没有基准文件（{args.baseline}），使用 --save-baseline 创建")
+        return 0
+
+    rows = compare(results, baseline, args.threshold)
+    print_comparison(rows, args.threshold)
+    if args.check and any(regressed for *_, regressed in rows):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+# benchmarks/harness.py
+"""性能测试的计时、统计和基准比较。"""
+
+import json
+import os
+import platform
+import time
+
+from profiler import percentile
+
+
+class BenchmarkResult:
+    """一个场景的测试结果。samples 为每次操作的耗时（秒），metrics 为耗时以外的测量值（如内存）。"""
+
+    def __init__(self, name, samples, unit="op", params=None, metrics=None):
+        self.name = name
+        self.samples = samples
+        self.unit = unit
+        self.params = params or {}
+        self.metrics = metrics or {}
+
+    @property
+    def ops_per_sec(self):
+        total = sum(self.samples)
+        return len(self.samples) / total if total > 0 else 0.0
+
+    def get_stats(self):
+        """统计信息（延迟单位为毫秒）"""
+        ordered = sorted(s * 1000 for s in self.samples)
+        return {
+            "count": len(ordered),
+            "ops_per_sec": self.ops_per_sec,
+            "mean_ms": sum(ordered) / len(ordered) if ordered else 0.0,
+            "p50_ms": percentile(ordered, 50),
+            "p95_ms": percentile(ordered, 95),
+            "p99_ms": percentile(ordered, 99),
+            "max_ms": ordered[-1] if ordered else 0.0,
+        }
+
+    def to_dict(self):
+        data = {"unit": self.unit, "params": self.params}
+        if self.metrics:
+            data["metrics"] = self.metrics
+        data.update(self.get_stats())
+        return data
+
+
+def time_each(func, count, setup=None, warmup=0.1):
+    """调用 func 共 count 次，分别记录每次的耗时（setup 在每次调用前执行，不计时）
+
+    最前面 warmup 比例的调用作为预热，不计入结果。
+    """
+    samples = []
+    perf_counter = time.perf_counter
+    warmup_count = int(count * warmup)
+    for i in range(-warmup_count, count):
+        if setup:
+            setup(i)
+        start = perf_counter()
+        func()
+        elapsed = perf_counter() - start
+        if i >= 0:
+            samples.append(elapsed)
+    return samples
+
+
+def machine_info():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+    }
+
+
+def save_results(path, results):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    data = {
+        "machine": machine_info(),
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "results": {result.name: result.to_dict() for result in results},
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def load_baseline(path):
+    """读取基准文件，文件不存在或读取失败时返回 None"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"读取基准文件失败: {e}")
+        return None
+
+
+def compare(results, baseline, threshold=0.10):
+    """与基准比较中位数延迟，返回 [(名称, 当前 p50, 基准 p50, 变化比例, 是否退化), ...]
+
+    用中位数而不是平均值比较，少数被系统打断的样本不会造成误报。
+    变化比例为正表示变慢。
+    """
+    rows = []
+    baseline_results = baseline.get("results", {}) if baseline else {}
+    for result in results:
+        old = baseline_results.get(result.name)
+        current = result.get_stats()["p50_ms"]
+        if not old or not old.get("p50_ms"):
+            rows.append((result.name, current, None, None, False))
+            continue
+        change = current / old["p50_ms"] - 1
+        rows.append((result.name, current, old["p50_ms"], change, change > threshold))
+    return rows
+
+
+def print_results(results):
+    print(f"{'场景':<28}{'ops/sec':>12}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  (ms)")
+    for result in results:
+        s = result.get_stats()
+        print(f"{result.name:<28}{s['ops_per_sec']:>12.1f}{s['mean_ms']:>10.3f}{s['p50_ms']:>10.3f}"
+              f"{s['p95_ms']:>10.3f}{s['p99_ms']:>10.3f}{s['max_ms']:>10.3f}")
+        for name, value in result.metrics.items():
+            print(f"    {name:<40}{value:>12}")
+
+
+def print_comparison(rows, threshold):
+    print(f"\n与基准比较 p50 延迟（ms，变慢超过 {threshold:.0%} 视为退化）:")
+    for name, current, old, change, regressed in rows:
+        if old is None:
+            print(f"  {name:<28}{current:>12.3f}   （基准中没有此场景）")
+            continue
+        mark = "  退化" if regressed else ""
+        print(f"  {name:<28}{current:>12.3f} / {old:<12.3f}{change:+8.1%}{mark}")
@@ -0,0 +1,329 @@
+# benchmarks/scenarios.py
+"""性能测试场景。
+
+每个场景是一个函数，接收缩放系数 scale（--quick 时小于 1），返回 BenchmarkResult。
+游戏逻辑使用固定种子，同一台机器上多次运行的工作量完全相同。
+"""
+
+import copy
+import functools
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.harness import BenchmarkResult, time_each
+from replay import INPUT_SHOOT_HELD
+
+SEED = 12345
+_display_game = None
+
+
+def get_display_game():
+    """带（dummy）窗口的游戏对象，用于绘制场景，所有绘制场景共用一个"""
+    global _display_game
+    if _display_game is None:
+        from main import Game
+        _display_game = Game()
+        _display_game.asset_loader.wait()
+        _display_game.update()
+    return _display_game
+
+
+def start_benchmark_run(game):
+    """开始一局不会结束、也不会进入打怪的游戏"""
+    game.reset_game()
+    game.selected_character = 1
+    game.start_game(SEED)
+    game.battle_thresholds = []
+    game.max_health = game.player_health = 10 ** 9
+
+
+def fill_entities(game, count):
+    """把障碍物、金币和绵羊各补充到 count 个（在屏幕右侧依次排开）"""
+    from enemy import Monster
+    obstacle_manager = game.obstacle_manager
+    coin_manager = game.coin_manager
+    enemy_manager = game.enemy_manager
+
+    while len(obstacle_manager.obstacles) < count:
+        index = len(obstacle_manager.obstacles)
+        size = obstacle_manager.size_buckets[index % len(obstacle_manager.size_buckets)]
+        path = obstacle_manager.obstacles_images[index % len(obstacle_manager.obstacles_images)]
+        obstacle_manager.obstacles.append(obstacle_manager.pool.acquire(
+            800 + index * 40, 400 - size, size, size, 8, path, obstacle_manager.image_cache.get(path, (size, size))))
+
+    while len(coin_manager.coins) < count:
+        index = len(coin_manager.coins)
+        coin_manager.coins.append(coin_manager.pool.acquire(800 + index * 30, 240, is_ground_coin=index % 2 == 0,
+                                                            atlas=coin_manager.sprite_atlas, rng=coin_manager.rng))
+
+    sheep = enemy_manager.monster_images.get("sheep")
+    while len(enemy_manager.monsters) < count:
+        index = len(enemy_manager.monsters)
+        enemy_manager.monsters.append(Monster(800 + index * 50, 340, "sheep", sheep))
+
+
+def bench_update_playing(scale=1.0, entities=20, name="update_playing"):
+    """update_playing：每帧保持障碍物、金币、绵羊各 entities 个"""
+    from main import Game
+    game = Game(headless=True)
+    game.update()
+    start_benchmark_run(game)
+    frames = max(100, int(10000 * scale))
+
+    def setup(i):
+        fill_entities(game, entities)
+        if i % 40 == 0:
+            game.player.jump()
+        game.frame_input = INPUT_SHOOT_HELD if i % 30 < 10 else 0  # 每 30 帧按住射击 10 帧
+
+    samples = time_each(game.update_playing, frames, setup)
+    return BenchmarkResult(name, samples, "frame", {"frames": frames, "entities": entities})
+
+
+def bench_enemy_collisions(scale=1.0, count=300):
+    """EnemyManager.update：屏幕上有 count 只绵羊和 count 颗子弹（密集弹幕）"""
+    import random
+    from enemy import EnemyManager, Monster
+    rng = random.Random(SEED)
+    manager = EnemyManager(rng=rng)
+    sheep = manager.monster_images.get("sheep")
+
+    def setup(i):
+        # 补充到 count 个；绵羊血量足够高，不会被打死
+        while len(manager.monsters) < count:
+            monster = Monster(rng.randint(0, 1000), rng.randint(0, 540), "sheep", sheep)
+            monster.health = 10 ** 9
+            manager.monsters.append(monster)
+        while len(manager.player_bullets) < count:
+            manager.player_bullets.append(manager.bullet_pool.acquire(rng.randint(0, 1000), rng.randint(0, 600),
+                                                                      image=manager.bullet_image))
+
+    frames = max(50, int(1000 * scale))
+    samples = time_each(lambda: manager.update(0, None), frames, setup)
+    return BenchmarkResult("enemy_collisions", samples, "frame", {"frames": frames, "count": count})
+
+
+def bench_coin_draw(scale=1.0, coins=50):
+    """CoinManager.draw：屏幕上有 coins 个金币"""
+    from coin import CoinManager
+    game = get_display_game()
+    manager = CoinManager(sound=False)
+    for i in range(coins):
+        is_ground = i % 2 == 0
+        manager.coins.append(manager.pool.acquire(20 + (i * 15) % 760, 350 if is_ground else 240,
+                                                  is_ground_coin=is_ground, atlas=manager.sprite_atlas))
+    frames = max(100, int(5000 * scale))
+    samples = time_each(lambda: manager.draw(game.screen), frames)
+    return BenchmarkResult("coin_manager_draw", samples, "frame", {"frames": frames, "coins": coins})
+
+
+def bench_draw_game_screen(scale=1.0, entities=20):
+    """完整的 draw_game_screen（不包括 display.flip）"""
+    game = get_display_game()
+    start_benchmark_run(game)
+    game.star_effect_active = True
+    frames = max(100, int(3000 * scale))
+
+    def setup(i):
+        fill_entities(game, entities)
+        game.update_playing()
+
+    samples = time_each(game.draw_game_screen, frames, setup)
+    return BenchmarkResult("draw_game_screen", samples, "frame", {"frames": frames, "entities": entities})
+
+
+def make_save_system(tmp, saves, backend):
+    """在 tmp 目录中创建有 saves 个存档的存档系统（backend 为 "json" 或 "sqlite"）"""
+    from save_system import SaveSystem, SqliteSaveStorage
+    path = os.path.join(tmp, "game_saves.json")
+    storage = SqliteSaveStorage(os.path.join(tmp, "game_saves.db")) if backend == "sqlite" else None
+    system = SaveSystem(path, storage=storage)
+    system.create_new_save()
+    template = system.current_save
+    system.saves["saves"] = []
+    for i in range(saves):
+        save = copy.deepcopy(template)
+        save["player_name"] = f"存档{i + 1}"
+        save["high_score"] = (i * 7919) % 10007
+        system.saves["saves"].append(save)
+    system.save_all_saves()
+    system.flush()
+    return system
+
+
+def bench_update_save(scale=1.0, saves=10000, backend="json"):
+    """SaveSystem.update_save：存档文件中有 saves 个存档"""
+    with tempfile.TemporaryDirectory() as tmp:
+        system = make_save_system(tmp, saves, backend)
+        system.load_save(f"存档{saves // 2}")
+
+        count = max(5, int(50 * scale))
+        samples = time_each(lambda: system.update_save(1234, 56, 1), count)
+        system.close()
+    name = "save_update_save" if backend == "json" else f"save_update_save_{backend}"
+    return BenchmarkResult(name, samples, "save", {"saves": saves, "count": count, "backend": backend})
+
+
+def bench_leaderboard(scale=1.0, saves=10000, backend="sqlite"):
+    """SaveSystem.get_leaderboard(10) + generate_save_name：存档文件中有 saves 个存档"""
+    with tempfile.TemporaryDirectory() as tmp:
+        system = make_save_system(tmp, saves, backend)
+
+        def query():
+            system.get_leaderboard(10)
+            system.generate_save_name()
+
+        count = max(5, int(50 * scale))
+        samples = time_each(query, count)
+        system.close()
+    return BenchmarkResult(f"save_leaderboard_{backend}", samples, "query",
+                           {"saves": saves, "count": count, "backend": backend})
+
+
+COLD_START_CODE = """
+import time
+start = time.perf_counter()
+import main
+game = main.Game()
+game.asset_loader.wait()
+game.apply_loaded_assets()
+print(time.perf_counter() - start)
+"""
+
+
+def bench_startup_cold(scale=1.0):
+    """冷启动：新进程中 import main + Game() + 等待资源加载完成并在主线程中应用"""
+    count = max(2, int(5 * scale))
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    samples = []
+    for _ in range(count):
+        output = subprocess.run([sys.executable, "-c", COLD_START_CODE], env=env,
+                                capture_output=True, text=True, check=True).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return BenchmarkResult("startup_cold", samples, "start", {"count": count})
+
+
+def bench_startup_warm(scale=1.0):
+    """热启动：同一进程中资源已经缓存时再次创建 Game()"""
+    from main import Game
+    get_display_game()
+    count = max(3, int(10 * scale))
+
+    def create():
+        game = Game()
+        game.asset_loader.wait()
+        game.apply_loaded_assets()
+
+    samples = time_each(create, count)
+    return BenchmarkResult("startup_warm", samples, "start", {"count": count})
+
+
+ENTITY_COUNT = 10000
+
+
+def entity_factories(count):
+    """[(类名, 创建第 i 个实体的函数), ...]
+
+    列数据预先按 count 个实体分配好（包括转换成 NumPy 数组），不计入实体本身的内存。
+    """
+    import pygame
+    from battle_system import BattleBullet, BattleMonster
+    from coin import Coin, CoinSpriteAtlas, CoinStore
+    from enemy import Bullet, BulletStore, Monster
+    from obstacle import Obstacle, ObstacleStore
+    pygame.init()
+    image = pygame.Surface((60, 60))
+    atlas = CoinSpriteAtlas()
+    coin_store, obstacle_store, bullet_store = CoinStore(count), ObstacleStore(capacity=count), BulletStore(capacity=count)
+    for store in (coin_store, obstacle_store, bullet_store):
+        store.reserve(count)
+    return [
+        ("Coin", lambda i: Coin(i, 350, is_ground_coin=True, atlas=atlas, store=coin_store)),
+        ("Obstacle", lambda i: Obstacle(i, 340, 60, 60, 8, None, image, store=obstacle_store)),
+        ("Bullet", lambda i: Bullet(i, 300, store=bullet_store)),
+        ("Monster", lambda i: Monster(i, 340, "sheep", image)),
+        ("BattleBullet", lambda i: BattleBullet(i, 300, 12)),
+        ("BattleMonster", lambda i: BattleMonster(i, 320, image)),
+    ]
+
+
+def store_column_bytes(store):
+    """EntityStore 中每个槽位的列数据字节数（列已经转换成 NumPy 数组时）"""
+    return sum(getattr(store, name).nbytes for name in [*store.columns, "in_use"]) // store.capacity
+
+
+def bench_entity_memory(scale=1.0):
+    """每种实体每个对象占用的内存（tracemalloc 统计，包括其中的 Rect），以及创建耗时
+
+    Coin / Obstacle / Bullet 的列数据单独报告为 "列数据 字节/个"。
+    """
+    import tracemalloc
+    from coin import CoinStore
+    from enemy import BulletStore
+    from obstacle import ObstacleStore
+    count = max(1000, int(ENTITY_COUNT * scale))
+    samples = []
+    metrics = {}
+    for name, create in entity_factories(count * 2):
+        entities = [None] * count
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for i in range(count):
+            entities[i] = create(i)
+        metrics[f"{name} 字节/个"] = round((tracemalloc.get_traced_memory()[0] - before) / count)
+        tracemalloc.stop()
+
+        # 创建耗时单独测量（tracemalloc 会拖慢分配）
+        start = time.perf_counter()
+        for i in range(count):
+            entities[i] = create(i)
+        samples.append((time.perf_counter() - start) / count)
+
+    for name, store in (("Coin", CoinStore(count)), ("Obstacle", ObstacleStore(capacity=count)),
+                        ("Bullet", BulletStore(capacity=count))):
+        store.reserve(count)
+        metrics[f"{name} 列数据 字节/个"] = store_column_bytes(store)
+    return BenchmarkResult("entity_memory", samples, "entity", {"count": count}, metrics)
+
+
+def bench_attribute_access(scale=1.0, count=1000):
+    """逐个读取实体属性：每次操作遍历绵羊、战斗子弹和金币各 count 个"""
+    factories = dict(entity_factories(count))
+    monsters = [factories["Monster"](i) for i in range(count)]
+    bullets = [factories["BattleBullet"](i) for i in range(count)]
+    coins = [factories["Coin"](i) for i in range(count)]
+
+    def read():
+        total = 0
+        for monster in monsters:
+            total += monster.health + monster.attack_cooldown + monster.animation_frame
+        for bullet in bullets:
+            total += bullet.speed + bullet.damage
+        for coin in coins:
+            total += coin.size + coin.is_ground_coin
+        return total
+
+    frames = max(50, int(2000 * scale))
+    samples = time_each(read, frames)
+    return BenchmarkResult("attribute_access", samples, "pass", {"frames": frames, "count": count})
+
+
+# 场景名 -> 函数（按运行顺序）
+SCENARIOS = {
+    "update_playing": bench_update_playing,
+    "update_playing_dense": functools.partial(bench_update_playing, entities=300, name="update_playing_dense"),
+    "enemy_collisions": bench_enemy_collisions,
+    "coin_manager_draw": bench_coin_draw,
+    "draw_game_screen": bench_draw_game_screen,
+    "entity_memory": bench_entity_memory,
+    "attribute_access": bench_attribute_access,
+    "save_update_save": bench_update_save,
+    "save_update_save_sqlite": functools.partial(bench_update_save, backend="sqlite"),
+    "save_leaderboard_json": functools.partial(bench_leaderboard, backend="json"),
+    "save_leaderboard_sqlite": bench_leaderboard,
+    "startup_cold": bench_startup_cold,
+    "startup_warm": bench_startup_warm,
+}
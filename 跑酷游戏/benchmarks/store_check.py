@@ -0,0 +1,101 @@
+# benchmarks/store_check.py
+"""检查实体存储的逐个更新和批量运算结果完全一致。
+
+EntityStore 在实体少时用 Python 列表逐个更新，实体多时转换成 NumPy 数组批量运算
+（见 entity_store.VECTORIZE_SIZE）。这里用固定种子随机生成、移动、收集和释放金币、
+障碍物和子弹，实体数量多次越过阈值（两个方向都有），把每一帧的列数据和随机数流的状态
+与只用列表时的结果逐项比较。
+
+在游戏目录下运行:
+    python -m benchmarks.store_check
+python -m benchmarks --check 也会先运行这个检查。
+"""
+
+import random
+import sys
+
+import entity_store
+
+# 检查时使用的阈值：0 表示一开始就用数组，其余的会在运行中来回转换
+THRESHOLDS = (0, 16, 40, entity_store.VECTORIZE_SIZE)
+SEEDS = range(5)
+FRAMES = 150
+
+
+def plain(column):
+    """把一列转换成 Python 列表，方便比较两种表示"""
+    return column.tolist() if hasattr(column, "tolist") else list(column)
+
+
+def run_stores(seed, threshold):
+    """按 threshold 运行一次，返回每一帧的状态"""
+    from coin import CoinStore
+    from enemy import BulletStore
+    from obstacle import ObstacleStore
+
+    saved = entity_store.VECTORIZE_SIZE
+    entity_store.VECTORIZE_SIZE = threshold
+    try:
+        rng = random.Random(seed)
+        game_rng = random.Random(seed + 1)  # 金币收集动画使用的随机数流
+        coins, obstacles, bullets = CoinStore(4), ObstacleStore(capacity=4), BulletStore(capacity=4)
+        frames = []
+        for frame in range(FRAMES):
+            # 前 60 帧间歇地生成大量实体，之后只移动和释放，实体数量回落到阈值以下
+            spawn = rng.randint(0, 40) if frame < 60 and frame % 20 < 10 else 0
+            for _ in range(spawn):
+                ground = rng.random() < 0.5
+                values = {"x": rng.randint(-30, 900), "y": rng.randint(100, 400), "w": 25, "h": 25,
+                          "ground": ground, "original_y": 300}
+                if not ground:
+                    values.update(float_timer=rng.uniform(0, 6.3), float_speed=rng.uniform(0.02, 0.06),
+                                  float_amplitude=rng.randint(2, 5))
+                coins.alloc(**values)
+                obstacles.alloc(x=rng.randint(-50, 900), y=300, w=rng.randint(0, 60), h=40)
+                bullets.alloc(x=rng.randint(-60, 1010), y=5, w=15, h=5, vx=rng.choice((10, -10)))
+            for slot in coins.active_slots():
+                if rng.random() < 0.1:
+                    coins.collected[slot] = True
+
+            scroll_speed = rng.randint(3, 9) if frame < 60 else 40
+            coins.move(scroll_speed, game_rng)
+            obstacles.move(scroll_speed)
+            bullets.move()
+            for store in (coins, obstacles, bullets):
+                if rng.random() < 0.5:
+                    store.release(store.inactive_slots())
+
+            state = [{name: plain(column) for name, column in store.snapshot()["columns"].items()}
+                     for store in (coins, obstacles, bullets)]
+            frames.append((state, [list(store.free_slots) for store in (coins, obstacles, bullets)],
+                           game_rng.getstate()))
+        return frames
+    finally:
+        entity_store.VECTORIZE_SIZE = saved
+
+
+def check_stores():
+    """返回不一致的 (种子, 阈值, 帧号) 列表，全部一致时为空"""
+    failures = []
+    for seed in SEEDS:
+        expected = run_stores(seed, sys.maxsize)  # 只用列表逐个更新
+        for threshold in THRESHOLDS:
+            for frame, (got, want) in enumerate(zip(run_stores(seed, threshold), expected)):
+                if got != want:
+                    failures.append((seed, threshold, frame))
+                    break
+    return failures
+
+
+def main():
+    failures = check_stores()
+    for seed, threshold, frame in failures:
+        print(f"不一致: 种子 {seed}，阈值 {threshold}，第 {frame} 帧")
+    if failures:
+        return 1
+    print(f"逐个更新与批量运算结果一致（{len(SEEDS)} 个种子，阈值 {THRESHOLDS}）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,81 +1,76 @@
 # coin.py
 import pygame
 import random
+import functools
 import math
 import os
 
-
-class Coin:
-    def __init__(self, x, y, size=25, is_ground_coin=False):
-        """初始化金币"""
-        self.rect = pygame.Rect(x, y, size, size)
-        self.size = size
-        self.is_active = True
-        self.is_collected = False
-        self.collect_animation = 0
-        self.max_collect_animation = 10
-
-        self.is_ground_coin = is_ground_coin
-        self.original_y = y  # 记录原始Y坐标
-
-        # 只有空中金币有浮动效果
-        if not is_ground_coin:
-            self.float_timer = random.uniform(0, math.pi * 2)
-            self.float_speed = random.uniform(0.02, 0.06)
-            self.float_amplitude = random.randint(2, 5)
-
-    def move(self, scroll_speed=0):
-        """移动金币"""
-        if not self.is_collected:
-            # 金币与背景同步滚动
-            self.rect.x -= scroll_speed
-
-            # 只有空中金币有浮动效果
-            if not self.is_ground_coin:
-                self.float_timer += self.float_speed
-                self.rect.y = self.original_y + math.sin(self.float_timer) * self.float_amplitude
-
-            # 如果移出屏幕，标记为不活动
-            if self.rect.right < 0:
-                self.is_active = False
-        else:
-            # 收集动画：金币向上飘并逐渐消失
-            self.collect_animation += 1
-            self.rect.y -= 2  # 向上飘
-            self.rect.x += random.randint(-1, 1)  # 轻微左右晃动
-
-            # 动画结束后标记为不活动
-            if self.collect_animation >= self.max_collect_animation:
-                self.is_active = False
-
-    def collect(self):
-        """收集金币"""
-        if not self.is_collected:
-            self.is_collected = True
-            return True
-        return False
-
-    def draw(self, screen):
-        """绘制金币"""
-        if self.is_active:
-            # 如果是收集动画，添加透明度效果
-            if self.is_collected:
-                alpha = 255 - (self.collect_animation * 255 // self.max_collect_animation)
-                temp_surface = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
-                self.draw_coin(temp_surface, (0, 0), alpha)
-                screen.blit(temp_surface, self.rect)
-            else:
-                # 正常金币
-                self.draw_coin(screen, (self.rect.x, self.rect.y))
-
-    def draw_coin(self, surface, pos, alpha=255):
+import numpy as np
+
+from collision import CollisionWorld
+from entity_store import EntityStore, EntityView, round_array_like_rect, round_like_rect
+from object_pool import EntityPool
+from font_registry import get_font
+
+
+class CoinSpriteAtlas:
+    """金币贴图缓存。
+
+    初始化时为每种尺寸预先绘制好：普通帧、两种发光帧（地面/空中），
+    以及收集动画每一步透明度对应的帧，绘制金币时只需要一次blit。
+    """
+
+    _shared = None
+
+    def __init__(self, sizes=(25,), collect_steps=10):
+        self.collect_steps = collect_steps
+        self.frames = {}
+        for size in sizes:
+            self.bake(size)
+
+    @classmethod
+    def shared(cls):
+        """获取全局共享的贴图缓存（用于没有指定缓存的金币）"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def bake(self, size):
+        """预先绘制指定尺寸的所有金币帧"""
+        font = get_font(size // 2, path=None)
+        glow_colors = {
+            None: None,
+            "ground": (255, 255, 180, 100),
+            "air": (255, 255, 200, 80),
+        }
+
+        for glow, glow_color in glow_colors.items():
+            # 正常金币：发光圈比金币大4像素，向左上偏移2像素
+            coin = self._render_coin(size, 255, font)
+            self.frames[(size, glow, None)] = self._compose(coin, glow_color, clip=False)
+
+            # 收集动画：每一步透明度一帧，发光圈裁剪在金币范围内
+            for step in range(self.collect_steps + 1):
+                alpha = 255 - (step * 255 // self.collect_steps)
+                coin = self._render_coin(size, alpha, font)
+                self.frames[(size, glow, step)] = self._compose(coin, glow_color, clip=True)
+
+    def get_frame(self, size, glow=None, collect_step=None):
+        """返回 (surface, 偏移量)，collect_step 为 None 表示未被收集"""
+        if collect_step is not None:
+            collect_step = min(max(collect_step, 0), self.collect_steps)
+        key = (size, glow, collect_step)
+        if key not in self.frames:
+            self.bake(size)
+        return self.frames[key]
+
+    @staticmethod
+    def _render_coin(size, alpha, font):
         """绘制单个金币图形"""
-        x, y = pos
-        center = self.size // 2
-        radius = self.size // 2 - 2
+        center = size // 2
+        radius = size // 2 - 2
 
-        # 绘制金币
-        coin_surface = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
+        coin_surface = pygame.Surface((size, size), pygame.SRCALPHA)
 
         # 绘制金币主体
         for i in range(radius, 0, -1):
@@ -87,30 +82,191 @@ class Coin:
         pygame.draw.circle(coin_surface, (220, 220, 0, alpha), (center, center), radius, 2)
 
         # 绘制金币符号
-        font = pygame.font.Font(None, self.size // 2)
         coin_text = font.render("$", True, (255, 255, 200, alpha))
         text_rect = coin_text.get_rect(center=(center, center))
         coin_surface.blit(coin_text, text_rect)
 
-        surface.blit(coin_surface, (x, y))
+        return coin_surface
+
+    @staticmethod
+    def _compose(coin_surface, glow_color, clip):
+        """把发光效果叠加到金币上，返回 (surface, 偏移量)"""
+        if glow_color is None:
+            return coin_surface, (0, 0)
+
+        size = coin_surface.get_width()
+        glow_size = size + 4
+        glow_surface = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
+        pygame.draw.circle(glow_surface, glow_color,
+                           (glow_size // 2, glow_size // 2), glow_size // 2)
+
+        if clip:
+            frame = pygame.Surface((size, size), pygame.SRCALPHA)
+            frame.blit(coin_surface, (0, 0))
+            frame.blit(glow_surface, (-2, -2))
+            return frame, (0, 0)
+
+        frame = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
+        frame.blit(coin_surface, (2, 2))
+        frame.blit(glow_surface, (0, 0))
+        return frame, (-2, -2)
+
+
+class CoinStore(EntityStore):
+    """金币的列数据，批量移动所有金币。"""
+
+    COLUMNS = {
+        "ground": bool,  # 是否为地面金币（地面金币没有浮动效果）
+        "collected": bool,
+        "collect_animation": int,
+        "original_y": int,  # 原始Y坐标
+        "float_timer": float,
+        "float_speed": float,
+        "float_amplitude": int,
+    }
+
+    def __init__(self, capacity=64):
+        super().__init__(self.COLUMNS, capacity)
+
+    def move(self, scroll_speed, rng, slots=None, max_collect_animation=10):
+        """移动金币（slots 为要移动的槽位号列表，默认为所有活动金币）"""
+        if self.vectorized:
+            self.move_arrays(scroll_speed, rng, slots, max_collect_animation)
+            return
+        if slots is None:
+            slots = self.active_slots()
+
+        x, y, w, active, collected, ground = self.x, self.y, self.w, self.active, self.collected, self.ground
+        float_timer, float_speed = self.float_timer, self.float_speed
+        collecting = []
+        for slot in slots:
+            if collected[slot]:
+                collecting.append(slot)
+                continue
+
+            # 金币与背景同步滚动，空中金币上下浮动
+            x[slot] -= scroll_speed
+            if not ground[slot]:
+                float_timer[slot] += float_speed[slot]
+                y[slot] = round_like_rect(
+                    self.original_y[slot] + math.sin(float_timer[slot]) * self.float_amplitude[slot])
+
+            # 如果移出屏幕，标记为不活动
+            if x[slot] + w[slot] < 0:
+                active[slot] = False
+
+        # 收集动画：金币向上飘并逐渐消失
+        # 左右晃动要按金币在列表中的顺序取随机数，才能和逐个移动的结果一致
+        for slot in self.in_list_order(collecting):
+            self.collect_animation[slot] += 1
+            y[slot] -= 2  # 向上飘
+            x[slot] += rng.randint(-1, 1)  # 轻微左右晃动
+            # 动画结束后标记为不活动
+            if self.collect_animation[slot] >= max_collect_animation:
+                active[slot] = False
+
+    def move_arrays(self, scroll_speed, rng, slots, max_collect_animation):
+        """move() 的批量版本（列是 NumPy 数组时使用），结果和逐个移动完全一致"""
+        if slots is None:
+            selected = self.active
+        else:
+            selected = np.zeros(self.capacity, np.bool_)
+            selected[slots] = True
+
+        moving = selected & ~self.collected
+        self.x[moving] -= scroll_speed
+        floating = (moving & ~self.ground).nonzero()[0]
+        if floating.size:
+            self.float_timer[floating] += self.float_speed[floating]
+            self.y[floating] = round_array_like_rect(
+                self.original_y[floating] + np.sin(self.float_timer[floating]) * self.float_amplitude[floating])
+        self.active[moving & (self.x + self.w < 0)] = False
+
+        collecting = (selected & self.collected).nonzero()[0]
+        if collecting.size:
+            collecting = np.array(self.in_list_order(collecting.tolist()), np.intp)
+            self.collect_animation[collecting] += 1
+            self.y[collecting] -= 2
+            self.x[collecting] += [rng.randint(-1, 1) for _ in range(collecting.size)]
+            self.active[collecting[self.collect_animation[collecting] >= max_collect_animation]] = False
+
+
+class Coin(EntityView):
+    """金币（CoinStore 中一个槽位的视图）"""
+
+    __slots__ = ("rng", "size", "atlas", "is_ground_coin")
+    max_collect_animation = 10
+
+    def __init__(self, x, y, size=25, is_ground_coin=False, atlas=None, rng=None, store=None):
+        """初始化金币（store 为所属管理器的 CoinStore，不指定时单独使用一个）"""
+        super().__init__(store if store is not None else CoinStore(capacity=1))
+        self.reset(x, y, size, is_ground_coin, atlas, rng)
+
+    def reset(self, x, y, size=25, is_ground_coin=False, atlas=None, rng=None):
+        """重新初始化金币（对象池重复使用时调用）"""
+        self.rng = rng or random
+        self.size = size
+        self.atlas = atlas if atlas else CoinSpriteAtlas.shared()
+        self.is_ground_coin = is_ground_coin
+
+        values = {"x": x, "y": y, "w": size, "h": size, "ground": is_ground_coin, "original_y": y}
+        # 只有空中金币有浮动效果
+        if not is_ground_coin:
+            values["float_timer"] = self.rng.uniform(0, math.pi * 2)
+            values["float_speed"] = self.rng.uniform(0.02, 0.06)
+            values["float_amplitude"] = self.rng.randint(2, 5)
+        self.alloc_slot(**values)
 
-        # 添加金币发光效果
+    @property
+    def is_collected(self):
+        return self.store.collected[self.slot]
+
+    @property
+    def collect_animation(self):
+        return self.store.collect_animation[self.slot]
+
+    def move(self, scroll_speed=0):
+        """移动金币"""
+        self.store.move(scroll_speed, self.rng, [self.slot], self.max_collect_animation)
+
+    def collect(self):
+        """收集金币"""
+        if not self.is_collected:
+            self.store.collected[self.slot] = True
+            return True
+        return False
+
+    def draw(self, screen):
+        """绘制金币（从贴图缓存中取出预先绘制好的帧，一次blit完成）"""
+        store, slot = self.store, self.slot
+        if not store.active[slot]:
+            return
+
+        # 添加金币发光效果（只影响画面，使用全局random，不占用游戏逻辑的随机数流）
+        glow = None
         if random.random() < (0.05 if self.is_ground_coin else 0.1):
-            glow_size = self.size + 4
-            glow_surface = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
-            glow_color = (255, 255, 180, 100) if self.is_ground_coin else (255, 255, 200, 80)
-            pygame.draw.circle(glow_surface, glow_color,
-                               (glow_size // 2, glow_size // 2), glow_size // 2)
-            surface.blit(glow_surface, (x - 2, y - 2))
+            glow = "ground" if self.is_ground_coin else "air"
+
+        # 如果是收集动画，使用对应透明度的帧
+        collect_step = store.collect_animation[slot] if store.collected[slot] else None
+        frame, (offset_x, offset_y) = self.atlas.get_frame(self.size, glow, collect_step)
+        screen.blit(frame, (store.x[slot] + offset_x, store.y[slot] + offset_y))
 
     def check_collision(self, player_rect):
         """检测与玩家的碰撞"""
-        return self.rect.colliderect(player_rect)
+        return self.get_rect().colliderect(player_rect)
 
 
 class CoinManager:
-    def __init__(self, obstacle_manager=None):
+    def __init__(self, obstacle_manager=None, sound=True, rng=None, world=None):
         self.coins = []
+        self.store = CoinStore()  # 所有金币的位置和状态（按列保存，批量更新）
+        self.pool = EntityPool(functools.partial(Coin, store=self.store), self.store)
+        self.rng = rng or random  # 金币的随机数流（不指定时使用全局random）
+
+        # 注册到碰撞检测（多个管理器共用同一个 CollisionWorld）
+        self.world = world or CollisionWorld()
+        self.world.register("coins", lambda: self.coins, self.store)
         self.spawn_timer = 0
         self.spawn_interval = 35
         self.min_spacing = 80
@@ -122,9 +278,16 @@ class CoinManager:
         self.waiting_after_obstacle = False
         self.obstacle_manager = obstacle_manager
 
-        # 加载音效
+        # 金币贴图缓存（初始化时一次性绘制好所有帧）
+        self.sprite_atlas = CoinSpriteAtlas(sizes=(25,))
+
+        # 预先创建金币对象（地面金币，不占用随机数流），屏幕上同时存在的金币一般不超过这个数量
+        self.pool.prefill(32, 0, 0, is_ground_coin=True, atlas=self.sprite_atlas)
+
+        # 加载音效（无界面模拟时不加载）
         self.collect_sound = None
-        self.load_sound()
+        if sound:
+            self.load_sound()
 
     def load_sound(self):
         """加载金币收集音效"""
@@ -157,30 +320,31 @@ class CoinManager:
             return False
 
         last_ob = self.obstacle_manager.obstacles[-1]
-        return last_ob.rect.x > 800 - min_gap
+        return last_ob.get_rect().x > 800 - min_gap
 
     def spawn_coins_group(self, x, is_ground_group=False):
         coins = []
 
         if is_ground_group:
-            count = random.randint(*self.ground_coin_count_range)
+            count = self.rng.randint(*self.ground_coin_count_range)
             base_y = 350
 
             for i in range(count):
                 coin_x = x + i * self.ground_coin_spacing
-                coin = Coin(coin_x, base_y, is_ground_coin=True)
+                coin = self.pool.acquire(coin_x, base_y, is_ground_coin=True, atlas=self.sprite_atlas,
+                                         rng=self.rng)
                 coins.append(coin)
         else:
-            spawn_y = random.randint(220, 260)
+            spawn_y = self.rng.randint(220, 260)
 
             # 如果地面被障碍物挡住，把金币放到障碍物上方
             if self.obstacle_manager:
                 for ob in self.obstacle_manager.obstacles:
-                    if abs(ob.rect.x - x) < 120:
-                        spawn_y = ob.rect.top - 40
+                    if abs(ob.get_rect().x - x) < 120:
+                        spawn_y = ob.get_rect().top - 40
                         break
 
-            coin = Coin(x, spawn_y, is_ground_coin=False)
+            coin = self.pool.acquire(x, spawn_y, is_ground_coin=False, atlas=self.sprite_atlas, rng=self.rng)
             coins.append(coin)
 
         return coins
@@ -190,7 +354,7 @@ class CoinManager:
             return False
 
         for ob in self.obstacle_manager.obstacles:
-            if spawn_x <= ob.rect.x <= spawn_x + 260:
+            if spawn_x <= ob.get_rect().x <= spawn_x + 260:
                 return True
         return False
 
@@ -208,14 +372,14 @@ class CoinManager:
             else:
                 self.waiting_after_obstacle = False
 
-        spawn_ground_group = random.random() < 0.7
+        spawn_ground_group = self.rng.random() < 0.7
 
         if spawn_ground_group and self.has_upcoming_obstacle(spawn_x):
             spawn_ground_group = False
 
         if self.coins:
             last_coin = self.coins[-1]
-            if last_coin.rect.x > spawn_x - self.min_spacing:
+            if last_coin.get_rect().x > spawn_x - self.min_spacing:
                 return None
 
         coins = self.spawn_coins_group(spawn_x, is_ground_group=spawn_ground_group)
@@ -231,24 +395,23 @@ class CoinManager:
 
                 last_is_ground = hasattr(new_coins[0], 'is_ground_coin') and new_coins[0].is_ground_coin
                 if last_is_ground:
-                    self.spawn_interval = random.randint(50, 100)
+                    self.spawn_interval = self.rng.randint(50, 100)
                 else:
-                    self.spawn_interval = random.randint(30, 60)
+                    self.spawn_interval = self.rng.randint(30, 60)
                 self.spawn_timer = 0
 
-        # 更新所有金币位置
-        for coin in self.coins[:]:
-            coin.move(scroll_speed)
+        # 批量更新所有金币位置，移除不活动的金币
+        self.store.move(scroll_speed, self.rng)
+        self.pool.release_inactive(self.coins)
 
-            if not coin.is_active:
-                self.coins.remove(coin)
+        self.world.update("coins")
 
     def check_collections(self, player_rect, coin_multiplier=1):
         """检测玩家与所有金币的碰撞，支持金币翻倍效果"""
         collected_count = 0
 
-        for coin in self.coins:
-            if not coin.is_collected and coin.check_collision(player_rect):
+        for coin in self.world.query("coins", player_rect):
+            if not coin.is_collected:
                 if coin.collect():
                     collected_count += 1
                     # 播放收集音效
@@ -264,5 +427,9 @@ class CoinManager:
             coin.draw(screen)
 
     def clear(self):
-        """清除所有金币"""
-        self.coins.clear()
+        """清除所有金币，并把生成计时恢复为初始值"""
+        self.pool.release_all(self.coins)
+        self.spawn_timer = 0
+        self.spawn_interval = 35
+        self.waiting_after_obstacle = False
+        self.world.update("coins")
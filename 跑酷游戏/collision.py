@@ -0,0 +1,199 @@
+# collision.py
+"""碰撞检测的粗检测（broadphase）。
+
+横版跑酷中所有物体都沿 x 轴排开，所以按矩形左边界排序后做扫描（sweep and prune）：
+- 单个矩形查询：二分查找出 x 方向可能重叠的一小段，再逐个精确检测，O(log n + k)
+- 两组之间求所有重叠对：对每个物体二分查找另一组中 x 方向可能重叠的一段，只精确检测这些组合
+
+各管理器把自己的实体列表注册到同一个 CollisionWorld 中，每帧移动实体后调用 update() 把索引标记为过期，
+索引在这一组第一次被查询时才重建，没有被查询的组（例如不在战斗中时的战斗子弹）不会重建。
+实体少于 LINEAR_SCAN_SIZE 个时不排序，直接按列表顺序逐个检测，
+正常密度下一组只有十几个实体，排序和数组运算的固定开销反而比逐个检测大。
+实体较多时边界保存在 NumPy 数组中，查询和求重叠对都是数组运算；
+保存在 EntityStore 中的实体直接读取列数据，不需要为每个实体创建 Rect。
+查询结果按实体在原列表中的顺序返回，和逐个遍历列表的结果顺序一致。
+"""
+
+import numpy as np
+
+# 实体少于这个数量时按列表顺序逐个检测，不建立排序索引
+LINEAR_SCAN_SIZE = 48
+
+
+class SpatialIndex:
+    """一组实体按矩形左边界排序的索引。
+
+    实体保存在 EntityStore 中时（指定 store），直接从列数据中读取位置；
+    否则实体需要有 rect 属性。
+    """
+
+    def __init__(self, source, store=None):
+        self.source = source  # 返回实体列表的函数
+        self.store = store
+        self.entities = []
+        self.rects = None  # 按列表顺序的 Rect（逐个检测时按需取出）
+        self.is_sorted = False
+        self.dirty = True
+
+    def mark_dirty(self):
+        """实体移动后调用，下次查询时重建索引"""
+        self.dirty = True
+
+    def refresh(self):
+        """索引过期时按实体当前的位置重建（实体较少时不排序，查询时逐个检测）"""
+        if not self.dirty:
+            return
+        self.dirty = False
+        self.entities = list(self.source())
+        self.rects = None
+        self.is_sorted = False
+        if len(self.entities) >= LINEAR_SCAN_SIZE:
+            self.sort()
+
+    def get_rects(self):
+        """按列表顺序的 Rect 列表"""
+        if self.rects is None:
+            if self.store is not None:
+                self.rects = self.store.get_rects([entity.slot for entity in self.entities])
+            else:
+                self.rects = [entity.rect for entity in self.entities]
+        return self.rects
+
+    def _scan(self, rect):
+        """逐个检测，返回与 rect 重叠的实体（按在列表中的顺序）"""
+        if self.store is None:
+            entities = self.entities
+            return [entities[i] for i in rect.collidelistall(self.get_rects())]
+        if rect.width <= 0 or rect.height <= 0:
+            return []
+
+        # 直接比较列数据，不为每个实体创建 Rect（与 Rect.colliderect 的判断相同）
+        left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+        store = self.store
+        x, y, w, h = store.x, store.y, store.w, store.h
+        hits = []
+        for entity in self.entities:
+            slot = entity.slot
+            if (x[slot] < right and x[slot] + w[slot] > left and y[slot] < bottom and y[slot] + h[slot] > top
+                    and w[slot] > 0 and h[slot] > 0):
+                hits.append(entity)
+        return hits
+
+    def sort(self):
+        """按左边界排序，建立数组索引"""
+        self.is_sorted = True
+        if not self.entities:
+            self.set_sorted(*np.zeros((5, 0), np.int64))
+            return
+
+        if self.store is not None:
+            slots = np.array([entity.slot for entity in self.entities], np.intp)
+            x, y, w, h = self.store.gather(slots, "x", "y", "w", "h")
+            order = x.argsort(kind="stable")
+            self.set_sorted(order, x[order], y[order], w[order], h[order])
+        else:
+            x, y, w, h = np.array([tuple(entity.rect) for entity in self.entities], np.int64).T
+            order = x.argsort(kind="stable")
+            self.set_sorted(order, x[order], y[order], w[order], h[order])
+
+    def set_sorted(self, order, x, y, w, h):
+        """设置按左边界排序后的数据，order[i] 为排序后第 i 个实体在列表中的序号"""
+        self.order = order
+        self.lefts = x
+        self.rights = x + w
+        self.tops = y
+        self.bottoms = y + h
+        self.solid = (w > 0) & (h > 0)  # 宽或高为 0 的矩形不与任何矩形重叠
+        self.max_width = int(w.max()) if len(w) else 0
+
+    def __len__(self):
+        return len(self.entities)
+
+    def _candidates(self, rect):
+        """与 rect 重叠的实体在排序后数组中的下标"""
+        if not self.entities or rect.width <= 0 or rect.height <= 0:
+            return ()
+        start = self.lefts.searchsorted(rect.left - self.max_width)
+        end = self.lefts.searchsorted(rect.right)
+        if start >= end:
+            return ()
+        hit = ((self.rights[start:end] > rect.left) & (self.tops[start:end] < rect.bottom)
+               & (self.bottoms[start:end] > rect.top) & self.solid[start:end])
+        return hit.nonzero()[0] + start
+
+    def query(self, rect):
+        """返回与 rect 重叠的实体（按在列表中的顺序）"""
+        self.refresh()
+        if not self.is_sorted:
+            return self._scan(rect)
+        candidates = self._candidates(rect)
+        if not len(candidates):
+            return []
+        entities = self.entities
+        return [entities[i] for i in np.sort(self.order[candidates])]
+
+    def any_overlap(self, rect):
+        """是否有实体与 rect 重叠"""
+        self.refresh()
+        if not self.is_sorted:
+            return len(self._scan(rect)) > 0
+        return len(self._candidates(rect)) > 0
+
+
+class CollisionWorld:
+    """管理多组实体的碰撞索引。"""
+
+    def __init__(self):
+        self.groups = {}
+
+    def register(self, name, source, store=None):
+        """注册一组实体，source 为返回实体列表的函数，store 为保存这些实体的 EntityStore"""
+        self.groups[name] = SpatialIndex(source, store)
+
+    def update(self, *names):
+        """标记指定组的实体已经移动（不指定时标记所有组），索引在下次查询时重建"""
+        for name in names or self.groups:
+            self.groups[name].mark_dirty()
+
+    def query(self, name, rect):
+        return self.groups[name].query(rect)
+
+    def any_overlap(self, name, rect):
+        return self.groups[name].any_overlap(rect)
+
+    def pairs(self, name_a, name_b):
+        """两组之间所有重叠的 (a, b)，按 a 在列表中的顺序、再按 b 在列表中的顺序排列"""
+        a = self.groups[name_a]
+        b = self.groups[name_b]
+        a.refresh()
+        if not len(a):
+            return []
+        b.refresh()
+        if not len(b):
+            return []
+
+        if not a.is_sorted and not b.is_sorted:
+            # 两组都很小：逐个检测
+            b_rects = b.get_rects()
+            return [(entity, b.entities[j]) for entity, rect in zip(a.entities, a.get_rects())
+                    for j in rect.collidelistall(b_rects)]
+        for index in (a, b):
+            if not index.is_sorted:
+                index.sort()
+
+        # 对 a 中每个实体，b 中左边界在 [a.left - b.max_width, a.right) 内的实体 x 方向可能重叠
+        starts = np.searchsorted(b.lefts, a.lefts - b.max_width)
+        counts = np.maximum(np.searchsorted(b.lefts, a.rights) - starts, 0)
+        total = int(counts.sum())
+        if not total:
+            return []
+
+        # 展开成候选对 (ia, ib)，都是排序后数组中的下标
+        ia = np.repeat(np.arange(len(a)), counts)
+        ib = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+        hit = ((b.rights[ib] > a.lefts[ia]) & (a.tops[ia] < b.bottoms[ib]) & (a.bottoms[ia] > b.tops[ib])
+               & a.solid[ia] & b.solid[ib])
+        order_a = a.order[ia[hit]]
+        order_b = b.order[ib[hit]]
+        ranked = np.lexsort((order_b, order_a))
+        return [(a.entities[i], b.entities[j]) for i, j in zip(order_a[ranked], order_b[ranked])]
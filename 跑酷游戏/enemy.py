@@ -5,26 +5,50 @@
 - 资源加载占位与缺失记录
 """
 
+import functools
 import os
 import random
-from typing import Dict, List, Optional
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
+import numpy as np
 import pygame
 
+from asset_manager import assets
+from collision import CollisionWorld
+from entity_store import EntityStore, EntityView
+from object_pool import EntityPool
+
+
+class MonsterType(NamedTuple):
+    """一种怪物共有的属性，同类怪物共用一个记录。"""
+
+    max_health: int
+    damage: int  # 攻击伤害
+    speed: int  # 移动速度
+    attack_range: int  # 攻击范围
+    color: Tuple[int, int, int]  # 占位图颜色
+
+
+# 仅保留绵羊（调整为绵羊的属性，移动速度比原来慢）
+MONSTER_TYPES: Dict[str, MonsterType] = {
+    "sheep": MonsterType(max_health=80, damage=8, speed=1, attack_range=40, color=(240, 240, 240)),
+}
+DEFAULT_MONSTER_TYPE = MONSTER_TYPES["sheep"]._replace(color=(128, 128, 128))
+
 
 class Monster:
-    """简单的怪物实体（仅保留绵羊）。"""
+    """简单的怪物实体（仅保留绵羊）。同类怪物共有的属性保存在 MonsterType 中。"""
+
+    __slots__ = ("rect", "type", "kind", "health", "attack_cooldown", "is_alive", "is_attacking",
+                 "image", "animation_frame")
 
     def __init__(self, x: int, y: int, monster_type: str, image: Optional[pygame.Surface] = None):
         self.rect = pygame.Rect(x, y, 60, 60)
         self.type = monster_type  # 固定为 sheep
+        self.kind = MONSTER_TYPES.get(monster_type, DEFAULT_MONSTER_TYPE)
 
-        # 战斗属性（调整为绵羊的属性）
-        self.health = 80  # 绵羊血量
-        self.max_health = 80
-        self.damage = 8   # 绵羊攻击伤害
-        self.speed = 1    # 绵羊移动速度（比原来慢）
-        self.attack_range = 40  # 攻击范围
+        # 战斗属性
+        self.health = self.kind.max_health
         self.attack_cooldown = 0
 
         # 状态
@@ -33,7 +57,6 @@ class Monster:
 
         # 视觉
         self.image = image if image else self._build_fallback_surface()
-        self.color = self._get_color_by_type()
         self.animation_frame = 0
 
     @property
@@ -44,17 +67,30 @@ class Monster:
     def y(self):
         return self.rect.y
 
-    def _get_color_by_type(self):
-        """仅保留绵羊的颜色（白色+浅灰色）"""
-        colors = {
-            "sheep": (240, 240, 240),  # 绵羊专属颜色（浅白色）
-        }
-        return colors.get(self.type, (128, 128, 128))
+    @property
+    def max_health(self):
+        return self.kind.max_health
+
+    @property
+    def damage(self):
+        return self.kind.damage
+
+    @property
+    def speed(self):
+        return self.kind.speed
+
+    @property
+    def attack_range(self):
+        return self.kind.attack_range
+
+    @property
+    def color(self):
+        return self.kind.color
 
     def _build_fallback_surface(self):
         """生成绵羊的占位图（浅白色矩形）"""
         surface = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
-        surface.fill(self._get_color_by_type())
+        surface.fill(self.kind.color)
         pygame.draw.rect(surface, (200, 200, 200), surface.get_rect(), 2)  # 边框浅灰色
         return surface
 
@@ -63,7 +99,7 @@ class Monster:
             return
 
         # 绵羊向左移动，叠加基础速度
-        self.rect.x -= scroll_speed + self.speed
+        self.rect.x -= scroll_speed + self.kind.speed
 
         if self.attack_cooldown > 0:
             self.attack_cooldown -= 1
@@ -85,7 +121,7 @@ class Monster:
             return False
 
         distance = abs(self.rect.centerx - player_rect.centerx)
-        if distance <= self.attack_range:
+        if distance <= self.kind.attack_range:
             self.is_attacking = True
             self.attack_cooldown = 30
             return True
@@ -105,7 +141,7 @@ class Monster:
     def _draw_health_bar(self, screen: pygame.Surface):
         bar_width = self.rect.width
         bar_height = 5
-        health_percent = max(self.health, 0) / self.max_health
+        health_percent = max(self.health, 0) / self.kind.max_health
 
         pygame.draw.rect(screen, (255, 0, 0), (self.rect.x, self.rect.y - 10, bar_width, bar_height))
         pygame.draw.rect(
@@ -120,44 +156,72 @@ class Monster:
         pygame.draw.rect(screen, (255, 240, 200), effect_rect, border_radius=3)
 
 
-class Bullet:
-    """子弹类（保留原有逻辑，无改动）"""
+class BulletStore(EntityStore):
+    """子弹的列数据，批量移动所有子弹。"""
+
+    def move(self, slots: Optional[List[int]] = None):
+        """按各自的速度（vx 列）移动子弹，slots 为要移动的槽位号列表，默认为所有活动子弹"""
+        if self.vectorized:
+            selected = self.active if slots is None else np.isin(np.arange(self.capacity), slots)
+            self.x[selected] += self.vx[selected]
+            self.active[selected & ((self.x > 1000) | (self.x < -50))] = False
+            return
+        if slots is None:
+            slots = self.active_slots()
+
+        x, vx, active = self.x, self.vx, self.active
+        for slot in slots:
+            x[slot] += vx[slot]
+            if x[slot] > 1000 or x[slot] < -50:
+                active[slot] = False
+
+
+class Bullet(EntityView):
+    """子弹类（BulletStore 中一个槽位的视图）"""
+
+    __slots__ = ("image", "damage", "direction")
+    speed = 10  # 所有子弹速度相同
+
     def __init__(self, x: int, y: int, direction: str = "right", damage: int = 20,
-                 image: Optional[pygame.Surface] = None):
+                 image: Optional[pygame.Surface] = None, store: Optional[BulletStore] = None):
+        super().__init__(store if store is not None else BulletStore(capacity=1))
+        self.reset(x, y, direction, damage, image)
+
+    def reset(self, x: int, y: int, direction: str = "right", damage: int = 20,
+              image: Optional[pygame.Surface] = None):
+        """重新初始化子弹（对象池重复使用时调用）"""
         self.image = image
         if self.image:
             if direction == "right":
-                self.rect = self.image.get_rect(midleft=(x, y))
+                rect = self.image.get_rect(midleft=(x, y))
             else:
-                self.rect = self.image.get_rect(midright=(x, y))
+                rect = self.image.get_rect(midright=(x, y))
         else:
-            self.rect = pygame.Rect(x, y, 15, 5)
-        self.speed = 10
+            rect = pygame.Rect(x, y, 15, 5)
         self.damage = damage
         self.direction = direction
-        self.is_active = True
+        self.alloc_slot(x=rect.x, y=rect.y, w=rect.width, h=rect.height,
+                        vx=self.speed if direction == "right" else -self.speed)
 
     def update(self):
-        if self.direction == "right":
-            self.rect.x += self.speed
-        else:
-            self.rect.x -= self.speed
-
-        if self.rect.x > 1000 or self.rect.x < -50:
-            self.is_active = False
+        self.store.move([self.slot])
 
     def draw(self, screen: pygame.Surface):
-        if not self.is_active:
+        if not self.store.active[self.slot]:
             return
         if self.image:
-            screen.blit(self.image, self.rect)
+            screen.blit(self.image, self.pos)
         else:
-            pygame.draw.rect(screen, (255, 240, 0), self.rect)
-            pygame.draw.rect(screen, (255, 255, 255), self.rect, 1)
+            rect = self.get_rect()
+            pygame.draw.rect(screen, (255, 240, 0), rect)
+            pygame.draw.rect(screen, (255, 255, 255), rect, 1)
 
 
 class Skill:
     """技能类（保留原有逻辑，无改动）"""
+
+    __slots__ = ("name", "type", "cooldown", "current_cooldown", "damage", "effect", "is_ready")
+
     def __init__(self, name: str, skill_type: str, cooldown: int, damage: int, effect: Optional[str]):
         self.name = name
         self.type = skill_type
@@ -198,48 +262,64 @@ class Skill:
 class EnemyManager:
     """统一管理怪物（仅绵羊）和战斗交互。"""
 
-    def __init__(self):
+    # 怪物和子弹图片：路径 -> 尺寸（优先使用仓库现有的贴图）
+    BASE_DIR = os.path.dirname(__file__)
+    MONSTER_IMAGES = {
+        "sheep": (os.path.join(BASE_DIR, "assets", "sheep.png"), (60, 60)),  # 绵羊图片路径（修正为实际位置）
+    }
+    BULLET_IMAGE = (os.path.join(BASE_DIR, "image", "player_bullet.png"), (20, 10))
+
+    @classmethod
+    def preload_images(cls):
+        """预先解码怪物和子弹图片（可以在后台线程中调用）"""
+        for path, size in [*cls.MONSTER_IMAGES.values(), cls.BULLET_IMAGE]:
+            if os.path.exists(path):
+                assets.load(path, size)
+
+    def __init__(self, rng=None, world: Optional[CollisionWorld] = None):
         self.monsters: List[Monster] = []
+        self.rng = rng or random  # 敌人的随机数流（不指定时使用全局random）
         self.player_bullets: List[Bullet] = []
+        self.bullet_store = BulletStore()  # 玩家子弹的位置和状态（按列保存，批量更新）
+        self.bullet_pool = EntityPool(functools.partial(Bullet, store=self.bullet_store), self.bullet_store)
         self.spawn_timer = 0
         self.spawn_interval = 120  # 绵羊生成间隔（可自行调整）
         self.missing_assets: List[str] = []
 
         self.monster_images = self._load_monster_images()
         self.bullet_image = self._load_bullet_image()
+        self.bullet_pool.prefill(32, 0, 0, image=self.bullet_image)
+
+        # 注册到碰撞检测（多个管理器共用同一个 CollisionWorld）
+        self.world = world or CollisionWorld()
+        self.world.register("monsters", lambda: self.monsters)
+        self.world.register("player_bullets", lambda: self.player_bullets, self.bullet_store)
 
     def _load_monster_images(self) -> Dict[str, pygame.Surface]:
         """仅加载绵羊的图片"""
         images: Dict[str, pygame.Surface] = {}
-        # 仅保留绵羊的图片路径，优先使用仓库现有的贴图
-        base_dir = os.path.dirname(__file__)
-        expected = {
-            "sheep": os.path.join(base_dir, "assets", "sheep.png"),  # 绵羊图片路径（修正为实际位置）          
-        }
-        for monster_type, path in expected.items():
+        for monster_type, (path, size) in self.MONSTER_IMAGES.items():
             if os.path.exists(path):
-                loaded = pygame.image.load(path).convert_alpha()
-                loaded = pygame.transform.scale(loaded, (60, 60))
-                images[monster_type] = loaded
+                images[monster_type] = assets.acquire(path, size)
             else:
                 self.missing_assets.append(path)
 
         return images
 
     def _load_bullet_image(self) -> Optional[pygame.Surface]:
-        base_dir = os.path.dirname(__file__)
-        bullet_path = os.path.join(base_dir, "image", "player_bullet.png")
+        bullet_path, size = self.BULLET_IMAGE
         if not os.path.exists(bullet_path):
             self.missing_assets.append(bullet_path)
             return None
-        loaded = pygame.image.load(bullet_path).convert_alpha()
-        return pygame.transform.scale(loaded, (20, 10))
+        return assets.acquire(bullet_path, size)
 
     def reset(self):
         """重置怪物列表"""
         self.monsters.clear()
-        self.player_bullets.clear()
+        self.bullet_pool.release_all(self.player_bullets)
         self.spawn_timer = 0
+        self.spawn_interval = 120
+        self.world.update("monsters", "player_bullets")
 
     def spawn_monster(self):
         """仅生成绵羊怪物"""
@@ -252,7 +332,7 @@ class EnemyManager:
 
     def spawn_player_bullet(self, player_rect: pygame.Rect, damage: int = 25):
         """生成玩家子弹（无改动）"""
-        bullet = Bullet(
+        bullet = self.bullet_pool.acquire(
             x=player_rect.right,
             y=player_rect.centery,
             direction="right",
@@ -266,31 +346,27 @@ class EnemyManager:
         self.spawn_timer += 1
         if self.spawn_timer >= self.spawn_interval:
             self.spawn_monster()
-            self.spawn_interval = random.randint(100, 160)  # 生成间隔随机
+            self.spawn_interval = self.rng.randint(100, 160)  # 生成间隔随机
             self.spawn_timer = 0
 
         player_hit = False
 
         # 更新绵羊怪物
-        for monster in self.monsters[:]:
+        for monster in self.monsters:
             monster.update(scroll_speed)
-            if monster.rect.right < 0 or not monster.is_alive:
-                self.monsters.remove(monster)
-
-        # 更新子弹碰撞
-        for bullet in self.player_bullets[:]:
-            bullet.update()
-            if not bullet.is_active:
-                self.player_bullets.remove(bullet)
-                continue
-
-            for monster in self.monsters[:]:
-                if bullet.rect.colliderect(monster.rect) and monster.is_alive:
-                    bullet.is_active = False
-                    is_dead = monster.take_damage(bullet.damage)
-                    if is_dead:
-                        self.monsters.remove(monster)
-                    break
+        self.monsters = [monster for monster in self.monsters if monster.rect.right >= 0 and monster.is_alive]
+
+        # 批量更新子弹，移除飞出屏幕的子弹
+        self.bullet_store.move()
+        self.bullet_pool.release_inactive(self.player_bullets)
+
+        # 子弹和绵羊的碰撞：只检测 x 方向重叠的组合，每颗子弹只击中列表中第一个还活着的绵羊
+        self.world.update("monsters", "player_bullets")
+        for bullet, monster in self.world.pairs("player_bullets", "monsters"):
+            if bullet.is_active and monster.is_alive:
+                bullet.is_active = False
+                monster.take_damage(bullet.damage)
+        self.monsters = [monster for monster in self.monsters if monster.is_alive]
 
         # 检测绵羊攻击玩家
         if player_rect:
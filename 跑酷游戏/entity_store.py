@@ -0,0 +1,236 @@
+# entity_store.py
+"""按列保存的实体数据（struct of arrays）。
+
+金币、障碍物、子弹的位置、尺寸、速度和状态按列保存，每个实体占一个槽位，
+Coin / Obstacle / Bullet 对象只保存槽位号和图片等不变的数据，是列数据的轻量视图。
+位置通过 get_rect() 读取（返回副本），修改位置要用 set_rect()；视图没有 rect 属性，
+遗留的 entity.rect.x -= n 这类写法会直接报错，而不是修改一个副本后悄悄失效。
+
+正常密度下每种实体只有十几个，这时列是普通的 Python 列表，管理器逐个更新实体，
+没有 NumPy 数组运算的固定开销（创建掩码、花式索引、取出标量）。
+同时存在的实体达到 VECTORIZE_SIZE 个时，列转换成 NumPy 数组（vectorized 为 True），
+管理器改为对整列做批量运算；实体减少到一半以下时再转换回列表，避免在阈值附近反复转换。
+
+坐标和 pygame.Rect 一样是整数；把浮点数写入坐标时使用 round_like_rect / round_array_like_rect，
+取整方式和给 Rect 属性赋浮点数时相同，逐个更新和批量运算的结果完全一致。
+"""
+
+import math
+from itertools import compress, count
+from operator import gt
+
+import numpy as np
+import pygame
+
+# 同时存在的实体达到这个数量时改用 NumPy 数组批量运算，减少到一半以下时改回逐个更新
+VECTORIZE_SIZE = 128
+
+# 每种实体都有的列（列名 -> 类型）
+BASE_COLUMNS = {
+    "x": int,
+    "y": int,
+    "w": int,
+    "h": int,
+    "vx": int,
+    "active": bool,
+    "serial": int,  # 创建顺序，用于按管理器列表的顺序处理
+}
+
+
+def round_like_rect(value):
+    """与给 pygame.Rect 属性赋浮点数时相同的取整（四舍五入，0.5 远离 0）"""
+    whole = math.trunc(value)
+    fraction = value - whole
+    if fraction >= 0.5:
+        return whole + 1
+    if fraction <= -0.5:
+        return whole - 1
+    return whole
+
+
+def round_array_like_rect(values):
+    """round_like_rect 的数组版本"""
+    whole = np.trunc(values)
+    return (whole + np.sign(values) * (np.abs(values - whole) >= 0.5)).astype(np.int64)
+
+
+class EntityStore:
+    """一类实体的列数据。容量不足时自动翻倍，释放的槽位会被重复使用。
+
+    vectorized 为 False 时每列是 Python 列表，为 True 时每列是 NumPy 数组，
+    两种情况下都可以用 store.x[slot] 读写单个槽位。
+    """
+
+    def __init__(self, columns=None, capacity=32):
+        self.columns = dict(BASE_COLUMNS)
+        self.columns.update(columns or {})
+        self.vectorized = False
+        self.in_use = []
+        self.free_slots = []
+        self.capacity = 0
+        self.next_serial = 0
+        for name in self.columns:
+            setattr(self, name, [])
+        self._resize(max(1, capacity))
+
+    def _all_columns(self):
+        """[(列名, 类型), ...]，包括记录槽位是否已分配的 in_use"""
+        return [*self.columns.items(), ("in_use", bool)]
+
+    def _resize(self, capacity):
+        extra = capacity - self.capacity
+        for name, kind in self._all_columns():
+            column = getattr(self, name)
+            if self.vectorized:
+                setattr(self, name, np.concatenate([column, np.zeros(extra, kind)]))
+            else:
+                column.extend([kind()] * extra)
+        # 倒序放入，pop() 时先得到小的槽位号
+        self.free_slots.extend(range(capacity - 1, self.capacity - 1, -1))
+        self.capacity = capacity
+
+    def _set_vectorized(self, vectorized):
+        """在 Python 列表和 NumPy 数组之间转换所有列"""
+        for name, kind in self._all_columns():
+            column = getattr(self, name)
+            setattr(self, name, np.array(column, kind) if vectorized else column.tolist())
+        self.vectorized = vectorized
+
+    def __len__(self):
+        return self.capacity - len(self.free_slots)
+
+    def reserve(self, count):
+        """预先准备好同时保存 count 个实体的容量和列的表示，之后分配槽位时不会再扩容或转换"""
+        if self.capacity < count:
+            self._resize(count)
+        if not self.vectorized and count >= VECTORIZE_SIZE:
+            self._set_vectorized(True)
+
+    def alloc(self, **values):
+        """分配一个槽位并写入初始值（未给出的列为 0，active 默认为 True）"""
+        if not self.free_slots:
+            self._resize(self.capacity * 2)
+        if not self.vectorized and len(self) + 1 >= VECTORIZE_SIZE:
+            self._set_vectorized(True)
+        slot = self.free_slots.pop()
+        self.in_use[slot] = True
+        values.setdefault("active", True)
+        values["serial"] = self.next_serial
+        self.next_serial += 1
+        for name, kind in self.columns.items():
+            getattr(self, name)[slot] = kind(values.get(name, 0))
+        return slot
+
+    def release(self, slots):
+        """释放槽位（槽位号的列表）"""
+        in_use, active = self.in_use, self.active
+        for slot in slots:
+            in_use[slot] = False
+            active[slot] = False
+        self.free_slots.extend(slots)
+        if self.vectorized and len(self) < VECTORIZE_SIZE // 2:
+            self._set_vectorized(False)
+
+    def clear(self):
+        """释放所有槽位"""
+        if self.vectorized:
+            self._set_vectorized(False)
+        self.in_use = [False] * self.capacity
+        self.active = [False] * self.capacity
+        self.free_slots = list(range(self.capacity - 1, -1, -1))
+
+    def active_slots(self):
+        """所有活动实体的槽位号"""
+        if self.vectorized:
+            return self.active.nonzero()[0].tolist()
+        return list(compress(range(self.capacity), self.active))
+
+    def inactive_slots(self):
+        """已经分配、但已经不活动的槽位号"""
+        if self.vectorized:
+            return (self.in_use & ~self.active).nonzero()[0].tolist()
+        if self.in_use == self.active:  # 不活动的槽位都已经释放（大多数帧）
+            return []
+        return list(compress(count(), map(gt, self.in_use, self.active)))
+
+    def in_list_order(self, slots):
+        """把槽位按创建顺序（即管理器列表中的顺序）排列"""
+        return sorted(slots, key=self.serial.__getitem__)
+
+    def gather(self, slots, *names):
+        """指定槽位的若干列（NumPy 数组，按 slots 的顺序）"""
+        if self.vectorized:
+            return [getattr(self, name)[slots] for name in names]
+        return [np.array([getattr(self, name)[slot] for slot in slots], self.columns[name]) for name in names]
+
+    def get_rect(self, slot):
+        if self.vectorized:
+            return pygame.Rect(int(self.x[slot]), int(self.y[slot]), int(self.w[slot]), int(self.h[slot]))
+        return pygame.Rect(self.x[slot], self.y[slot], self.w[slot], self.h[slot])
+
+    def get_rects(self, slots):
+        """多个槽位的 Rect 列表（按 slots 的顺序）"""
+        if self.vectorized:
+            x, y, w, h = (column.tolist() for column in self.gather(slots, "x", "y", "w", "h"))
+            return list(map(pygame.Rect, x, y, w, h))
+        x, y, w, h = self.x, self.y, self.w, self.h
+        return [pygame.Rect(x[slot], y[slot], w[slot], h[slot]) for slot in slots]
+
+    def set_rect(self, slot, rect):
+        self.x[slot], self.y[slot], self.w[slot], self.h[slot] = rect
+
+    # ==================== 快照 ====================
+    def snapshot(self):
+        return {
+            "columns": {name: getattr(self, name).copy() for name, _ in self._all_columns()},
+            "vectorized": self.vectorized,
+            "free_slots": list(self.free_slots),
+            "capacity": self.capacity,
+            "next_serial": self.next_serial,
+        }
+
+    def restore(self, state):
+        for name, column in state["columns"].items():
+            setattr(self, name, column.copy())
+        self.vectorized = state["vectorized"]
+        self.free_slots = list(state["free_slots"])
+        self.capacity = state["capacity"]
+        self.next_serial = state["next_serial"]
+
+
+class EntityView:
+    """实体存储中一个槽位的视图，提供 get_rect() / set_rect() 和 is_active 属性。
+
+    子类在 reset() 中调用 alloc_slot() 取得槽位，对象被对象池重复使用时会重新取得槽位。
+    视图和子类都使用 __slots__，没有每个对象的 __dict__。
+    """
+
+    __slots__ = ("store", "slot")
+
+    def __init__(self, store):
+        self.store = store
+        self.slot = -1
+
+    def alloc_slot(self, **values):
+        self.slot = self.store.alloc(**values)
+
+    def get_rect(self):
+        """当前位置的 Rect（只读副本，修改它不会移动实体）"""
+        return self.store.get_rect(self.slot)
+
+    def set_rect(self, rect):
+        """把实体移动到 rect 的位置和尺寸"""
+        self.store.set_rect(self.slot, rect)
+
+    @property
+    def is_active(self):
+        return bool(self.store.active[self.slot])
+
+    @is_active.setter
+    def is_active(self, value):
+        self.store.active[self.slot] = bool(value)
+
+    @property
+    def pos(self):
+        """绘制用的左上角坐标"""
+        return int(self.store.x[self.slot]), int(self.store.y[self.slot])
@@ -0,0 +1,41 @@
+# font_registry.py
+"""全局字体注册表。
+
+pygame.font.Font 每次创建都要重新解析字体文件，STKAITI.TTF 这样的中文字体很大，
+所以所有界面代码都通过 get_font() 获取字体，同一 (路径, 字号) 只创建一次。
+"""
+
+import threading
+
+import pygame
+
+
+# 游戏默认使用的中文字体
+DEFAULT_FONT_PATH = 'image/STKAITI.TTF'
+
+# 已创建的字体：键为 (路径, 字号)
+_fonts = {}
+_lock = threading.Lock()
+
+
+def get_font(size, path=DEFAULT_FONT_PATH):
+    """获取指定路径和字号的字体（第一次使用时创建）"""
+    key = (path, size)
+    with _lock:
+        font = _fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(path, size)
+            _fonts[key] = font
+        return font
+
+
+def preload_fonts(sizes, path=DEFAULT_FONT_PATH):
+    """预先创建一组字号的字体"""
+    for size in sizes:
+        get_font(size, path)
+
+
+def clear_fonts():
+    """清空字体注册表（pygame.font.quit() 之后需要调用）"""
+    with _lock:
+        _fonts.clear()
@@ -7,9 +7,18 @@ import random
 from player import Player
 from obstacle import ObstacleManager
 from coin import CoinManager
-from save_system import SaveSystem
+from save_system import SaveSystem, SqliteSaveStorage
 from battle_system import BattleBullet, BattleMonster
 from enemy import EnemyManager
+from asset_manager import assets
+from asset_loader import AssetLoader
+from text_cache import render_text
+from font_registry import get_font, preload_fonts
+from background import ParallaxBackground
+from collision import CollisionWorld
+from object_pool import ObjectPool
+from profiler import FrameProfiler
+from replay import INPUT_JUMP, INPUT_SHOOT, INPUT_SHOOT_HELD, ReplayRecorder
 
 
 # 初始化pygame
@@ -17,11 +26,27 @@ pygame.init()
 
 
 class Game:
-    def __init__(self):
-        """初始化游戏"""
+    # 需要等待游戏内资源加载完成才能进入的状态
+    GAMEPLAY_STATES = ("shop", "playing", "battle", "paused", "game_over")
+    # 静态菜单界面：只在悬停或数据变化时重绘，并只更新变化的区域
+    STATIC_STATES = ("title", "load_save", "saves_list", "menu", "shop")
+    # 游戏逻辑中每个子系统使用独立的随机数流，同一个种子下一局游戏的结果完全相同
+    RNG_STREAMS = ("obstacle", "coin", "enemy", "star")
+
+    def __init__(self, headless=False):
+        """初始化游戏
+
+        headless=True 时为无界面模式（见 simulation.py）：不创建窗口、不转换图片像素格式、
+        不加载声音和只用于绘制的资源，资源同步加载，按键由 held_keys 提供。
+        """
         # 1. 创建窗口和时钟
-        self.screen = pygame.display.set_mode((800, 600))
-        pygame.display.set_caption("跑酷游戏")
+        self.headless = headless
+        if headless:
+            assets.convert_images = False
+            self.screen = pygame.Surface((800, 600))
+        else:
+            self.screen = pygame.display.set_mode((800, 600))
+            pygame.display.set_caption("跑酷游戏")
         self.clock = pygame.time.Clock()
 
         # 2. 游戏状态
@@ -31,10 +56,12 @@ class Game:
 
         # 3. 游戏核心对象
         self.player = None
-        self.obstacle_manager = ObstacleManager()
-        self.coin_manager = CoinManager(self.obstacle_manager)
-        self.save_system = SaveSystem()
-        self.enemy_manager = EnemyManager()
+        self.player_pool = {}  # 已加载的角色（角色id -> Player），整个进程内复用
+        self.obstacle_manager = None  # 障碍物、金币、敌人管理器在后台加载
+        self.coin_manager = None
+        # 存档保存在 SQLite 数据库中，第一次运行时导入原来的 game_saves.json
+        self.save_system = SaveSystem(storage=SqliteSaveStorage("game_saves.db", migrate_from="game_saves.json"))
+        self.enemy_manager = None
 
         # 4. 游戏数据
         self.score = 0
@@ -43,9 +70,16 @@ class Game:
         self.current_game_coins = 0
         self.game_over_time = 0
 
+        # 4.1 确定性模拟：每局开始时用种子重置各子系统的随机数流，逻辑按固定步长更新
+        self.rngs = {name: random.Random() for name in self.RNG_STREAMS}
+        self.run_seed = None  # 当前这一局的种子
+        self.simulation_frame = 0  # 当前这一局已经模拟的逻辑帧数
+        self.max_updates_per_frame = 5  # 渲染过慢时每帧最多追赶的逻辑帧数
+
         # 5. 角色系统
         self.selected_character = None  # 1或2，None表示未选择
         self.character_animation_folders = {1: 'gif', 2: 'gif'}
+        self.character_animations = {1: "nick", 2: "judy"}  # animations.json 中的角色动画名称
         self.character_abilities = {
             1: {"can_double_jump": False, "name": "角色一"},
             2: {"can_double_jump": True, "name": "角色二"}
@@ -67,7 +101,8 @@ class Game:
         self.stars = []  # 星星粒子效果列表
 
         # 8. 背景系统（修改为三层背景）
-        self.bg_layers = self.load_background_layers()  # 三层背景
+        self.bg_layers = None  # 三层背景（后台加载）
+        self.background = None  # 预先拼接好的视差背景合成器（后台加载）
         # 每层背景的x坐标（初始位置）
         self.bg1_x1, self.bg1_x2 = 0, 800  # 远层（最慢）
         self.bg2_x1, self.bg2_x2 = 0, 800  # 中层（中速）
@@ -79,13 +114,14 @@ class Game:
             "bg3": 8  # 近层：最快（原速度）
         }
         self.menu_background = self.load_uibackground()
-        self.shop_background = self.load_shop_background()
+        self.shop_background = None  # 商店背景（后台加载）
 
-        # 9. 字体系统
-        self.font = pygame.font.Font('image/STKAITI.TTF', 48)
-        self.medium_font = pygame.font.Font('image/STKAITI.TTF', 36)
-        self.small_font = pygame.font.Font('image/STKAITI.TTF', 24)
-        self.ui_font = pygame.font.Font('image/STKAITI.TTF', 28)
+        # 9. 字体系统（预先创建界面中用到的所有字号）
+        preload_fonts([48, 36, 32, 28, 24, 20])
+        self.font = get_font(48)
+        self.medium_font = get_font(36)
+        self.small_font = get_font(24)
+        self.ui_font = get_font(28)
 
         # 10. 存档系统相关
         self.save_list_offset = 0
@@ -98,16 +134,26 @@ class Game:
         self.coin_effect_pos = (0, 0)
         self.show_coin_effect = False
 
-        # 12. 鼠标系统
+        # 12. 鼠标和按键
         self.mouse_pos = (0, 0)
+        self.held_keys = set()  # 无界面模式下当前按住的按键
+        self.pending_input = 0  # 下一个逻辑帧要处理的按键（INPUT_* 位）
+        self.frame_input = 0  # 当前逻辑帧的输入
+
+        # 12.1 录像（设置环境变量 PARKOUR_REPLAY_DIR=目录 时，每局结束后保存录像）
+        self.replay_dir = os.environ.get("PARKOUR_REPLAY_DIR")
+        self.input_recorder = None
 
         # 13. 帧率控制
         self.target_fps = 60
-        self.last_frame_time = 0
+        self.idle_fps = 20  # 静态界面没有变化时降低循环频率
+        self.screen_idle = False
+        self.static_screen_key = None  # 上一次绘制静态界面时的内容标识
+        self.static_hover_index = None  # 上一次绘制时悬停的控件序号
         self.frame_count = 0
         self.frame_timer = 0
-        # 14. 加载商店图片
-        self.shop_images = self.load_shop_images()
+        # 14. 商店图片（后台加载）
+        self.shop_images = {}
 
         # 15. 战斗系统
         self.max_health = 100
@@ -120,9 +166,82 @@ class Game:
         self.player_shoot_cooldown = 0
         self.monster_fire_interval = 45
         self.battle_score_reward = 200
-        self.battle_assets = self.load_battle_assets()
+        self.battle_assets = {}  # 战斗图片（后台加载）
+
+        # 碰撞检测：障碍物、金币、敌人管理器和战斗子弹都注册到同一个 CollisionWorld
+        self.collision_world = CollisionWorld()
+        self.collision_world.register("battle_player_bullets", lambda: self.player_bullets)
+        self.collision_world.register("battle_monster_bullets", lambda: self.monster_bullets)
+        self.battle_bullet_pool = ObjectPool(BattleBullet, alive=lambda bullet: bullet.active)
+        self.battle_bullet_pool.prefill(16, 0, 0, 0)
+
+        # 16. 帧耗时分析（F3 显示浮层，设置环境变量 PARKOUR_PROFILE=文件路径 时退出游戏会导出数据）
+        self.profiler = FrameProfiler(budget_ms=1000 / self.target_fps)
+        self.profile_output = os.environ.get("PARKOUR_PROFILE")
+        self.profiler_font = get_font(18, path=None)
+
+        # 17. 后台资源加载（标题画面所需的资源已经同步加载，其余按优先级在后台加载）
+        self.asset_loader = self.create_asset_loader()
+        if headless:
+            self.asset_loader.run()
+        else:
+            self.asset_loader.start()
 
     # ==================== 资源加载方法 ====================
+    def create_asset_loader(self):
+        """创建分阶段的资源加载器：先加载菜单资源，再加载游戏内资源"""
+        loader = AssetLoader(prepare=assets.convert_pending)
+        if self.headless:
+            # 无界面模式只需要游戏逻辑用到的对象
+            loader.add_stage("menu", [])
+            loader.add_stage("gameplay", [("游戏对象", self.create_managers)])
+            return loader
+
+        loader.add_stage("menu", [
+            ("角色头像", self.load_menu_portraits),
+        ])
+        # 后台线程只解码和缩放图片，转换像素格式、合成视差背景和创建管理器在主线程的完成函数中进行
+        loader.add_stage("gameplay", [
+            ("游戏背景", lambda: {"bg_layers": self.load_background_layers()}, self.build_parallax_background),
+            ("商店背景", lambda: {"shop_background": self.load_shop_background()}, assets.resolve),
+            ("商店图片", lambda: {"shop_images": self.load_shop_images()}, assets.resolve),
+            ("战斗图片", lambda: {"battle_assets": self.load_battle_assets()}, assets.resolve),
+            ("游戏对象", self.preload_manager_images, lambda result: self.create_managers()),
+        ])
+        return loader
+
+    def apply_loaded_assets(self):
+        """把后台加载完成的资源设置到游戏对象上（主线程每帧调用）"""
+        for name, value in self.asset_loader.collect_results().items():
+            setattr(self, name, value)
+
+    def is_waiting_for_assets(self):
+        """当前状态需要的资源是否还没加载完成"""
+        return self.state in self.GAMEPLAY_STATES and not self.asset_loader.is_stage_ready("gameplay")
+
+    def load_menu_portraits(self):
+        """预先加载菜单中的角色头像"""
+        assets.acquire('image/nick.png', (80, 80))
+        assets.acquire('image/judy.png', (80, 80))
+        return {}
+
+    def preload_manager_images(self):
+        """预先解码障碍物和敌人的图片（后台线程），管理器之后在主线程中创建"""
+        ObstacleManager.preload_images()
+        EnemyManager.preload_images()
+        return {}
+
+    def create_managers(self):
+        """创建障碍物、金币和敌人管理器"""
+        world = self.collision_world
+        obstacle_manager = ObstacleManager(rng=self.rngs["obstacle"], world=world)
+        return {
+            "obstacle_manager": obstacle_manager,
+            "coin_manager": CoinManager(obstacle_manager, sound=not self.headless, rng=self.rngs["coin"],
+                                        world=world),
+            "enemy_manager": EnemyManager(rng=self.rngs["enemy"], world=world),
+        }
+
     def load_background_layers(self):
         """加载三层游戏背景图片（远/中/近）"""
         bg_layers = {}
@@ -134,39 +253,34 @@ class Game:
         }
 
         for layer_name, path in bg_paths.items():
-            try:
-                # 区分 PNG（透明）和其他格式（非透明）
-                if path.lower().endswith('.png'):
-                    background = pygame.image.load(path).convert_alpha()  # 保留透明通道
-                else:
-                    background = pygame.image.load(path).convert()
-                background = pygame.transform.scale(background, (800, 600))
-                bg_layers[layer_name] = background
+            # 区分 PNG（透明）和其他格式（非透明）
+            background = assets.acquire(path, (800, 600), alpha=path.lower().endswith('.png'))
+            if background:
                 print(f"成功加载{layer_name}背景: {path}")
-            except Exception as e:
-                # 异常时也用 convert_alpha 加载默认背景（如果默认背景是PNG）
-                print(f"加载{layer_name}失败({e})，使用默认背景")
-                if '像素背景.png'.endswith('.png'):
-                    background = pygame.image.load('image/像素背景.png').convert_alpha()
-                else:
-                    background = pygame.image.load('image/像素背景.png').convert()
-                background = pygame.transform.scale(background, (800, 600))
-                bg_layers[layer_name] = background
+            else:
+                # 加载失败时使用默认背景
+                print(f"加载{layer_name}失败，使用默认背景")
+                background = assets.acquire('image/像素背景.png', (800, 600))
+            bg_layers[layer_name] = background
         return bg_layers
 
+    def build_parallax_background(self, result):
+        """用转换好的三层背景预先拼接成视差背景长条（主线程）"""
+        bg_layers = assets.resolve(result["bg_layers"])
+        background = ParallaxBackground([bg_layers['bg1'], bg_layers['bg2'], bg_layers['bg3']])
+        return {"bg_layers": bg_layers, "background": background}
+
     def load_uibackground(self):
         """加载UI背景图片"""
         uibackground_path = 'image/背景.jpg'
-        uibackground = pygame.image.load(uibackground_path).convert()
-        uibackground = pygame.transform.scale(uibackground, (800, 600))
+        uibackground = assets.acquire(uibackground_path, (800, 600), alpha=False)
         print(f"成功加载UI背景: {uibackground_path}")
         return uibackground
 
     def load_shop_background(self):
         """加载商店背景图片"""
         background_path = 'image/shop.png'
-        background = pygame.image.load(background_path).convert()
-        background = pygame.transform.scale(background, (800, 600))
+        background = assets.acquire(background_path, (800, 600), alpha=False)
         print(f"成功加载商店背景: {background_path}")
         return background
 
@@ -181,16 +295,14 @@ class Game:
 
 
         for item_type, path in item_images.items():
-            image = pygame.image.load(path).convert_alpha()
-            image = pygame.transform.scale(image, (80, 80))
-            shop_images[item_type] = image
+            shop_images[item_type] = assets.acquire(path, (80, 80))
             print(f"成功加载商店图片: {path}")
 
         return shop_images
 
     def load_battle_assets(self):
         """加载战斗相关图片"""
-        assets = {}
+        battle_assets = {}
         paths = {
             "player_bullet": 'image/player_bullet.png',
             "monster_bullet": 'image/monster_bullet.png',
@@ -212,38 +324,67 @@ class Game:
 
         for key, path in paths.items():
             if os.path.exists(path):
-                loaded = pygame.image.load(path).convert_alpha()
-                target_size = placeholder_sizes[key]
-                assets[key] = pygame.transform.scale(loaded, target_size)
+                battle_assets[key] = assets.acquire(path, placeholder_sizes[key])
             else:
                 # 使用占位图，确保战斗元素始终可见
                 color = (255, 200, 80) if "bullet" in key else (200, 120, 120)
-                assets[key] = create_placeholder(placeholder_sizes[key], color)
-        return assets
+                battle_assets[key] = create_placeholder(placeholder_sizes[key], color)
+        return battle_assets
 
 
     # ==================== 游戏核心控制方法 ====================
     def run(self):
         """运行游戏主循环"""
+        profiler = self.profiler
+        fixed_dt = 1 / self.target_fps
+        accumulator = 0.0
+        previous_time = time.perf_counter()
         while self.running:
-            current_time = pygame.time.get_ticks()
-
-            # 计算帧时间
-            frame_time = current_time - self.last_frame_time
-            self.last_frame_time = current_time
-
-            self.handle_events()
-            self.update()
-            self.draw()
+            # 开始新的一帧（同时记录上一帧的总耗时）
+            profiler.begin_frame()
+
+            # 固定步长：逻辑始终按 1/60 秒一步更新，渲染掉帧时在下一帧补上落下的步数
+            current_time = time.perf_counter()
+            accumulator += min(current_time - previous_time, fixed_dt * self.max_updates_per_frame)
+            previous_time = current_time
+
+            with profiler.section("events"):
+                self.handle_events()
+            with profiler.section("update"):
+                while accumulator >= fixed_dt:
+                    self.update()
+                    accumulator -= fixed_dt
+            with profiler.section("draw"):
+                self.draw()
+
+            self.clock.tick(self.idle_fps if self.screen_idle else self.target_fps)
+
+        # 保存未结束的录像
+        if self.input_recorder:
+            self.finish_replay()
+
+        # 导出帧耗时数据
+        if self.profile_output:
+            try:
+                profiler.dump(self.profile_output)
+            except Exception as e:
+                print(f"导出帧耗时数据失败: {e}")
 
-            self.clock.tick(self.target_fps)
+        # 把存档日志中还没写入磁盘的记录写入磁盘
+        self.save_system.close()
 
         # 退出游戏
         pygame.quit()
         sys.exit()
 
-    def start_game(self):
-        """开始游戏"""
+    def start_game(self, seed=None):
+        """开始游戏
+
+        seed: 这一局的随机种子，不指定时随机选择（记录在 run_seed 中，可用于重放）
+        """
+        self.seed_rngs(seed if seed is not None else random.randrange(2 ** 32))
+        self.pending_input = 0
+
         # 如果没有选择角色，默认选择角色1
         if not self.selected_character:
             self.selected_character = 1
@@ -251,15 +392,8 @@ class Game:
         # 应用购买的物品效果
         self.apply_purchased_items()
 
-        # 创建玩家对象
-        ability = self.character_abilities[self.selected_character]
-        animation_folder = self.character_animation_folders[self.selected_character]
-
-        self.player = Player(100, 250,
-                             can_double_jump=ability["can_double_jump"],
-                             player_id=self.selected_character,
-                             image_folder=animation_folder,
-                             shoot_image_path="image/player_shoot.png")
+        # 获取玩家对象（已加载过的角色直接复用）
+        self.player = self.get_player(self.selected_character)
 
         self.score = 0
         self.current_game_coins = 0
@@ -269,14 +403,50 @@ class Game:
         self.stars = []  # 清空星星特效
         self.player_health = self.max_health
         self.completed_battles = set()
-        self.player_bullets.clear()
-        self.monster_bullets.clear()
+        self.clear_battle_bullets()
         self.battle_monster = None
+        self.player_shoot_cooldown = 0
+        self.show_coin_effect = False
+        self.coin_effect_timer = 0
+        self.bg1_x1, self.bg1_x2 = 0, 800
+        self.bg2_x1, self.bg2_x2 = 0, 800
+        self.bg3_x1, self.bg3_x2 = 0, 800
         self.state = "playing"
 
+        # 开始录像（物品效果以本局实际激活的为准）
+        if self.replay_dir:
+            items = [item_type for item_type, active in (("extra_life", self.extra_life_active),
+                                                         ("coin_double", self.coin_double_active),
+                                                         ("star_effect", self.star_effect_active)) if active]
+            self.input_recorder = ReplayRecorder(self.run_seed, self.selected_character, items)
+
         # 进入游戏状态
         self.state = "playing"
 
+    def seed_rngs(self, seed):
+        """用同一个种子重置所有子系统的随机数流（每个子系统得到不同的序列）"""
+        self.run_seed = seed
+        self.simulation_frame = 0
+        for name, rng in self.rngs.items():
+            rng.seed(f"{seed}:{name}")
+
+    def get_player(self, character_id):
+        """从角色池获取玩家对象，第一次使用时加载，之后只重置状态"""
+        player = self.player_pool.get(character_id)
+        if player:
+            player.reset(100, 250)
+            return player
+
+        ability = self.character_abilities[character_id]
+        player = Player(100, 250,
+                        can_double_jump=ability["can_double_jump"],
+                        player_id=character_id,
+                        image_folder=self.character_animation_folders[character_id],
+                        shoot_image_path="image/player_shoot.png",
+                        animation_name=self.character_animations.get(character_id))
+        self.player_pool[character_id] = player
+        return player
+
     def reset_game(self):
         """重置游戏"""
         if self.player:
@@ -293,8 +463,7 @@ class Game:
         self.score = 0
         self.current_game_coins = 0
         self.player_health = self.max_health
-        self.player_bullets.clear()
-        self.monster_bullets.clear()
+        self.clear_battle_bullets()
         self.battle_monster = None
         self.completed_battles = set()
         if self.player:
@@ -323,26 +492,66 @@ class Game:
             elif event.type == pygame.KEYDOWN:
                 self.handle_keydown(event)
 
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+                # 窗口被遮挡或还原后需要完整重绘
+                self.static_screen_key = None
+
         # 更新鼠标位置
         self.mouse_pos = pygame.mouse.get_pos()
 
+    def is_key_held(self, key):
+        """按键当前是否按住（无界面模式下由 held_keys 提供）"""
+        if self.headless:
+            return key in self.held_keys
+        return pygame.key.get_pressed()[key]
+
     def handle_keydown(self, event):
         """处理键盘按下事件"""
+        if event.key == pygame.K_F3:
+            self.profiler.toggle_overlay()
+            return
         if event.key == pygame.K_p and self.state in ("playing", "battle", "paused"):
             self.toggle_pause()
             return
         if self.state in ("playing", "battle"):
             self.handle_playing_keydown(event)
     def handle_playing_keydown(self, event):
-        """游戏中按键处理"""
+        """游戏中按键处理（按键在下一个逻辑帧开始时生效，见 read_frame_input）"""
         if event.key == pygame.K_SPACE:
-            if self.player:
-                self.player.jump()
+            self.pending_input |= INPUT_JUMP
         elif event.key == pygame.K_f:
+            self.pending_input |= INPUT_SHOOT
+
+    def read_frame_input(self):
+        """取出当前逻辑帧的输入位（按键事件 + 按住的射击键），录像时同时记录"""
+        bits = self.pending_input
+        self.pending_input = 0
+        if self.is_key_held(pygame.K_f):
+            bits |= INPUT_SHOOT_HELD
+        if self.input_recorder:
+            self.input_recorder.record(bits)
+        return bits
+
+    def apply_frame_input(self, bits):
+        """处理当前逻辑帧的按键事件（按住射击在 update_playing / update_battle 中处理）"""
+        if bits & INPUT_JUMP and self.player:
+            self.player.jump()
+        if bits & INPUT_SHOOT:
             self.attempt_player_shoot()
 
+    def finish_replay(self):
+        """结束并保存当前的录像"""
+        recorder, self.input_recorder = self.input_recorder, None
+        try:
+            recorder.finish(self.replay_dir, self.score, self.current_game_coins)
+        except Exception as e:
+            print(f"保存录像失败: {e}")
+
     def handle_mouse_click(self):
         """处理鼠标点击"""
+        if self.is_waiting_for_assets():
+            return
+
         if self.state == "title":
             self.handle_title_mouse_click()
         elif self.state == "load_save":
@@ -501,9 +710,7 @@ class Game:
             self.purchased_items.append(item.copy())
 
             # 更新存档中的金币数量
-            if self.save_system.current_save:
-                self.save_system.current_save["total_coins"] = self.coins
-                self.save_system.save_all_saves()
+            self.save_system.update_current_save(total_coins=self.coins)
 
             print(f"购买了 {item['name']}，花费 {item['price']} 金币")
 
@@ -535,6 +742,15 @@ class Game:
     # ==================== 游戏更新方法 ====================
     def update(self):
         """更新游戏状态"""
+        self.apply_loaded_assets()
+        if self.is_waiting_for_assets():
+            return
+
+        if self.state in ("playing", "battle"):
+            self.simulation_frame += 1
+            self.frame_input = self.read_frame_input()
+            self.apply_frame_input(self.frame_input)
+
         if self.state == "playing":
             self.update_playing()
         elif self.state == "battle":
@@ -546,6 +762,10 @@ class Game:
         elif self.state == "shop":
             self.update_shop()
 
+        # 一局结束时保存录像
+        if self.state == "game_over" and self.input_recorder:
+            self.finish_replay()
+
     def update_playing(self):
         """更新游戏进行状态"""
         # 获取背景滚动速度
@@ -555,31 +775,37 @@ class Game:
         if self.player_shoot_cooldown > 0:
             self.player_shoot_cooldown -= 1
 
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_f]:
+        if self.frame_input & INPUT_SHOOT_HELD:
             self.attempt_player_shoot()
 
+        profiler = self.profiler
+
         # 更新背景滚动
-        self.update_background()
+        with profiler.section("background"):
+            self.update_background()
 
         # 更新玩家
-        if self.player:
-            self.player.update()
+        with profiler.section("player"):
+            if self.player:
+                self.player.update()
 
         # 更新障碍物
-        self.obstacle_manager.update(scroll_speed, self.coin_manager)
+        with profiler.section("obstacles"):
+            self.obstacle_manager.update(scroll_speed, self.coin_manager)
 
         # 更新金币
-        self.coin_manager.update(scroll_speed)
+        with profiler.section("coins"):
+            self.coin_manager.update(scroll_speed)
 
         # 更新敌人和子弹
-        player_hit = self.enemy_manager.update(scroll_speed, self.player.rect if self.player else None)
+        with profiler.section("enemies"):
+            player_hit = self.enemy_manager.update(scroll_speed, self.player.hitbox if self.player else None)
 
         # 检测金币收集
         if self.player:
             # 计算金币倍数
             coin_multiplier = 2 if self.coin_double_active else 1
-            collected = self.coin_manager.check_collections(self.player.rect)
+            collected = self.coin_manager.check_collections(self.player.hitbox)
             if collected > 0:
                 # 应用金币翻倍效果
                 collected *= coin_multiplier
@@ -603,7 +829,7 @@ class Game:
 
         # 检测碰撞
         if self.player:
-            hits = self.obstacle_manager.check_collisions(self.player.rect)
+            hits = self.obstacle_manager.check_collisions(self.player.hitbox)
             if hits:
                 if self.extra_life_active and not self.extra_life_used:
                     self.extra_life_used = True
@@ -635,8 +861,7 @@ class Game:
         self.battle_monster = BattleMonster(600, ground_y,
                                             image=self.battle_assets.get("monster"),
                                             health=20)
-        self.player_bullets.clear()
-        self.monster_bullets.clear()
+        self.clear_battle_bullets()
         self.player_shoot_cooldown = 0
         self.current_battle_threshold = threshold
         if self.player:
@@ -650,8 +875,7 @@ class Game:
                 self.completed_battles.add(self.current_battle_threshold)
         self.state = "playing"
         self.battle_monster = None
-        self.player_bullets.clear()
-        self.monster_bullets.clear()
+        self.clear_battle_bullets()
         if self.player:
             self.player.set_force_shoot_pose(False)
 
@@ -665,8 +889,7 @@ class Game:
         if self.player_shoot_cooldown > 0:
             self.player_shoot_cooldown -= 1
 
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_f]:
+        if self.frame_input & INPUT_SHOOT_HELD:
             self.attempt_player_shoot()
 
         # 怪物攻击节奏
@@ -677,7 +900,8 @@ class Game:
                 self.battle_monster.reset_fire_cooldown(self.monster_fire_interval)
 
         # 更新子弹
-        self.update_bullets()
+        with self.profiler.section("bullets"):
+            self.update_bullets()
 
         # 检测玩家是否死亡
         if self.player_health <= 0:
@@ -693,7 +917,7 @@ class Game:
         """生成玩家子弹"""
         if not self.player:
             return
-        bullet = BattleBullet(
+        bullet = self.battle_bullet_pool.acquire(
             self.player.rect.right,
             self.player.rect.centery - 5,
             speed=12,
@@ -707,7 +931,7 @@ class Game:
         """生成怪物子弹"""
         if not self.battle_monster:
             return
-        bullet = BattleBullet(
+        bullet = self.battle_bullet_pool.acquire(
             self.battle_monster.rect.left - 20,
             self.battle_monster.rect.centery - 5,
             speed=8,
@@ -735,18 +959,31 @@ class Game:
         """更新战斗子弹并处理碰撞"""
         for bullet in self.player_bullets:
             bullet.update()
-            if self.battle_monster and bullet.active and bullet.rect.colliderect(self.battle_monster.rect):
-                self.battle_monster.take_hit(bullet.damage)
-                bullet.active = False
-
         for bullet in self.monster_bullets:
             bullet.update()
-            if self.player and bullet.active and bullet.rect.colliderect(self.player.rect):
-                bullet.active = False
-                self.apply_damage(1)
 
-        self.player_bullets = [b for b in self.player_bullets if b.active]
-        self.monster_bullets = [b for b in self.monster_bullets if b.active]
+        # 只检测怪物和玩家附近的子弹
+        world = self.collision_world
+        world.update("battle_player_bullets", "battle_monster_bullets")
+        if self.battle_monster:
+            for bullet in world.query("battle_player_bullets", self.battle_monster.rect):
+                if bullet.active:
+                    self.battle_monster.take_hit(bullet.damage)
+                    bullet.active = False
+
+        if self.player:
+            for bullet in world.query("battle_monster_bullets", self.player.hitbox):
+                if bullet.active:
+                    bullet.active = False
+                    self.apply_damage(1)
+
+        self.battle_bullet_pool.release_dead(self.player_bullets)
+        self.battle_bullet_pool.release_dead(self.monster_bullets)
+
+    def clear_battle_bullets(self):
+        """清除所有战斗子弹（放回对象池）"""
+        self.battle_bullet_pool.release_all(self.player_bullets)
+        self.battle_bullet_pool.release_all(self.monster_bullets)
 
     def apply_damage(self, amount):
         """统一的扣血逻辑"""
@@ -801,16 +1038,21 @@ class Game:
         if self.bg3_x2 <= -800:
             self.bg3_x2 = 800
 
+    def get_background_offsets(self):
+        """三层背景长条中当前可见区域的起点（两张背景首尾相接，按800取模即可）"""
+        return [(-self.bg1_x1) % 800, (-self.bg2_x1) % 800, (-self.bg3_x1) % 800]
+
     def update_star_effect(self):
         """更新星星特效"""
-        # 每隔一定时间生成新的星星
-        if pygame.time.get_ticks() % 5 == 0:
+        # 每隔5个逻辑帧生成新的星星
+        if self.simulation_frame % 5 == 0:
+            rng = self.rngs["star"]
             # 在玩家身后生成星星
             star_x = self.player.rect.x - 20
-            star_y = self.player.rect.y + random.randint(-10, 40)
-            star_size = random.randint(3, 8)
-            star_speed = random.uniform(1.0, 3.0)
-            star_color = random.choice([
+            star_y = self.player.rect.y + rng.randint(-10, 40)
+            star_size = rng.randint(3, 8)
+            star_speed = rng.uniform(1.0, 3.0)
+            star_color = rng.choice([
                 (255, 255, 0),  # 黄色
                 (255, 200, 0),  # 橙色
                 (255, 255, 200),  # 淡黄色
@@ -838,16 +1080,15 @@ class Game:
     # ==================== 绘制方法 ====================
     def draw(self):
         """绘制游戏画面"""
-        if self.state == "title":
-            self.draw_title_screen()
-        elif self.state == "load_save":
-            self.draw_load_save_screen()
-        elif self.state == "saves_list":
-            self.draw_saves_list_screen()
-        elif self.state == "menu":
-            self.draw_menu_screen()
-        elif self.state == "shop":
-            self.draw_shop_screen()
+        if self.state in self.STATIC_STATES and not self.is_waiting_for_assets():
+            self.draw_static_screen()
+            return
+
+        self.screen_idle = False
+        self.static_screen_key = None
+
+        if self.is_waiting_for_assets():
+            self.draw_loading_screen()
         elif self.state == "playing":
             self.draw_game_screen()
         elif self.state == "battle":
@@ -857,18 +1098,132 @@ class Game:
         elif self.state == "game_over":
             self.draw_game_over_screen()
 
+        # 帧耗时浮层
+        self.profiler.draw_overlay(self.screen, self.profiler_font, (560, 460))
 
         # 更新显示
         pygame.display.flip()
 
+    def draw_static_screen(self):
+        """绘制静态菜单界面（脏矩形模式）
+
+        界面内容没有变化时不绘制也不刷新显示；只有悬停的控件变化时，
+        只在新旧控件区域内重绘，并用 display.update 只刷新这些区域。
+        """
+        regions = self.get_hover_regions()
+        hovered = None
+        for i, region in enumerate(regions):
+            if region.collidepoint(self.mouse_pos):
+                hovered = i
+                break
+
+        screen_key = self.get_static_screen_key()
+        if screen_key == self.static_screen_key and hovered == self.static_hover_index:
+            self.screen_idle = True
+            return
+
+        full_redraw = screen_key != self.static_screen_key
+        dirty_rects = []
+        if not full_redraw:
+            for index in (self.static_hover_index, hovered):
+                if index is not None:
+                    dirty_rects.append(regions[index].inflate(4, 4))
+            if self.state == "shop":
+                # 商店的物品描述随悬停物品变化
+                dirty_rects.append(pygame.Rect(100, 420, 600, 80))
+
+        self.static_screen_key = screen_key
+        self.static_hover_index = hovered
+        self.screen_idle = False
+
+        painters = {
+            "title": self.draw_title_screen,
+            "load_save": self.draw_load_save_screen,
+            "saves_list": self.draw_saves_list_screen,
+            "menu": self.draw_menu_screen,
+            "shop": self.draw_shop_screen,
+        }
+
+        if full_redraw:
+            painters[self.state]()
+            pygame.display.flip()
+        else:
+            # 只在变化的区域内重绘，区域外的绘制会被裁剪掉
+            self.screen.set_clip(dirty_rects[0].unionall(dirty_rects[1:]))
+            painters[self.state]()
+            self.screen.set_clip(None)
+            pygame.display.update(dirty_rects)
+
+    def get_static_screen_key(self):
+        """静态界面的内容标识，标识变化时需要完整重绘"""
+        current_save = self.save_system.current_save
+        return (
+            self.state,
+            len(self.save_system.get_all_saves()),
+            current_save["player_name"] if current_save else None,
+            self.save_list_offset,
+            self.delete_confirm,
+            self.coins,
+            tuple(item["type"] for item in self.purchased_items),
+            int(self.asset_loader.progress * 100),
+        )
+
+    def get_hover_regions(self):
+        """当前静态界面中会响应悬停的控件区域（与各绘制方法保持一致）"""
+        back_rect = pygame.Rect(650, 500, 100, 50)
+        if self.state == "title":
+            return [pygame.Rect(300, y_pos, 200, 60) for y_pos in (250, 330, 410, 490)]
+        elif self.state == "load_save":
+            visible = self.save_system.get_all_saves()[self.save_list_offset:self.save_list_offset + 5]
+            return [pygame.Rect(150, 150 + i * 80, 500, 70) for i in range(len(visible))] + [back_rect]
+        elif self.state == "saves_list":
+            if self.delete_confirm:
+                return [pygame.Rect(300, 350, 100, 50), pygame.Rect(450, 350, 100, 50)]
+            rows = min(len(self.save_system.get_all_saves()), 8)
+            return [pygame.Rect(650, 220 + i * 40, 80, 30) for i in range(rows)] + [back_rect]
+        elif self.state == "menu":
+            return [pygame.Rect(250, 250, 100, 150), pygame.Rect(450, 250, 100, 150),
+                    pygame.Rect(300, 450, 200, 60)]
+        elif self.state == "shop":
+            item_width = 150
+            item_spacing = 50
+            x_start = (800 - (3 * item_width + 2 * item_spacing)) // 2
+            items = [pygame.Rect(x_start + i * (item_width + item_spacing), 200, item_width, 200)
+                     for i in range(len(self.shop_items))]
+            return items + [pygame.Rect(50, 500, 150, 60), pygame.Rect(800 - 50 - 150, 500, 150, 60)]
+        return []
+
     # ==================== 各个界面的绘制方法 ====================
+    def draw_loading_screen(self):
+        """绘制资源加载画面"""
+        self.screen.blit(self.menu_background, (0, 0))
+
+        loading_text = render_text(self.font, "加载中...", True, (255, 255, 255))
+        self.screen.blit(loading_text, (400 - loading_text.get_width() // 2, 240))
+
+        self.draw_loading_progress(320)
+
+    def draw_loading_progress(self, y_pos):
+        """绘制资源加载进度条"""
+        progress = self.asset_loader.progress
+        bar_rect = pygame.Rect(250, y_pos, 300, 16)
+        pygame.draw.rect(self.screen, (60, 60, 60), bar_rect, border_radius=5)
+        pygame.draw.rect(self.screen, (100, 200, 100),
+                         (bar_rect.x, bar_rect.y, bar_rect.width * progress, bar_rect.height), border_radius=5)
+        pygame.draw.rect(self.screen, (255, 255, 255), bar_rect, 2, border_radius=5)
+
+        task = self.asset_loader.current_task
+        status = f"{task} {int(progress * 100)}%" if task else f"{int(progress * 100)}%"
+        status_text = render_text(self.small_font, status, True, (200, 200, 200))
+        self.screen.blit(status_text, (400 - status_text.get_width() // 2, y_pos + 22))
+
     def draw_title_screen(self):
         """绘制标题屏幕"""
         # 绘制背景
         self.screen.blit(self.menu_background, (0, 0))
 
         # 绘制标题
-        title_text = self.font.render("跑酷游戏", True, (255, 255, 255))
+        title_text = render_text(self.font, "跑酷游戏", True, (255, 255, 255))
         title_rect = title_text.get_rect(center=(400, 120))
         self.screen.blit(title_text, title_rect)
 
@@ -876,11 +1231,11 @@ class Game:
         if self.save_system.current_save:
             save_info = self.save_system.get_current_save_info()
             if save_info:
-                current_save_text = self.medium_font.render(f"当前存档: {save_info['player_name']}", True,
+                current_save_text = render_text(self.medium_font, f"当前存档: {save_info['player_name']}", True,
                                                             (100, 255, 100))
                 self.screen.blit(current_save_text, (400 - current_save_text.get_width() // 2, 180))
 
-                score_text = self.small_font.render(
+                score_text = render_text(self.small_font,
                     f"最高分: {save_info['high_score']} | 总金币: {save_info['total_coins']}", True, (200, 200, 255))
                 self.screen.blit(score_text, (400 - score_text.get_width() // 2, 220))
 
@@ -900,7 +1255,7 @@ class Game:
             pygame.draw.rect(self.screen, button_color, button_rect, border_radius=10)
             pygame.draw.rect(self.screen, (255, 255, 255), button_rect, 3, border_radius=10)
 
-            button_text = self.medium_font.render(text, True, (255, 255, 255))
+            button_text = render_text(self.medium_font, text, True, (255, 255, 255))
             self.screen.blit(button_text,
                              (400 - button_text.get_width() // 2, y_pos + 30 - button_text.get_height() // 2))
 
@@ -910,16 +1265,20 @@ class Game:
         ]
 
         for i, text in enumerate(controls):
-            control_text = self.small_font.render(text, True, (200, 200, 200))
+            control_text = render_text(self.small_font, text, True, (200, 200, 200))
             self.screen.blit(control_text, (400 - control_text.get_width() // 2, 530 + i * 25))
 
+        # 后台资源还在加载时，在顶部显示进度
+        if self.asset_loader.progress < 1.0:
+            self.draw_loading_progress(20)
+
     def draw_load_save_screen(self):
         """绘制加载存档屏幕"""
         # 绘制背景
         self.screen.blit(self.menu_background, (0, 0))
 
         # 绘制标题
-        title_text = self.font.render("加载存档", True, (255, 255, 200))
+        title_text = render_text(self.font, "加载存档", True, (255, 255, 200))
         title_rect = title_text.get_rect(center=(400, 100))
         self.screen.blit(title_text, title_rect)
 
@@ -928,11 +1287,11 @@ class Game:
 
         if not all_saves:
             # 没有存档时显示提示
-            no_saves_text = self.medium_font.render("暂无存档，请先创建存档", True, (255, 100, 100))
+            no_saves_text = render_text(self.medium_font, "暂无存档，请先创建存档", True, (255, 100, 100))
             self.screen.blit(no_saves_text, (400 - no_saves_text.get_width() // 2, 300))
         else:
             # 显示存档列表
-            list_title = self.medium_font.render("选择存档:", True, (255, 255, 255))
+            list_title = render_text(self.medium_font, "选择存档:", True, (255, 255, 255))
             self.screen.blit(list_title, (150, 120))
 
             y_start = 150
@@ -945,10 +1304,10 @@ class Game:
                 pygame.draw.rect(self.screen, (255, 255, 255), save_rect, 3, border_radius=10)
 
                 # 存档信息
-                name_text = self.medium_font.render(f"{save['player_name']}", True, (255, 255, 255))
+                name_text = render_text(self.medium_font, f"{save['player_name']}", True, (255, 255, 255))
                 self.screen.blit(name_text, (170, y_start + i * 80 + 15))
 
-                info_text = self.small_font.render(
+                info_text = render_text(self.small_font,
                     f"最高分: {save['high_score']} | 金币: {save['total_coins']} | 游戏次数: {save['games_played']}",
                     True, (200, 255, 200)
                 )
@@ -961,25 +1320,20 @@ class Game:
         pygame.draw.rect(self.screen, back_color, back_rect, border_radius=10)
         pygame.draw.rect(self.screen, (255, 255, 255), back_rect, 3, border_radius=10)
 
-        back_text = self.small_font.render("返回", True, (255, 255, 255))
+        back_text = render_text(self.small_font, "返回", True, (255, 255, 255))
         self.screen.blit(back_text, (700 - back_text.get_width() // 2, 525 - back_text.get_height() // 2))
 
         # 绘制操作说明
-        instruction_text = self.small_font.render("点击存档加载，使用鼠标操作", True, (200, 200, 200))
+        instruction_text = render_text(self.small_font, "点击存档加载，使用鼠标操作", True, (200, 200, 200))
         self.screen.blit(instruction_text, (400 - instruction_text.get_width() // 2, 560))
 
     def draw_saves_list_screen(self):
         """绘制存档列表屏幕"""
-        # 如果有确认删除的存档，绘制确认界面
-        if self.delete_confirm:
-            self.draw_delete_confirmation()
-            return
-
         # 绘制背景
         self.screen.blit(self.menu_background, (0, 0))
 
         # 绘制标题
-        title_text = self.font.render("存档管理", True, (255, 255, 200))
+        title_text = render_text(self.font, "存档管理", True, (255, 255, 200))
         title_rect = title_text.get_rect(center=(400, 80))
         self.screen.blit(title_text, title_rect)
 
@@ -987,12 +1341,12 @@ class Game:
         all_saves = self.save_system.get_all_saves()
 
         # 显示存档总数
-        total_text = self.medium_font.render(f"总存档数: {len(all_saves)}", True, (255, 255, 255))
+        total_text = render_text(self.medium_font, f"总存档数: {len(all_saves)}", True, (255, 255, 255))
         self.screen.blit(total_text, (400 - total_text.get_width() // 2, 130))
 
         # 显示当前存档
         if self.save_system.current_save:
-            current_text = self.medium_font.render(f"当前存档: {self.save_system.current_save['player_name']}", True,
+            current_text = render_text(self.medium_font, f"当前存档: {self.save_system.current_save['player_name']}", True,
                                                    (100, 255, 100))
             self.screen.blit(current_text, (400 - current_text.get_width() // 2, 170))
 
@@ -1006,7 +1360,7 @@ class Game:
             save_info = f"{i + 1}. {save['player_name']} - 最高分: {save['high_score']} - 金币: {save['total_coins']}"
             if len(save_info) > 60:
                 save_info = save_info[:57] + "..."
-            save_text = self.small_font.render(save_info, True, (220, 220, 220))
+            save_text = render_text(self.small_font, save_info, True, (220, 220, 220))
             self.screen.blit(save_text, (100, y_pos))
 
             # 绘制删除按钮
@@ -1026,14 +1380,14 @@ class Game:
             pygame.draw.rect(self.screen, delete_color, delete_rect, border_radius=5)
             pygame.draw.rect(self.screen, (255, 255, 255), delete_rect, 2, border_radius=5)
 
-            delete_text = pygame.font.Font('image/STKAITI.TTF', 20).render("删除", True, delete_text_color)
+            delete_text = render_text(get_font(20), "删除", True, delete_text_color)
             delete_text_rect = delete_text.get_rect(center=delete_rect.center)
             self.screen.blit(delete_text, delete_text_rect)
 
             y_pos += 40  # 减少行间距
 
         # 绘制说明文字
-        instruction_text = self.small_font.render("点击删除按钮删除存档（当前存档不能删除）", True, (255, 200, 100))
+        instruction_text = render_text(self.small_font, "点击删除按钮删除存档（当前存档不能删除）", True, (255, 200, 100))
         self.screen.blit(instruction_text, (400 - instruction_text.get_width() // 2, 520))
 
         # 绘制返回按钮 - 与事件检测位置保持一致 (650, 500, 100, 50)
@@ -1043,10 +1397,14 @@ class Game:
         pygame.draw.rect(self.screen, back_color, back_rect, border_radius=10)
         pygame.draw.rect(self.screen, (255, 255, 255), back_rect, 3, border_radius=10)
 
-        back_text = self.small_font.render("返回", True, (255, 255, 255))
+        back_text = render_text(self.small_font, "返回", True, (255, 255, 255))
         back_text_rect = back_text.get_rect(center=back_rect.center)
         self.screen.blit(back_text, back_text_rect)
 
+        # 如果有确认删除的存档，在列表上方绘制确认界面
+        if self.delete_confirm:
+            self.draw_delete_confirmation()
+
     def draw_delete_confirmation(self):
         """绘制删除确认界面"""
         # 半透明背景
@@ -1060,10 +1418,10 @@ class Game:
         pygame.draw.rect(self.screen, (255, 255, 255), confirm_rect, 3, border_radius=10)
 
         # 确认文字
-        confirm_text = self.medium_font.render(f"确认删除存档: {self.delete_confirm}?", True, (255, 100, 100))
+        confirm_text = render_text(self.medium_font, f"确认删除存档: {self.delete_confirm}?", True, (255, 100, 100))
         self.screen.blit(confirm_text, (400 - confirm_text.get_width() // 2, 250))
 
-        warning_text = self.small_font.render("此操作不可恢复！", True, (255, 200, 100))
+        warning_text = render_text(self.small_font, "此操作不可恢复！", True, (255, 200, 100))
         self.screen.blit(warning_text, (400 - warning_text.get_width() // 2, 290))
 
         # 确认按钮
@@ -1072,7 +1430,7 @@ class Game:
         confirm_color = (200, 50, 50) if confirm_hovered else (170, 30, 30)
         pygame.draw.rect(self.screen, confirm_color, confirm_btn, border_radius=5)
         pygame.draw.rect(self.screen, (255, 255, 255), confirm_btn, 2, border_radius=5)
-        confirm_text = self.small_font.render("确认", True, (255, 255, 255))
+        confirm_text = render_text(self.small_font, "确认", True, (255, 255, 255))
         self.screen.blit(confirm_text, (350 - confirm_text.get_width() // 2, 375 - confirm_text.get_height() // 2))
 
         # 取消按钮
@@ -1081,7 +1439,7 @@ class Game:
         cancel_color = (100, 100, 200) if cancel_hovered else (70, 70, 170)
         pygame.draw.rect(self.screen, cancel_color, cancel_btn, border_radius=5)
         pygame.draw.rect(self.screen, (255, 255, 255), cancel_btn, 2, border_radius=5)
-        cancel_text = self.small_font.render("取消", True, (255, 255, 255))
+        cancel_text = render_text(self.small_font, "取消", True, (255, 255, 255))
         self.screen.blit(cancel_text, (500 - cancel_text.get_width() // 2, 375 - cancel_text.get_height() // 2))
 
     def draw_menu_screen(self):
@@ -1090,7 +1448,7 @@ class Game:
         self.screen.blit(self.menu_background, (0, 0))
 
         # 绘制标题
-        title_text = self.font.render("选择你的角色", True, (255, 255, 200))
+        title_text = render_text(self.font, "选择你的角色", True, (255, 255, 200))
         title_rect = title_text.get_rect(center=(400, 150))
         self.screen.blit(title_text, title_rect)
 
@@ -1098,10 +1456,10 @@ class Game:
         if self.save_system.current_save:
             save_info = self.save_system.get_current_save_info()
             if save_info:
-                player_text = self.medium_font.render(f"玩家: {save_info['player_name']}", True, (100, 255, 100))
+                player_text = render_text(self.medium_font, f"玩家: {save_info['player_name']}", True, (100, 255, 100))
                 self.screen.blit(player_text, (400 - player_text.get_width() // 2, 170))
 
-                stats_text = self.small_font.render(
+                stats_text = render_text(self.small_font,
                     f"最高分: {save_info['high_score']} | 总金币: {save_info['total_coins']}", True, (200, 200, 255))
                 self.screen.blit(stats_text, (400 - stats_text.get_width() // 2, 210))
 
@@ -1113,17 +1471,14 @@ class Game:
         pygame.draw.rect(self.screen, (255, 255, 255), char1_rect, 3, border_radius=10)
 
         # 绘制角色1图片
-        try:
-            img = pygame.image.load('image/nick.png').convert_alpha()
-            img = pygame.transform.scale(img, (80, 80))
+        img = assets.load('image/nick.png', (80, 80))
+        if img:
             self.screen.blit(img, (260, 260))
-        except:
-            pass
 
         # 绘制角色1描述
-        char1_text = self.small_font.render("尼克", True, (255, 255, 255))
+        char1_text = render_text(self.small_font, "尼克", True, (255, 255, 255))
         self.screen.blit(char1_text, (300 - char1_text.get_width() // 2, 350))
-        ability_text = self.small_font.render("单段跳", True, (200, 200, 255))
+        ability_text = render_text(self.small_font, "单段跳", True, (200, 200, 255))
         self.screen.blit(ability_text, (300 - ability_text.get_width() // 2, 375))
 
         # 绘制角色2选择框
@@ -1134,17 +1489,14 @@ class Game:
         pygame.draw.rect(self.screen, (255, 255, 255), char2_rect, 3, border_radius=10)
 
         # 绘制角色2图片
-        try:
-            img = pygame.image.load('image/judy.png').convert_alpha()
-            img = pygame.transform.scale(img, (80, 80))
+        img = assets.load('image/judy.png', (80, 80))
+        if img:
             self.screen.blit(img, (460, 260))
-        except:
-            pass
 
         # 绘制角色2描述
-        char2_text = self.small_font.render("朱迪", True, (255, 255, 255))
+        char2_text = render_text(self.small_font, "朱迪", True, (255, 255, 255))
         self.screen.blit(char2_text, (500 - char2_text.get_width() // 2, 350))
-        ability_text = self.small_font.render("二段跳", True, (200, 200, 255))
+        ability_text = render_text(self.small_font, "二段跳", True, (200, 200, 255))
         self.screen.blit(ability_text, (500 - ability_text.get_width() // 2, 375))
 
         # 绘制退出按钮
@@ -1154,7 +1506,7 @@ class Game:
         pygame.draw.rect(self.screen, quit_color, quit_rect, border_radius=10)
         pygame.draw.rect(self.screen, (255, 255, 255), quit_rect, 3, border_radius=10)
 
-        quit_text = self.medium_font.render("返回主页", True, (255, 255, 255))
+        quit_text = render_text(self.medium_font, "返回主页", True, (255, 255, 255))
         self.screen.blit(quit_text, (400 - quit_text.get_width() // 2, 480 - quit_text.get_height() // 2))
 
         # 绘制操作说明
@@ -1165,7 +1517,7 @@ class Game:
         ]
 
         for i, text in enumerate(controls):
-            control_text = self.small_font.render(text, True, (200, 200, 200))
+            control_text = render_text(self.small_font, text, True, (200, 200, 200))
             self.screen.blit(control_text, (400 - control_text.get_width() // 2, 530 + i * 25))
 
         # 重置金币效果
@@ -1177,7 +1529,7 @@ class Game:
         self.screen.blit(self.shop_background, (0, 0))
 
         # 显示当前金币
-        coins_text = self.medium_font.render(f"当前金币: {self.coins}", True, (255, 255, 100))
+        coins_text = render_text(self.medium_font, f"当前金币: {self.coins}", True, (255, 255, 100))
         self.screen.blit(coins_text, (400 - coins_text.get_width() // 2, 130))
 
         # 绘制物品 - 居中排列
@@ -1225,17 +1577,17 @@ class Game:
                 self.screen.blit(img, img_rect)
 
             # 绘制物品名称
-            name_text = self.small_font.render(item["name"], True, (255, 255, 255))
+            name_text = render_text(self.small_font, item["name"], True, (255, 255, 255))
             self.screen.blit(name_text, (x_pos + item_width // 2 - name_text.get_width() // 2, y_pos + 110))
 
             # 绘制价格
             price_color = (255, 255, 100) if can_purchase else (150, 150, 150)
-            price_text = self.small_font.render(f"价格: {item['price']}金币", True, price_color)
+            price_text = render_text(self.small_font, f"价格: {item['price']}金币", True, price_color)
             self.screen.blit(price_text, (x_pos + item_width // 2 - price_text.get_width() // 2, y_pos + 140))
 
             # 如果已购买，显示"已购买"
             if purchased:
-                purchased_text = self.small_font.render("已购买", True, (100, 255, 100))
+                purchased_text = render_text(self.small_font, "已购买", True, (100, 255, 100))
                 self.screen.blit(purchased_text,
                                  (x_pos + item_width // 2 - purchased_text.get_width() // 2, y_pos + 165))
 
@@ -1256,7 +1608,7 @@ class Game:
             desc_lines = hovered_item["description"].split("，")
             for j, line in enumerate(desc_lines):
                 if j < 2:  # 限制显示行数
-                    desc_text = self.small_font.render(line, True, (255, 255, 200))
+                    desc_text = render_text(self.small_font, line, True, (255, 255, 200))
                     self.screen.blit(desc_text, (desc_rect.x + 20, desc_rect.y + 10 + j * 25))
 
         # 绘制按钮区域
@@ -1272,7 +1624,7 @@ class Game:
         pygame.draw.rect(self.screen, back_color, back_rect, border_radius=10)
         pygame.draw.rect(self.screen, (255, 255, 255), back_rect, 3, border_radius=10)
 
-        back_text = self.medium_font.render("返回", True, (255, 255, 255))
+        back_text = render_text(self.medium_font, "返回", True, (255, 255, 255))
         back_text_rect = back_text.get_rect(center=back_rect.center)
         self.screen.blit(back_text, back_text_rect)
 
@@ -1284,35 +1636,35 @@ class Game:
         pygame.draw.rect(self.screen, start_color, start_rect, border_radius=10)
         pygame.draw.rect(self.screen, (255, 255, 255), start_rect, 3, border_radius=10)
 
-        start_text = self.medium_font.render("开始游戏", True, (255, 255, 255))
+        start_text = render_text(self.medium_font, "开始游戏", True, (255, 255, 255))
         start_text_rect = start_text.get_rect(center=start_rect.center)
         self.screen.blit(start_text, start_text_rect)
 
 
     def draw_game_screen(self):
         """绘制游戏画面"""
-        # 先清屏，避免角色跳跃时的拖影
-        self.screen.fill((0, 0, 0))
-        # 绘制背景␊
-        self.screen.blit(self.bg_layers['bg1'], (self.bg1_x1, 0))
-        self.screen.blit(self.bg_layers['bg1'], (self.bg1_x2, 0))
-        self.screen.blit(self.bg_layers['bg2'], (self.bg2_x1, 0))
-        self.screen.blit(self.bg_layers['bg2'], (self.bg2_x2, 0))
-        self.screen.blit(self.bg_layers['bg3'], (self.bg3_x1, 0))
-        self.screen.blit(self.bg_layers['bg3'], (self.bg3_x2, 0))
+        profiler = self.profiler
+
+        # 绘制背景（最远层不透明时直接覆盖整个屏幕，不需要先清屏）
+        with profiler.section("draw_background"):
+            self.background.draw(self.screen, self.get_background_offsets())
 
         # 绘制障碍物
-        self.obstacle_manager.draw(self.screen)
+        with profiler.section("draw_obstacles"):
+            self.obstacle_manager.draw(self.screen)
 
         # 绘制金币
-        self.coin_manager.draw(self.screen)
+        with profiler.section("draw_coins"):
+            self.coin_manager.draw(self.screen)
 
         # 绘制敌人和战斗效果
-        self.enemy_manager.draw(self.screen)
+        with profiler.section("draw_enemies"):
+            self.enemy_manager.draw(self.screen)
 
         # 绘制玩家
-        if self.player:
-            self.player.draw(self.screen)
+        with profiler.section("draw_player"):
+            if self.player:
+                self.player.draw(self.screen)
         # 绘制星星特效
         if self.star_effect_active:
             self.draw_star_effect()
@@ -1322,18 +1674,13 @@ class Game:
             self.draw_coin_effect()
 
         # 绘制UI信息
-        self.draw_ui()
+        with profiler.section("draw_ui"):
+            self.draw_ui()
 
     def draw_battle_screen(self):
         """绘制战斗界面"""
-        self.screen.fill((0, 0, 0))
-        # 背景保持静止
-        self.screen.blit(self.bg_layers['bg1'], (self.bg1_x1, 0))
-        self.screen.blit(self.bg_layers['bg1'], (self.bg1_x2, 0))
-        self.screen.blit(self.bg_layers['bg2'], (self.bg2_x1, 0))
-        self.screen.blit(self.bg_layers['bg2'], (self.bg2_x2, 0))
-        self.screen.blit(self.bg_layers['bg3'], (self.bg3_x1, 0))
-        self.screen.blit(self.bg_layers['bg3'], (self.bg3_x2, 0))
+        # 背景保持静止，使用合成好的缓存
+        self.background.draw_static(self.screen, self.get_background_offsets())
 
         # 绘制玩家
         if self.player:
@@ -1348,7 +1695,7 @@ class Game:
             bullet.draw(self.screen)
 
         # 提示文本
-        battle_text = self.medium_font.render("打怪模式：击败怪物继续跑酷", True, (255, 255, 0))
+        battle_text = render_text(self.medium_font, "打怪模式：击败怪物继续跑酷", True, (255, 255, 0))
         self.screen.blit(battle_text, (400 - battle_text.get_width() // 2, 40))
 
         # 绘制UI信息
@@ -1373,16 +1720,16 @@ class Game:
             high_score = self.save_system.current_save["high_score"]
 
         # 游戏结束文字
-        game_over_text = self.font.render("游戏结束!", True, (255, 50, 50))
-        score_text = self.font.render(f"最终分数: {int(self.score)}", True, (255, 255, 255))
-        high_score_text = self.font.render(f"最高分: {high_score}", True, (255, 255, 100))
+        game_over_text = render_text(self.font, "游戏结束!", True, (255, 50, 50))
+        score_text = render_text(self.font, f"最终分数: {int(self.score)}", True, (255, 255, 255))
+        high_score_text = render_text(self.font, f"最高分: {high_score}", True, (255, 255, 100))
 
         # 计算最终金币
         final_coins = self.current_game_coins
 
-        coins_text = self.font.render(f"本局金币: {final_coins}", True, (255, 255, 100))
-        restart_text = self.medium_font.render(f"自动返回菜单: {int(time_left)}秒", True, (100, 255, 100))
-        click_text = self.small_font.render("点击任意处返回主页面", True, (200, 200, 200))
+        coins_text = render_text(self.font, f"本局金币: {final_coins}", True, (255, 255, 100))
+        restart_text = render_text(self.medium_font, f"自动返回菜单: {int(time_left)}秒", True, (100, 255, 100))
+        click_text = render_text(self.small_font, "点击任意处返回主页面", True, (200, 200, 200))
 
         # 居中显示
         self.screen.blit(game_over_text, (400 - game_over_text.get_width() // 2, 180))
@@ -1403,8 +1750,8 @@ class Game:
         overlay.fill((0, 0, 0, 160))
         self.screen.blit(overlay, (0, 0))
 
-        pause_text = self.font.render("已暂停", True, (255, 255, 255))
-        hint_text = self.small_font.render("按 P 继续游戏", True, (200, 200, 200))
+        pause_text = render_text(self.font, "已暂停", True, (255, 255, 255))
+        hint_text = render_text(self.small_font, "按 P 继续游戏", True, (200, 200, 200))
         self.screen.blit(pause_text, (400 - pause_text.get_width() // 2, 240))
         self.screen.blit(hint_text, (400 - hint_text.get_width() // 2, 320))
 
@@ -1423,8 +1770,7 @@ class Game:
     def draw_coin_effect(self):
         """绘制金币收集效果"""
         # 创建效果文本
-        effect_font = pygame.font.Font('image/STKAITI.TTF', 32)
-        effect_text = effect_font.render(self.coin_effect_text, True, (255, 255, 100))
+        effect_text = render_text(get_font(32), self.coin_effect_text, True, (255, 255, 100))
 
         # 添加透明度效果
         alpha = min(255, self.coin_effect_timer * 8)
@@ -1453,14 +1799,14 @@ class Game:
             return
 
         # 绘制分数
-        score_text = self.medium_font.render(f"分数: {int(self.score)}", True, (0, 0, 0))
+        score_text = render_text(self.medium_font, f"分数: {int(self.score)}", True, (0, 0, 0))
         self.screen.blit(score_text, (20, 10))
 
         # 绘制最高分
         high_score = 0
         if self.save_system.current_save:
             high_score = self.save_system.current_save["high_score"]
-        high_score_text = self.medium_font.render(f"最高分: {high_score}", True, (0, 0, 0))
+        high_score_text = render_text(self.medium_font, f"最高分: {high_score}", True, (0, 0, 0))
         self.screen.blit(high_score_text, (20, 50))
 
         # 绘制生命值
@@ -1469,12 +1815,12 @@ class Game:
         pygame.draw.rect(self.screen, (180, 50, 50), health_bar_bg, border_radius=5)
         pygame.draw.rect(self.screen, (50, 200, 50),
                          (10, 90, 200 * health_ratio, 20), border_radius=5)
-        health_text = self.small_font.render(f"生命: {self.player_health}/{self.max_health}", True, (0, 0, 0))
+        health_text = render_text(self.small_font, f"生命: {self.player_health}/{self.max_health}", True, (0, 0, 0))
         self.screen.blit(health_text, (15, 115))
 
 
         # 绘制本局金币
-        coins_text = self.ui_font.render(f"金币: {self.current_game_coins}", True, (255, 255, 100))
+        coins_text = render_text(self.ui_font, f"金币: {self.current_game_coins}", True, (255, 255, 100))
         coins_rect = coins_text.get_rect(topright=(780, 20))
         self.screen.blit(coins_text, coins_rect)
 
@@ -1500,13 +1846,13 @@ class Game:
 
         # 如果没有效果，显示提示
         if not effects:
-            no_effects_text = self.small_font.render("无激活效果", True, (150, 150, 150))
+            no_effects_text = render_text(self.small_font, "无激活效果", True, (150, 150, 150))
             self.screen.blit(no_effects_text, (10, effects_y))
         else:
             # 绘制所有效果
             for i, (text, color) in enumerate(effects):
                 # 绘制效果文本
-                effect_text = self.small_font.render(text, True, color)
+                effect_text = render_text(self.small_font, text, True, color)
                 self.screen.blit(effect_text, (10, effects_y + i * 28))
 
 
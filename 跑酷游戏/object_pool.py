@@ -0,0 +1,100 @@
+# object_pool.py
+"""实体对象池。
+
+子弹、金币、障碍物的生成和消失非常频繁。对象池把消失的实体放回空闲列表，
+生成新实体时取出一个空闲对象重新初始化（reset），游戏运行稳定后不再创建新的实体对象。
+
+移除实体时原地整理列表并保持原来的顺序：列表顺序决定了生成间距的判断（列表最后一个）
+和子弹命中的先后，不能用交换删除打乱。实体基本都是从屏幕左边（列表前面）离开的，
+所以先整段删除前面已经消失的实体，只有中间有实体消失时才逐个整理。
+"""
+
+
+class ObjectPool:
+    """通用对象池。对象需要提供 reset(...) 方法，参数与构造函数相同。"""
+
+    def __init__(self, factory, alive=None):
+        self.factory = factory  # 空闲列表为空时创建新对象的函数
+        self.alive = alive or (lambda entity: entity.is_active)  # 判断对象是否仍然有效
+        self.free = []
+
+        # 统计信息
+        self.created = 0
+        self.reused = 0
+
+    def prefill(self, count, *args, **kwargs):
+        """预先创建 count 个对象放入空闲列表"""
+        for _ in range(count):
+            self.release(self.factory(*args, **kwargs))
+        self.created += count
+
+    def acquire(self, *args, **kwargs):
+        """取出一个对象并用给定参数初始化"""
+        if self.free:
+            entity = self.free.pop()
+            entity.reset(*args, **kwargs)
+            self.reused += 1
+            return entity
+        self.created += 1
+        return self.factory(*args, **kwargs)
+
+    def release(self, entity):
+        self.free.append(entity)
+
+    def release_all(self, entities):
+        """把列表中的对象全部放回池中并清空列表"""
+        self.free.extend(entities)
+        entities.clear()
+
+    def release_dead(self, entities, dead_count=None):
+        """把列表中已经无效的对象原地移除（保持顺序）并放回池中
+
+        dead_count 为已知的无效对象个数，前面一段正好是全部无效对象时不再检查后面的对象。
+        """
+        alive = self.alive
+        front = 0
+        for entity in entities:
+            if alive(entity):
+                break
+            front += 1
+        if front:
+            self.free.extend(entities[:front])
+            del entities[:front]
+        if dead_count is not None and front >= dead_count:
+            return
+
+        keep = 0
+        for entity in entities:
+            if alive(entity):
+                entities[keep] = entity
+                keep += 1
+            else:
+                self.free.append(entity)
+        del entities[keep:]
+
+    def get_stats(self):
+        return {"created": self.created, "reused": self.reused, "free": len(self.free)}
+
+
+class EntityPool(ObjectPool):
+    """保存在 EntityStore 中的实体的对象池，移除实体时同时释放它们的槽位。"""
+
+    def __init__(self, factory, store):
+        super().__init__(factory, lambda entity: store.in_use[entity.slot])
+        self.store = store
+
+    def release_inactive(self, entities):
+        """释放已经不活动的实体（槽位批量释放，对象放回池中）"""
+        dead = self.store.inactive_slots()
+        if not dead:
+            return
+        self.store.release(dead)
+        self.release_dead(entities, len(dead))
+
+    def prefill(self, count, *args, **kwargs):
+        super().prefill(count, *args, **kwargs)
+        self.store.release([entity.slot for entity in self.free[-count:]])
+
+    def release_all(self, entities):
+        self.store.clear()
+        super().release_all(entities)
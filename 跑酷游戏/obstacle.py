@@ -1,24 +1,117 @@
 # obstacle.py
+import functools
 import pygame
 import random
-import os
-
-
-class Obstacle:
-    def __init__(self, x, y, width=30, height=30, speed=8, image_path='image/障碍物1.jpg'):
-        self.rect = pygame.Rect(x, y, width, height)
+from collections import OrderedDict
+
+import numpy as np
+
+from asset_manager import assets
+from collision import CollisionWorld
+from entity_store import EntityStore, EntityView
+from object_pool import EntityPool
+
+
+class ObstacleImageCache:
+    """障碍物图片共享缓存（享元）。
+
+    每张原图只解码一次并缩小到最大尺寸作为母版，各种尺寸的障碍物图片
+    都从母版缩放得到，并放入有容量上限的LRU中，所有同尺寸障碍物共用一张Surface。
+    """
+
+    def __init__(self, image_paths, max_size=(90, 90), capacity=256):
+        self.capacity = capacity
+        self.cache = OrderedDict()  # (路径, 尺寸) -> Surface
+
+        # 统计信息
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # 母版图片（常驻，不会被资源管理器淘汰）
+        self.masters = {path: assets.acquire(path, max_size) for path in image_paths}
+
+    def prewarm(self, sizes):
+        """预先缩放好所有图片的指定尺寸"""
+        for path in self.masters:
+            for size in sizes:
+                self.get(path, size)
+        # 预热不计入统计
+        self.hits = self.misses = 0
+
+    def get(self, path, size):
+        """获取指定尺寸的障碍物图片，缺少母版时返回 None"""
+        key = (path, size)
+        if key in self.cache:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        self.misses += 1
+        master = self.masters.get(path)
+        image = pygame.transform.scale(master, size) if master else None
+        self.cache[key] = image
+        if len(self.cache) > self.capacity:
+            self.cache.popitem(last=False)
+            self.evictions += 1
+        return image
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get_stats(self):
+        """获取缓存统计信息"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+            "entries": len(self.cache),
+        }
+
+
+class ObstacleStore(EntityStore):
+    """障碍物的列数据，批量移动所有障碍物。"""
+
+    def move(self, scroll_speed, slots=None):
+        """移动障碍物（slots 为要移动的槽位号列表，默认为所有活动障碍物）"""
+        if self.vectorized:
+            selected = self.active if slots is None else np.isin(np.arange(self.capacity), slots)
+            self.x[selected] -= scroll_speed
+            self.active[selected & (self.x + self.w < 0)] = False
+            return
+        if slots is None:
+            slots = self.active_slots()
+
+        x, w, active = self.x, self.w, self.active
+        for slot in slots:
+            x[slot] -= scroll_speed
+            # 如果移出屏幕，标记为不活动
+            if x[slot] + w[slot] < 0:
+                active[slot] = False
+
+
+class Obstacle(EntityView):
+    __slots__ = ("speed", "image")
+    color = (255, 0, 0)
+
+    def __init__(self, x, y, width=30, height=30, speed=8, image_path='image/障碍物1.jpg', image=None,
+                 store=None):
+        """store 为所属管理器的 ObstacleStore，不指定时单独使用一个"""
+        super().__init__(store if store is not None else ObstacleStore(capacity=1))
+        self.reset(x, y, width, height, speed, image_path, image)
+
+    def reset(self, x, y, width=30, height=30, speed=8, image_path='image/障碍物1.jpg', image=None):
+        """重新初始化障碍物（对象池重复使用时调用）"""
+        self.alloc_slot(x=x, y=y, w=width, h=height)
         self.speed = speed
-        self.color = (255, 0, 0)
-        self.is_active = True
-
-        # 加载障碍物图片
-        self.image = None
-        if image_path and os.path.exists(image_path):
-            try:
-                self.image = pygame.image.load(image_path).convert_alpha()
-                self.image = pygame.transform.scale(self.image, (width, height))
-            except:
-                self.image = None
+
+        # 加载障碍物图片（优先使用传入的共享图片，否则从资源管理器获取）
+        self.image = image
+        if not self.image and image_path:
+            self.image = assets.load(image_path, (width, height))
 
         # 如果没有图片，创建简单的图片
         if not self.image:
@@ -27,49 +120,68 @@ class Obstacle:
             pygame.draw.rect(self.image, (150, 0, 0), (0, 0, width, height), 2)
 
     def move(self, scroll_speed):
-        self.rect.x -= scroll_speed
-
-        # 如果移出屏幕，标记为不活动
-        if self.rect.right < 0:
-            self.is_active = False
+        self.store.move(scroll_speed, [self.slot])
 
     def draw(self, screen):
         """绘制障碍物"""
-        if self.is_active:
-            screen.blit(self.image, self.rect)
+        if self.store.active[self.slot]:
+            screen.blit(self.image, self.pos)
 
     def check_collision(self, player_rect):
         """检测与玩家的碰撞"""
-        return self.rect.colliderect(player_rect)
+        return self.get_rect().colliderect(player_rect)
 
 
 class ObstacleManager:
-    def __init__(self):
+    # 障碍物图片和母版尺寸
+    IMAGE_PATHS = ('image/ob1.png', 'image/ob2.png', 'image/ob3.png')
+    MASTER_SIZE = (90, 90)
+
+    @classmethod
+    def preload_images(cls):
+        """预先解码障碍物图片（可以在后台线程中调用）"""
+        for path in cls.IMAGE_PATHS:
+            assets.load(path, cls.MASTER_SIZE)
+
+    def __init__(self, rng=None, world=None):
         self.obstacles = []
+        self.store = ObstacleStore(capacity=16)  # 所有障碍物的位置和状态（按列保存，批量更新）
+        self.pool = EntityPool(functools.partial(Obstacle, store=self.store), self.store)
+        self.rng = rng or random  # 障碍物的随机数流（不指定时使用全局random）
+
+        # 注册到碰撞检测（多个管理器共用同一个 CollisionWorld）
+        self.world = world or CollisionWorld()
+        self.world.register("obstacles", lambda: self.obstacles, self.store)
         self.spawn_timer = 0
         self.spawn_interval = 120
         self.min_spacing = 200
 
-        self.obstacles_images = [
-            'image/ob1.png',
-            'image/ob2.png',
-            'image/ob3.png'
-        ]
+        self.obstacles_images = list(self.IMAGE_PATHS)
+
+        # 障碍物尺寸按固定步长取值（40~90，步长10），所有尺寸的图片在初始化时预先缩放好
+        self.size_buckets = list(range(40, 91, 10))
+        self.image_cache = ObstacleImageCache(self.obstacles_images, self.MASTER_SIZE)
+        self.image_cache.prewarm([(w, h) for w in self.size_buckets for h in self.size_buckets])
+
+        # 预先创建障碍物对象，屏幕上同时存在的障碍物一般不超过这个数量
+        size = (self.size_buckets[0], self.size_buckets[0])
+        self.pool.prefill(8, 0, 0, *size, image_path=None,
+                          image=self.image_cache.get(self.obstacles_images[0], size))
 
     def coin_blocking(self, coin_manager, spawn_x):
         for coin in coin_manager.coins:
             # 只检测地面金币
             if coin.is_ground_coin:
                 # 如果金币还在前方一段距离内
-                if spawn_x - 220 < coin.rect.right:
+                if spawn_x - 220 < coin.get_rect().right:
                     return True
         return False
 
     def spawn_obstacle(self):
         """生成一个新的障碍物"""
         # 随机高度和宽度
-        obstacle_height = random.randint(40, 90)
-        obstacle_width = random.randint(40, 90)#更改了高度和宽度
+        obstacle_height = self.rng.choice(self.size_buckets)
+        obstacle_width = self.rng.choice(self.size_buckets)#更改了高度和宽度
         obstacle_y = 400 - obstacle_height  # 底部在地面上，地面为400
 
         # 障碍物速度
@@ -77,11 +189,13 @@ class ObstacleManager:
         # 检查与上一个障碍物的间隔
         if self.obstacles:
             last_obstacle = self.obstacles[-1]
-            if last_obstacle.rect.x > 800 - self.min_spacing:
+            if last_obstacle.get_rect().x > 800 - self.min_spacing:
                 return None
 
-        image_path = random.choice(self.obstacles_images)
-        obstacle = Obstacle(800, obstacle_y, obstacle_width, obstacle_height, obstacle_speed, image_path)
+        image_path = self.rng.choice(self.obstacles_images)
+        image = self.image_cache.get(image_path, (obstacle_width, obstacle_height))
+        obstacle = self.pool.acquire(800, obstacle_y, obstacle_width, obstacle_height, obstacle_speed,
+                                     image_path, image)
         return obstacle
 
     def update(self, scroll_speed, coin_manager=None):
@@ -94,17 +208,17 @@ class ObstacleManager:
                 new_obstacle = self.spawn_obstacle()
                 if new_obstacle:
                     self.obstacles.append(new_obstacle)
-                    self.spawn_interval = random.randint(80, 150)
+                    self.spawn_interval = self.rng.randint(80, 150)
                     self.spawn_timer = 0
 
                 if coin_manager:
                     coin_manager.waiting_after_obstacle = True
 
         # ⭐⭐⭐ 永远要执行：移动障碍物
-        for obstacle in self.obstacles[:]:
-            obstacle.move(scroll_speed)
-            if not obstacle.is_active:
-                self.obstacles.remove(obstacle)
+        self.store.move(scroll_speed)
+        self.pool.release_inactive(self.obstacles)
+
+        self.world.update("obstacles")
 
     def draw(self, screen):
         """绘制所有障碍物"""
@@ -112,16 +226,16 @@ class ObstacleManager:
             obstacle.draw(screen)
 
     def check_collisions(self, player_rect):
-        """检测玩家与所有障碍物的碰撞"""
-        for obstacle in self.obstacles:
-            if obstacle.check_collision(player_rect):
-                return True
-        return False
+        """检测玩家与障碍物的碰撞（只检测 x 方向附近的障碍物）"""
+        return self.world.any_overlap("obstacles", player_rect)
 
     def get_all_obstacle_rects(self):
         """获取所有活动障碍物的矩形"""
-        return [obstacle.rect for obstacle in self.obstacles]
+        return [obstacle.get_rect() for obstacle in self.obstacles]
 
     def clear(self):
-        """清除所有障碍物"""
-        self.obstacles.clear()
+        """清除所有障碍物，并把生成计时恢复为初始值"""
+        self.pool.release_all(self.obstacles)
+        self.spawn_timer = 0
+        self.spawn_interval = 120
+        self.world.update("obstacles")
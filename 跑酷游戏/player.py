@@ -2,14 +2,21 @@ import pygame
 import os
 import glob
 
+from animation_atlas import get_animation_atlas, get_character_animation, natural_sort_key
+from asset_manager import assets
+
 
 class Player:
-    def __init__(self, x, y, can_double_jump=False, player_id=1, image_folder=None, shoot_image_path=None):
+    def __init__(self, x, y, can_double_jump=False, player_id=1, image_folder=None, shoot_image_path=None,
+                 animation_name=None):
         # 基本属性
         self.rect = pygame.Rect(x, y, 50, 50)
 
         # 动画相关属性
-        self.animation_frames = []  # 动画帧列表
+        self.frame_sheet = None  # 动画图集（所有帧拼接在一张图上）
+        self.animation_frames = []  # 每一帧在图集中的位置
+        self.frame_durations = []  # 每一帧持续的帧数
+        self.hitbox_rect = (0, 0, 50, 50)  # 碰撞框（相对于角色左上角）
         self.current_frame = 0  # 当前帧索引
         self.animation_speed = 10  # 动画速度
         self.animation_counter = 0  # 动画计数器
@@ -19,8 +26,9 @@ class Player:
         self.shoot_timer = 0  # 射击计时器
         self.force_shoot_pose = False
 
-        # 加载动画帧
-        self.load_animation_frames(image_folder)
+        # 加载动画帧（优先使用动画清单，清单中没有时加载整个文件夹）
+        if not (animation_name and self.load_animation(animation_name)):
+            self.load_animation_frames(image_folder)
 
         # 加载射击图片（可选）
         self.load_shoot_image(player_id, shoot_image_path)
@@ -56,13 +64,10 @@ class Player:
     def load_shoot_image(self, player_id, shoot_image_path):
         """加载射击图片（可选）"""
         if shoot_image_path and os.path.exists(shoot_image_path):
-            try:
-                self.shoot_frame = pygame.image.load(shoot_image_path).convert_alpha()
-                self.shoot_frame = pygame.transform.scale(self.shoot_frame, (50, 50))
+            self.shoot_frame = assets.load(shoot_image_path, (50, 50))
+            if self.shoot_frame:
                 print(f"成功加载射击图片: {shoot_image_path}")
                 return
-            except Exception as e:
-                print(f"加载射击图片失败: {e}")
 
         # 如果射击图片未能加载，改为使用静态图片以保持一致外观
         if self.static_frame is not None:
@@ -96,8 +101,22 @@ class Player:
         
         return image
 
+    def load_animation(self, animation_name):
+        """从动画清单加载角色动画，清单中没有该角色时返回 False"""
+        animation = get_character_animation(animation_name)
+        if not animation:
+            print(f"动画清单中没有角色动画: {animation_name}")
+            return False
+
+        atlas, self.frame_durations, self.hitbox_rect = animation
+        self.frame_sheet = atlas.surface
+        self.animation_frames = atlas.frame_rects
+        self.current_frame = 0
+        self.animation_counter = 0
+        return True
+
     def load_animation_frames(self, folder_path):
-        """加载动画帧"""
+        """加载文件夹中的所有动画帧"""
         self.animation_frames = []  # 确保清空列表
         self.current_frame = 0
         self.animation_speed = 10
@@ -111,18 +130,14 @@ class Player:
         for ext in image_extensions:
             image_files.extend(glob.glob(os.path.join(folder_path, ext)))
 
-        # 按文件名排序（确保帧顺序正确）
-        image_files.sort()
+        # 按文件名自然排序（确保 frame_2 在 frame_10 之前）
+        image_files.sort(key=natural_sort_key)
 
-        # 加载所有图片
-        for img_path in image_files:
-            try:
-                img = pygame.image.load(img_path).convert_alpha()
-                img = pygame.transform.scale(img, (50, 50))
-                self.animation_frames.append(img)
-                print(f"加载动画帧: {os.path.basename(img_path)}")
-            except Exception as e:
-                print(f"加载动画帧失败: {img_path}, 错误: {e}")
+        # 拼接成图集（同一组帧只拼接一次，并缓存到磁盘）
+        atlas = get_animation_atlas(image_files, (50, 50))
+        self.frame_sheet = atlas.surface
+        self.animation_frames = atlas.frame_rects
+        self.frame_durations = [self.animation_speed] * len(self.animation_frames)
 
         print(f"成功加载 {len(self.animation_frames)} 个动画帧")
 
@@ -134,11 +149,17 @@ class Player:
         # 更新动画计数器
         self.animation_counter += 1
 
-        # 根据速度更新动画帧
-        if self.animation_counter >= self.animation_speed:
+        # 根据当前帧的持续时间更新动画帧
+        if self.animation_counter >= self.frame_durations[self.current_frame]:
             self.animation_counter = 0
             self.current_frame = (self.current_frame + 1) % len(self.animation_frames)
 
+    @property
+    def hitbox(self):
+        """获取用于碰撞检测的矩形"""
+        x, y, width, height = self.hitbox_rect
+        return pygame.Rect(self.rect.x + x, self.rect.y + y, width, height)
+
     def jump(self):
         """执行跳跃"""
         if self.jump_count < self.max_jump_count:
@@ -194,6 +215,17 @@ class Player:
         self.current_frame = 0  # 重置动画帧
         self.animation_counter = 0  # 重置动画计数器
 
+    def reset(self, x, y):
+        """重置为一局新游戏的初始状态（保留已加载的动画）"""
+        self.reset_position(x, y)
+        self.shoot_timer = 0
+        self.force_shoot_pose = False
+        self.health = 3
+        self.is_invincible = False
+        self.buff_timer = 0
+        self.speed_multiplier = 1.0
+        self.last_update_time = pygame.time.get_ticks()
+
     def draw(self, screen):
         """绘制玩家"""
         # 如果无敌状态，添加闪烁效果
@@ -205,8 +237,8 @@ class Player:
             screen.blit(self.shoot_frame, self.rect)
         # 否则绘制当前动画帧
         elif self.animation_frames:
-            current_image = self.animation_frames[self.current_frame]
-            screen.blit(current_image, self.rect)
+            frame_rect = self.animation_frames[self.current_frame]
+            screen.blit(self.frame_sheet, self.rect, frame_rect)
         else:
             # 如果动画帧不存在，绘制一个简单的矩形作为备份
             pygame.draw.rect(screen, (255, 0, 0) if self.player_id == 1 else (0, 255, 0), self.rect)
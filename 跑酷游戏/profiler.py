@@ -0,0 +1,186 @@
+# profiler.py
+"""帧耗时分析器。
+
+把每一帧拆成若干分段（事件处理、各个子系统的 update 和 draw 等）分别计时，
+保留最近一段时间的数据，统计 p50 / p95 / p99，并可以在游戏中以浮层显示（F3 切换）。
+退出游戏时可以把每帧的数据导出为 CSV 或 JSON 文件，方便比较不同版本的性能。
+
+用法（每帧开始时调用 begin_frame，它会结束并保存上一帧）:
+    profiler.begin_frame()
+    with profiler.section("update"):
+        ...
+"""
+
+import csv
+import json
+import os
+import time
+from collections import OrderedDict, deque
+
+import pygame
+
+
+class _Section:
+    """一个可重复使用的计时分段（with 语句）。"""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.add_sample(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+def percentile(sorted_values, p):
+    """对已排序的列表求百分位数（最近秩法）"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class FrameProfiler:
+    """按分段统计帧耗时（毫秒）。
+
+    window: 计算百分位数时使用最近多少帧
+    history_size: 导出文件时最多保留多少帧的原始数据
+    """
+
+    def __init__(self, window=600, history_size=36000, budget_ms=1000 / 60):
+        self.window = window
+        self.budget_ms = budget_ms
+        self.samples = OrderedDict()  # 分段名 -> 最近 window 帧的耗时
+        self.history = deque(maxlen=history_size)  # 每帧一行: {分段名: 耗时}
+        self.sections = {}
+        self.frame_start = None
+        self.current = {}
+        self.frame_index = 0
+
+        # 浮层显示
+        self.overlay_visible = False
+        self.overlay_interval = 30  # 每隔多少帧刷新一次浮层文字
+        self.overlay_surface = None
+        self.overlay_age = 0
+
+    def section(self, name):
+        """返回名为 name 的计时分段，用于 with 语句"""
+        section = self.sections.get(name)
+        if section is None:
+            section = self.sections[name] = _Section(self, name)
+        return section
+
+    def add_sample(self, name, ms):
+        """记录一个分段的耗时，同一帧内多次记录会累加"""
+        self.current[name] = self.current.get(name, 0.0) + ms
+
+    def begin_frame(self):
+        """开始新的一帧，两次 begin_frame 之间的时间记为整帧耗时（包括等待）"""
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.current["frame"] = (now - self.frame_start) * 1000
+            self.end_frame()
+        self.frame_start = now
+
+    def end_frame(self):
+        """保存当前帧的数据"""
+        if not self.current:
+            return
+        for name, ms in self.current.items():
+            values = self.samples.get(name)
+            if values is None:
+                values = self.samples[name] = deque(maxlen=self.window)
+            values.append(ms)
+        self.current["index"] = self.frame_index
+        self.history.append(self.current)
+        self.current = {}
+        self.frame_index += 1
+
+    def get_stats(self):
+        """获取每个分段的统计信息: {分段名: {avg, p50, p95, p99, max}}"""
+        stats = OrderedDict()
+        for name, values in self.samples.items():
+            ordered = sorted(values)
+            stats[name] = {
+                "avg": sum(ordered) / len(ordered),
+                "p50": percentile(ordered, 50),
+                "p95": percentile(ordered, 95),
+                "p99": percentile(ordered, 99),
+                "max": ordered[-1],
+            }
+        return stats
+
+    def reset(self):
+        self.samples.clear()
+        self.history.clear()
+        self.current = {}
+        self.frame_start = None
+        self.frame_index = 0
+
+    # ==================== 浮层 ====================
+    def toggle_overlay(self):
+        self.overlay_visible = not self.overlay_visible
+        self.overlay_surface = None
+
+    def draw_overlay(self, screen, font, pos=(10, 10)):
+        """绘制统计浮层（文字每隔 overlay_interval 帧才重新渲染一次）"""
+        if not self.overlay_visible:
+            return
+        self.overlay_age += 1
+        if self.overlay_surface is None or self.overlay_age >= self.overlay_interval:
+            self.overlay_surface = self.render_overlay(font)
+            self.overlay_age = 0
+        screen.blit(self.overlay_surface, pos)
+
+    def render_overlay(self, font):
+        stats = self.get_stats()
+        lines = [(f"{'ms':<14}{'p50':>6} {'p95':>6} {'p99':>6}", (255, 255, 255))]
+        for name, s in stats.items():
+            over_budget = name == "frame" and s["p95"] > self.budget_ms * 1.05
+            color = (255, 120, 120) if over_budget else (200, 255, 200)
+            lines.append((f"{name:<14}{s['p50']:6.2f} {s['p95']:6.2f} {s['p99']:6.2f}", color))
+
+        # 数字每次都不同，直接渲染，不放入全局文字缓存
+        rendered = [font.render(text, True, color) for text, color in lines]
+        width = max(surface.get_width() for surface in rendered) + 12
+        height = sum(surface.get_height() for surface in rendered) + 12
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 170))
+        y = 6
+        for line in rendered:
+            surface.blit(line, (6, y))
+            y += line.get_height()
+        return surface
+
+    # ==================== 导出 ====================
+    def dump(self, path):
+        """导出数据，按扩展名选择格式: .csv 为每帧一行，其余为 JSON（统计 + 每帧数据）"""
+        self.end_frame()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        names = list(self.samples)
+        if path.lower().endswith(".csv"):
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(["index"] + names)
+                for row in self.history:
+                    writer.writerow([row["index"]] + [f"{row[name]:.4f}" if name in row else ""
+                                                      for name in names])
+        else:
+            data = {
+                "frames": len(self.history),
+                "stats": self.get_stats(),
+                "history": list(self.history),
+            }
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+        print(f"帧耗时数据已导出: {path}")
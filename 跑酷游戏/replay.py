@@ -0,0 +1,246 @@
+# replay.py
+"""游戏录像：记录种子和每个逻辑帧的输入，用于重现一局游戏。
+
+游戏逻辑是确定性的（见 Game.seed_rngs），只要知道种子、角色、购买的物品
+和每一帧的输入，就能在无界面模式下完整地重新运行一局（见 simulation.ReplayPlayer）。
+
+文件格式（小端序）:
+    文件头   魔数 "PKRP"、版本、角色、物品位、种子(u64)、帧数(u32)、最终分数(double)、本局金币(u32)
+    输入流   (输入位 u8, 重复帧数 varint) 的序列，连续相同的输入只记录一次
+"""
+
+import copy
+import os
+import struct
+import time
+
+import pygame
+
+MAGIC = b"PKRP"
+VERSION = 1
+HEADER = struct.Struct("<4sBBBxQIdI")
+
+# 每个逻辑帧的输入位
+INPUT_JUMP = 1  # 按下空格
+INPUT_SHOOT = 2  # 按下 F
+INPUT_SHOOT_HELD = 4  # 按住 F
+
+# 商店物品在物品位中的顺序
+ITEM_TYPES = ("extra_life", "coin_double", "star_effect")
+
+
+def items_to_mask(item_types):
+    mask = 0
+    for i, item_type in enumerate(ITEM_TYPES):
+        if item_type in item_types:
+            mask |= 1 << i
+    return mask
+
+
+def mask_to_items(mask):
+    return [item_type for i, item_type in enumerate(ITEM_TYPES) if mask & (1 << i)]
+
+
+def _write_varint(out, value):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def _read_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+class Replay:
+    """一局游戏的录像。"""
+
+    def __init__(self, seed, character, items=(), inputs=None, final_score=0.0, final_coins=0):
+        self.seed = seed
+        self.character = character
+        self.items = list(items)
+        self.inputs = inputs if inputs is not None else bytearray()
+        self.final_score = final_score
+        self.final_coins = final_coins
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def to_bytes(self):
+        out = bytearray(HEADER.pack(MAGIC, VERSION, self.character, items_to_mask(self.items),
+                                    self.seed, len(self.inputs), self.final_score, self.final_coins))
+        i = 0
+        while i < len(self.inputs):
+            bits = self.inputs[i]
+            run = 1
+            while i + run < len(self.inputs) and self.inputs[i + run] == bits:
+                run += 1
+            out.append(bits)
+            _write_varint(out, run)
+            i += run
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise ValueError("录像文件不完整")
+        magic, version, character, mask, seed, frame_count, final_score, final_coins = \
+            HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("不是录像文件")
+        if version != VERSION:
+            raise ValueError(f"不支持的录像版本: {version}")
+
+        inputs = bytearray()
+        pos = HEADER.size
+        while pos < len(data):
+            bits = data[pos]
+            run, pos = _read_varint(data, pos + 1)
+            inputs.extend(bytes((bits,)) * run)
+        if len(inputs) != frame_count:
+            raise ValueError(f"录像帧数不符: {len(inputs)} / {frame_count}")
+        return cls(seed, character, mask_to_items(mask), inputs, final_score, final_coins)
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayRecorder:
+    """在游戏进行时逐帧记录输入，一局结束后保存为录像文件。"""
+
+    def __init__(self, seed, character, items=()):
+        self.replay = Replay(seed, character, items)
+
+    def record(self, bits):
+        self.replay.inputs.append(bits)
+
+    def finish(self, replay_dir, final_score, final_coins):
+        """写入最终结果并保存，返回文件路径"""
+        replay = self.replay
+        replay.final_score = final_score
+        replay.final_coins = final_coins
+        file_name = time.strftime("replay_%Y%m%d_%H%M%S") + f"_{replay.seed}.pkr"
+        path = os.path.join(replay_dir, file_name)
+        replay.save(path)
+        print(f"录像已保存: {path}（{len(replay)} 帧，分数 {int(final_score)}）")
+        return path
+
+
+# ==================== 状态快照 ====================
+def _attributes(entity):
+    """实体的所有属性（同时支持 __dict__ 和 __slots__）"""
+    values = dict(getattr(entity, "__dict__", {}))
+    for cls in type(entity).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            if hasattr(entity, name):
+                values[name] = getattr(entity, name)
+    return values
+
+
+def _clone(entity):
+    """浅拷贝实体，并复制其中的 Rect（图片等共享资源不复制）"""
+    clone = copy.copy(entity)
+    for name, value in _attributes(entity).items():
+        if isinstance(value, pygame.Rect):
+            setattr(clone, name, value.copy())
+    return clone
+
+
+# 快照中保存的 Game 属性（标量或不可变对象）
+GAME_FIELDS = (
+    "state", "score", "coins", "current_game_coins", "player_health", "simulation_frame",
+    "player_shoot_cooldown", "extra_life_active", "extra_life_used", "coin_double_active",
+    "star_effect_active", "show_coin_effect", "coin_effect_timer", "coin_effect_pos",
+    "bg1_x1", "bg1_x2", "bg2_x1", "bg2_x2", "bg3_x1", "bg3_x2", "paused_state",
+)
+
+# 各管理器中保存实体的列表
+MANAGER_LISTS = {
+    "obstacle_manager": ("obstacles",),
+    "coin_manager": ("coins",),
+    "enemy_manager": ("monsters", "player_bullets"),
+}
+
+# 各管理器中保存实体数据的 EntityStore（实体对象只是其中槽位的视图）
+MANAGER_STORES = {
+    "obstacle_manager": ("store",),
+    "coin_manager": ("store",),
+    "enemy_manager": ("bullet_store",),
+}
+
+
+class GameSnapshot:
+    """游戏逻辑状态的快照，用于录像跳转。
+
+    只保存会影响游戏逻辑的状态：分数、玩家、各管理器中的实体、战斗状态和随机数流。
+    图片等资源在快照之间共享。
+    """
+
+    def __init__(self, game):
+        self.frame = game.simulation_frame
+        self.fields = {name: getattr(game, name) for name in GAME_FIELDS}
+        self.current_battle_threshold = getattr(game, "current_battle_threshold", None)
+        self.completed_battles = set(game.completed_battles)
+        self.stars = [dict(star) for star in game.stars]
+        self.rng_states = {name: rng.getstate() for name, rng in game.rngs.items()}
+        self.player = _clone(game.player) if game.player else None
+        self.battle_monster = _clone(game.battle_monster) if game.battle_monster else None
+        self.player_bullets = [_clone(b) for b in game.player_bullets]
+        self.monster_bullets = [_clone(b) for b in game.monster_bullets]
+
+        self.managers = {}
+        for attr, lists in MANAGER_LISTS.items():
+            manager = getattr(game, attr)
+            state = dict(vars(manager))
+            for name in lists:
+                state[name] = [_clone(entity) for entity in state[name]]
+            self.managers[attr] = state
+        self.stores = {(attr, name): getattr(getattr(game, attr), name).snapshot()
+                       for attr, names in MANAGER_STORES.items() for name in names}
+
+    def restore(self, game):
+        """把游戏恢复到快照时的状态（快照本身不会被修改，可以重复使用）"""
+        for name, value in self.fields.items():
+            setattr(game, name, value)
+        if self.current_battle_threshold is not None:
+            game.current_battle_threshold = self.current_battle_threshold
+        game.completed_battles = set(self.completed_battles)
+        game.stars = [dict(star) for star in self.stars]
+        for name, state in self.rng_states.items():
+            game.rngs[name].setstate(state)
+
+        if self.player:
+            # 保留同一个 Player 对象（角色池中复用），只恢复它的属性
+            vars(game.player).update(vars(_clone(self.player)))
+        game.battle_monster = _clone(self.battle_monster) if self.battle_monster else None
+        game.player_bullets = [_clone(b) for b in self.player_bullets]
+        game.monster_bullets = [_clone(b) for b in self.monster_bullets]
+
+        for attr, lists in MANAGER_LISTS.items():
+            manager = getattr(game, attr)
+            vars(manager).update(self.managers[attr])
+            for name in lists:
+                setattr(manager, name, [_clone(entity) for entity in self.managers[attr][name]])
+        for (attr, name), state in self.stores.items():
+            getattr(getattr(game, attr), name).restore(state)
+        game.pending_input = 0
@@ -1,14 +1,639 @@
 # save_system.py
+import atexit
+import copy
+import heapq
 import json
 import os
+import queue
+import sqlite3
+import threading
 import time
 from datetime import datetime
 
 
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _dumps(record):
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+
+
+def build_save_index(saves):
+    """小写存档名 -> 存档在列表中的位置"""
+    return {save["player_name"].lower(): i for i, save in enumerate(saves) if save is not None}
+
+
+def apply_record(data, record, index):
+    """把一条日志记录应用到存档数据上
+
+    index 为 build_save_index 建立的位置索引，随记录一起更新。
+    删除的存档在列表中先留下 None（位置不变），所有记录应用完之后再用 drop_deleted 去掉。
+    """
+    saves = data.setdefault("saves", [])
+    op = record.get("op")
+    name = record.get("name", "").lower()
+    position = index.get(name)
+
+    if op == "create":
+        if position is None:
+            index[name] = len(saves)
+            saves.append(record["save"])
+        else:
+            saves[position] = record["save"]
+    elif op == "update" and position is not None:
+        saves[position].update(record["fields"])
+    elif op == "delete" and position is not None:
+        saves[position] = None
+        del index[name]
+    data["last_updated"] = record.get("time", data.get("last_updated"))
+
+
+def drop_deleted(data):
+    """去掉删除存档后留下的 None"""
+    data["saves"] = [save for save in data.get("saves", []) if save is not None]
+
+
+def coalesce_records(records):
+    """把同一存档连续的 update 记录合并成一条（后面的字段覆盖前面的）"""
+    merged = []
+    for record in records:
+        last = merged[-1] if merged else None
+        if (last and record["op"] == "update" and last["op"] == "update"
+                and last["name"].lower() == record["name"].lower()):
+            last["fields"].update(record["fields"])
+            last["time"] = record["time"]
+        else:
+            merged.append(record)
+    return merged
+
+
+def load_save_data(save_file, journal):
+    """读取存档文件，再重放日志中的修改"""
+    data = {"saves": [], "last_updated": _now()}
+    if os.path.exists(save_file):
+        try:
+            with open(save_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except:
+            print("无法读取存档文件，将创建新存档")
+
+    try:
+        records = journal.read()
+    except Exception as e:
+        print(f"无法读取存档日志: {e}")
+        records = []
+    index = build_save_index(data.setdefault("saves", []))
+    for record in records:
+        apply_record(data, record, index)
+    drop_deleted(data)
+    return data
+
+
+class SaveJournal:
+    """存档的追加日志（每行一条 JSON 记录）。
+
+    每次修改存档只在日志末尾追加一条记录（存档名和修改后的字段值），
+    不需要重写整个存档文件。记录写入后立即交给操作系统，
+    每 sync_every 条或每隔 sync_interval 秒才调用一次 fsync 写入磁盘。
+    """
+
+    def __init__(self, path, sync_every=16, sync_interval=2.0):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.file = None
+        self.records = 0  # 日志中的记录数
+        self.unsynced = 0  # 还没有 fsync 的记录数
+        self.last_sync = time.monotonic()
+
+    def read(self):
+        """读取日志中的所有记录（损坏的行会被跳过，例如写到一半时程序退出）"""
+        records = []
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line_number, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        print(f"存档日志第{line_number}行已损坏，已跳过")
+        self.records = len(records)
+        return records
+
+    def write(self, lines):
+        """追加多条已经序列化好的记录（一次写入）"""
+        if self.file is None:
+            self.file = open(self.path, 'a', encoding='utf-8')
+        self.file.write("".join(line + "\n" for line in lines))
+        self.file.flush()
+        self.records += len(lines)
+        self.unsynced += len(lines)
+        if self.unsynced >= self.sync_every or time.monotonic() - self.last_sync >= self.sync_interval:
+            self.sync()
+
+    def sync(self):
+        """把已写入的记录 fsync 到磁盘"""
+        if self.file and self.unsynced:
+            os.fsync(self.file.fileno())
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def truncate(self):
+        """清空日志（日志内容已经合并到存档文件之后调用）"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.records = 0
+
+    def close(self):
+        if self.file:
+            self.sync()
+            self.file.close()
+            self.file = None
+
+
+def save_number(player_name):
+    """自动存档名（存档N）的序号，其他名称返回 None"""
+    if player_name.startswith("存档"):
+        try:
+            return int(player_name[2:])
+        except ValueError:
+            return None
+    return None
+
+
+class JsonSaveStorage:
+    """JSON 存档文件 + 追加日志的存储后端。
+
+    存档文件（game_saves.json）是某一时刻所有存档的快照，之后的修改追加到日志文件
+    （game_saves.json.journal）中，加载时先读快照再按顺序重放日志。
+    日志记录的都是修改后的值而不是增量，重复重放也得到相同的结果，
+    所以合并日志时即使在写完快照、清空日志之前退出也不会出错。
+    日志记录数超过存档数（且不少于 compact_threshold）时把日志合并到快照，
+    合并的开销平均到每次保存上仍然是常数。
+
+    写线程保存一份存档数据副本，并按小写存档名建立位置索引，每条记录只修改索引到的那个存档；
+    删除的存档在副本中先留下 None，合并时再去掉。
+
+    存储后端需要提供 load / open / write / replace / sync / close 和查询方法 top / first_free_number，
+    除 load 外都由 SaveWriter 调用（在写线程中或持有写锁时）。
+    """
+
+    def __init__(self, save_file='game_saves.json', compact_threshold=256):
+        self.save_file = save_file
+        self.compact_threshold = compact_threshold
+        self.journal = SaveJournal(save_file + ".journal")
+        self.data = None  # 存档数据副本（open 时在写线程中读取）
+        self.index = {}  # 小写存档名 -> 副本中的位置
+
+    def load(self):
+        """读取所有存档"""
+        return load_save_data(self.save_file, self.journal)
+
+    def open(self):
+        """读取存档数据副本"""
+        self.set_replica(self.load())
+
+    def set_replica(self, data):
+        drop_deleted(data)
+        self.data = data
+        self.index = build_save_index(data["saves"])
+
+    def write(self, records):
+        """把一批记录追加到日志，并应用到副本上"""
+        if self.data is None:
+            self.open()
+        self.journal.write([_dumps(record) for record in records])
+        for record in records:
+            apply_record(self.data, record, self.index)
+
+        if self.journal.records > max(self.compact_threshold, len(self.index)):
+            self.compact()
+
+    def replace(self, data):
+        """用完整的存档数据替换副本，并立即合并成存档文件"""
+        self.set_replica(data)
+        self.compact()
+
+    def compact(self):
+        """把副本写入存档文件并清空日志
+
+        先写入临时文件再替换，写入过程中退出不会损坏原来的存档文件。
+        """
+        self.set_replica(self.data)
+        self.data["last_updated"] = _now()
+        temp_file = self.save_file + ".tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.save_file)
+        self.journal.truncate()
+
+    def sync(self):
+        self.journal.sync()
+
+    def close(self):
+        self.journal.close()
+
+    def top(self, field, limit):
+        """按 field 从大到小的前 limit 个存档名（同分时按存档顺序）"""
+        saves = (save for save in self.data["saves"] if save is not None)
+        saves = heapq.nlargest(limit, saves, key=lambda save: save[field])
+        return [save["player_name"] for save in saves]
+
+    def first_free_number(self):
+        """最小的未被使用的自动存档序号"""
+        used = {save_number(save["player_name"]) for save in self.data["saves"] if save is not None}
+        number = 1
+        while number in used:
+            number += 1
+        return number
+
+
+class SqliteSaveStorage:
+    """SQLite 存储后端。
+
+    profiles 表每个存档一行，character_stats 表每个存档的每个角色一行，
+    保存时只更新修改过的行。存档名（小写）、最高分、总金币和自动存档序号都有索引，
+    按名称查找、排行榜和自动存档名的分配都直接走索引，不需要读出所有存档。
+    第一次创建数据库时会导入 migrate_from 指定的 JSON 存档（一次性迁移），
+    导入后原文件（存档文件和日志）改名为 .migrated 保留。
+    """
+
+    SCHEMA_VERSION = 1
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS profiles (
+            id INTEGER PRIMARY KEY,
+            player_name TEXT NOT NULL,
+            name_key TEXT NOT NULL,          -- player_name.lower()
+            save_number INTEGER,             -- 存档N 的序号
+            created_date TEXT,
+            last_played TEXT,
+            high_score INTEGER NOT NULL DEFAULT 0,
+            total_coins INTEGER NOT NULL DEFAULT 0,
+            games_played INTEGER NOT NULL DEFAULT 0,
+            total_score INTEGER NOT NULL DEFAULT 0,
+            achievements TEXT NOT NULL DEFAULT '{}'
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS profiles_name_key ON profiles (name_key);
+        CREATE INDEX IF NOT EXISTS profiles_high_score ON profiles (high_score DESC, id);
+        CREATE INDEX IF NOT EXISTS profiles_total_coins ON profiles (total_coins DESC, id);
+        CREATE INDEX IF NOT EXISTS profiles_save_number ON profiles (save_number);
+
+        CREATE TABLE IF NOT EXISTS character_stats (
+            profile_id INTEGER NOT NULL REFERENCES profiles (id) ON DELETE CASCADE,
+            character_id TEXT NOT NULL,
+            games_played INTEGER NOT NULL DEFAULT 0,
+            best_score INTEGER NOT NULL DEFAULT 0,
+            total_coins INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (profile_id, character_id)
+        );
+
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    # profiles 表中直接对应存档字段的列
+    COLUMNS = ("created_date", "last_played", "high_score", "total_coins", "games_played", "total_score")
+
+    # 排行榜查询（按索引顺序读取前 limit 行）
+    TOP_QUERIES = {
+        "high_score": "SELECT player_name FROM profiles ORDER BY high_score DESC, id LIMIT ?",
+        "total_coins": "SELECT player_name FROM profiles ORDER BY total_coins DESC, id LIMIT ?",
+    }
+
+    # 最小的未被使用的序号：1 没有被使用时是 1，否则沿序号索引找到第一个后面有空位的序号
+    FREE_NUMBER_QUERY = """
+        SELECT CASE WHEN NOT EXISTS (SELECT 1 FROM profiles WHERE save_number = 1) THEN 1 ELSE (
+            SELECT p.save_number + 1 FROM profiles p
+            WHERE p.save_number >= 1
+              AND NOT EXISTS (SELECT 1 FROM profiles q WHERE q.save_number = p.save_number + 1)
+            ORDER BY p.save_number LIMIT 1
+        ) END
+    """
+
+    def __init__(self, path='game_saves.db', migrate_from=None):
+        self.path = path
+        self.migrate_from = migrate_from  # 第一次创建数据库时导入的 JSON 存档文件
+        self.conn = None
+
+    def connect(self):
+        if self.conn is None:
+            # 连接在游戏线程中打开，之后由写线程使用（SaveWriter 保证同一时间只有一个线程访问）
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.execute("PRAGMA foreign_keys = ON")
+            self.conn.execute("PRAGMA journal_mode = WAL")
+            self.conn.execute("PRAGMA synchronous = NORMAL")
+            self.conn.executescript(self.SCHEMA)
+            if self.conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+                self.migrate()
+        return self.conn
+
+    def migrate(self):
+        """新数据库：导入 JSON 存档（和设置版本号在同一个事务中，中途退出下次会重新导入）"""
+        json_file = self.migrate_from
+        data = None
+        if json_file and (os.path.exists(json_file) or os.path.exists(json_file + ".journal")):
+            journal = SaveJournal(json_file + ".journal")
+            data = load_save_data(json_file, journal)
+            journal.close()
+
+        with self.conn:
+            if data:
+                self.insert_all(data)
+            self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+        if data:
+            for path in (json_file, json_file + ".journal"):
+                if os.path.exists(path):
+                    os.replace(path, path + ".migrated")
+            print(f"已将 {json_file} 中的 {len(data.get('saves', []))} 个存档导入 {self.path}")
+
+    def load(self):
+        """读取所有存档（按创建顺序）"""
+        conn = self.connect()
+        character_stats = {}
+        for profile_id, character_id, games_played, best_score, total_coins in conn.execute(
+                "SELECT profile_id, character_id, games_played, best_score, total_coins "
+                "FROM character_stats ORDER BY profile_id, rowid"):
+            character_stats.setdefault(profile_id, {})[character_id] = {
+                "games_played": games_played, "best_score": best_score, "total_coins": total_coins}
+
+        saves = []
+        for row in conn.execute("SELECT id, player_name, created_date, last_played, high_score, total_coins, "
+                                "games_played, total_score, achievements FROM profiles ORDER BY id"):
+            save = {"player_name": row[1]}
+            save.update(zip(self.COLUMNS, row[2:8]))
+            save["character_stats"] = character_stats.get(row[0], {})
+            save["achievements"] = json.loads(row[8])
+            saves.append(save)
+
+        last_updated = conn.execute("SELECT value FROM meta WHERE key = 'last_updated'").fetchone()
+        return {"saves": saves, "last_updated": last_updated[0] if last_updated else _now()}
+
+    def open(self):
+        self.connect()
+
+    def profile_id(self, player_name):
+        row = self.conn.execute("SELECT id FROM profiles WHERE name_key = ?", (player_name.lower(),)).fetchone()
+        return row[0] if row else None
+
+    def insert(self, save):
+        """插入一个存档（同名存档已存在时整体替换）"""
+        profile_id = self.profile_id(save["player_name"])
+        if profile_id is None:
+            profile_id = self.conn.execute(
+                "INSERT INTO profiles (player_name, name_key, save_number) VALUES (?, ?, ?)",
+                (save["player_name"], save["player_name"].lower(), save_number(save["player_name"]))).lastrowid
+        else:
+            self.conn.execute("DELETE FROM character_stats WHERE profile_id = ?", (profile_id,))
+        self.update(profile_id, save)
+
+    def insert_all(self, data):
+        for save in data.get("saves", []):
+            self.insert(save)
+        self.set_last_updated(data.get("last_updated", _now()))
+
+    def update(self, profile_id, fields):
+        """把存档字段写入 profiles / character_stats 表（只写 fields 中有的字段）"""
+        columns = [column for column in self.COLUMNS if column in fields]
+        values = [fields[column] for column in columns]
+        if "achievements" in fields:
+            columns.append("achievements")
+            values.append(json.dumps(fields["achievements"], ensure_ascii=False))
+        if columns:
+            assignments = ", ".join(f"{column} = ?" for column in columns)
+            self.conn.execute(f"UPDATE profiles SET {assignments} WHERE id = ?", (*values, profile_id))
+
+        for character_id, stats in fields.get("character_stats", {}).items():
+            self.conn.execute(
+                "INSERT INTO character_stats (profile_id, character_id, games_played, best_score, total_coins) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT (profile_id, character_id) DO UPDATE SET "
+                "games_played = excluded.games_played, best_score = excluded.best_score, "
+                "total_coins = excluded.total_coins",
+                (profile_id, character_id, stats["games_played"], stats["best_score"], stats["total_coins"]))
+
+    def set_last_updated(self, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_updated', ?)", (value,))
+
+    def write(self, records):
+        """把一批记录写入数据库（一个事务）"""
+        conn = self.connect()
+        with conn:
+            for record in records:
+                op = record.get("op")
+                if op == "create":
+                    self.insert(record["save"])
+                elif op == "update":
+                    profile_id = self.profile_id(record["name"])
+                    if profile_id is not None:
+                        self.update(profile_id, record["fields"])
+                elif op == "delete":
+                    conn.execute("DELETE FROM profiles WHERE name_key = ?", (record["name"].lower(),))
+            self.set_last_updated(records[-1].get("time", _now()))
+
+    def replace(self, data):
+        """用完整的存档数据替换数据库中的所有存档"""
+        conn = self.connect()
+        with conn:
+            conn.execute("DELETE FROM character_stats")
+            conn.execute("DELETE FROM profiles")
+            self.insert_all(data)
+
+    def sync(self):
+        """把 WAL 中已提交的修改写回数据库文件"""
+        if self.conn:
+            self.conn.execute("PRAGMA wal_checkpoint(FULL)")
+
+    def close(self):
+        if self.conn:
+            self.sync()
+            self.conn.close()
+            self.conn = None
+
+    def top(self, field, limit):
+        """按 field 从大到小的前 limit 个存档名（同分时按创建顺序）"""
+        return [row[0] for row in self.connect().execute(self.TOP_QUERIES[field], (limit,))]
+
+    def first_free_number(self):
+        """最小的未被使用的自动存档序号"""
+        return self.connect().execute(self.FREE_NUMBER_QUERY).fetchone()[0]
+
+
+class SaveWriter:
+    """在后台线程中写存档。
+
+    游戏线程只把序列化好的记录放入有上限的队列，写入存储后端（日志、fsync、合并存档文件，
+    或者 SQLite 事务）都在写线程中进行，磁盘延迟不会落在游戏的某一帧上。
+    队列中的记录按 coalesce_window 秒的窗口成批取出，同一存档连续的修改合并成一条，
+    一批只写一次文件（一个事务）。
+    background 为 False 时不使用线程，在调用者的线程中直接写入。
+    """
+
+    def __init__(self, storage, background=True, queue_size=256, coalesce_window=0.05):
+        self.storage = storage
+        self.background = background
+        self.coalesce_window = coalesce_window
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.lock = threading.Lock()  # 访问存储后端时持有
+        self.thread = None
+        self.exit_hook_registered = False
+
+        # 统计信息
+        self.received = 0
+        self.written = 0
+        self.batches = 0
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="SaveWriter", daemon=True)
+            self.thread.start()
+            if not self.exit_hook_registered:
+                atexit.register(self.close)
+                self.exit_hook_registered = True
+
+    def submit(self, line):
+        """提交一条序列化好的记录"""
+        self.received += 1
+        if not self.background:
+            self.write_batch([line])
+            return
+        self.start()
+        self.queue.put(line)
+
+    def submit_snapshot(self, data):
+        """用完整的存档数据替换存储后端中的所有存档"""
+        command = ("snapshot", copy.deepcopy(data))
+        if not self.background:
+            self.handle(command)
+            return
+        self.start()
+        self.queue.put(command)
+
+    def run(self):
+        while True:
+            batch = [self.queue.get()]
+            # 在合并窗口内继续收集记录，遇到命令时立即处理
+            deadline = time.monotonic() + self.coalesce_window
+            while isinstance(batch[-1], str):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            command = None if isinstance(batch[-1], str) else batch.pop()
+
+            if batch:
+                try:
+                    self.write_batch(batch)
+                except Exception as e:
+                    print(f"保存存档失败: {e}")
+            if command:
+                self.handle(command)
+            for _ in range(len(batch) + (command is not None)):
+                self.queue.task_done()
+            if command and command[0] == "stop":
+                return
+
+    def write_batch(self, lines):
+        """把一批记录写入存储后端"""
+        records = coalesce_records([json.loads(line) for line in lines])
+        with self.lock:
+            self.storage.write(records)
+        self.written += len(records)
+        self.batches += 1
+
+    def handle(self, command):
+        name, payload = command
+        try:
+            with self.lock:
+                if name == "open":
+                    self.storage.open()
+                elif name == "snapshot":
+                    self.storage.replace(payload)
+                elif name == "flush":
+                    self.storage.sync()
+                elif name == "stop":
+                    self.storage.close()
+        except Exception as e:
+            print(f"保存存档失败: {e}")
+        finally:
+            if name in ("drain", "flush", "stop"):
+                payload.set()
+
+    def open(self):
+        """让存储后端做好写入准备（例如读取副本）。后台模式下在写线程中进行，不占用游戏线程"""
+        command = ("open", None)
+        if not self.background:
+            self.handle(command)
+            return
+        self.start()
+        self.queue.put(command)
+
+    def send(self, name):
+        """发送 drain / flush / stop 命令并等待写线程处理完"""
+        done = threading.Event()
+        self.queue.put((name, done))
+        done.wait()
+
+    def query(self, method, *args):
+        """等待已提交的记录写入存储后端后调用它的查询方法"""
+        if self.thread is not None:
+            self.send("drain")
+        with self.lock:
+            return method(*args)
+
+    def flush(self):
+        """等待已提交的记录全部写入磁盘"""
+        if self.thread is None:
+            with self.lock:
+                self.storage.sync()
+        else:
+            self.send("flush")
+
+    def close(self):
+        """写完已提交的记录并停止写线程"""
+        if self.thread is None:
+            with self.lock:
+                self.storage.close()
+            return
+        self.send("stop")
+        self.thread.join()
+        self.thread = None
+
+    def get_stats(self):
+        return {"received": self.received, "written": self.written, "batches": self.batches,
+                "queued": self.queue.qsize()}
+
+
 class SaveSystem:
-    def __init__(self, save_file='game_saves.json'):
+    """存档系统。
+
+    存档数据保存在内存中（self.saves），并按小写存档名建立字典索引；每次修改只生成一条记录，
+    交给 SaveWriter 写入存储后端（storage）。默认使用 JSON 存档文件 + 追加日志（JsonSaveStorage），
+    也可以传入 SqliteSaveStorage。排行榜和自动存档名由存储后端查询。
+    文件写入都在后台线程中进行，退出游戏前需要调用 close()。
+    """
+
+    # 每局结束时 update_save 修改的字段
+    UPDATED_FIELDS = ("games_played", "total_score", "character_stats", "high_score", "total_coins",
+                      "last_played", "achievements")
+
+    def __init__(self, save_file='game_saves.json', compact_threshold=256, background=True, storage=None):
         self.save_file = save_file
+        self.storage = storage or JsonSaveStorage(save_file, compact_threshold)
         self.saves = self.load_saves()
+        self.index = self.build_index()  # 小写存档名 -> 存档
+        self.writer = SaveWriter(self.storage, background)
+        self.writer.open()
         self.current_player_name = None
         self.current_save = None
 
@@ -18,56 +643,44 @@ class SaveSystem:
 
     def load_saves(self):
         """加载所有存档"""
-        if os.path.exists(self.save_file):
-            try:
-                with open(self.save_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return data
-            except:
-                print("无法读取存档文件，将创建新存档")
-                return {"saves": [], "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-        else:
-            return {"saves": [], "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+        return self.storage.load()
+
+    def build_index(self):
+        return {save["player_name"].lower(): save for save in self.saves.get("saves", [])}
+
+    def append_record(self, op, name, **data):
+        """记录一次修改（交给写线程写入存储后端）"""
+        record = {"op": op, "name": name, "time": _now()}
+        record.update(data)
+        self.saves["last_updated"] = record["time"]
+        self.writer.submit(_dumps(record))
+        return True
 
     def save_all_saves(self):
-        """保存所有存档到文件"""
-        try:
-            self.saves["last_updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            with open(self.save_file, 'w', encoding='utf-8') as f:
-                json.dump(self.saves, f, ensure_ascii=False, indent=2)
-            return True
-        except Exception as e:
-            print(f"保存存档失败: {e}")
+        """把所有存档完整地写入存储后端（交给写线程）"""
+        self.saves["last_updated"] = _now()
+        self.index = self.build_index()
+        self.writer.submit_snapshot(self.saves)
+        return True
+
+    def update_current_save(self, **fields):
+        """修改当前存档的字段并保存（只记录这些字段）"""
+        if not self.current_save:
             return False
+        self.current_save.update(fields)
+        return self.append_record("update", self.current_save["player_name"], fields=fields)
 
-    def generate_save_name(self):
-        """生成自动存档名称"""
-        existing_saves = self.saves.get("saves", [])
-        if not existing_saves:
-            return "存档1"
-
-        # 提取所有存档的序号
-        save_numbers = []
-        for save in existing_saves:
-            name = save["player_name"]
-            if name.startswith("存档"):
-                try:
-                    # 提取"存档"后面的数字
-                    num = int(name[2:])
-                    save_numbers.append(num)
-                except ValueError:
-                    continue
-
-        # 找到最小的可用序号
-        if not save_numbers:
-            return "存档1"
+    def flush(self):
+        """等待所有修改写入磁盘"""
+        self.writer.flush()
 
-        # 从1开始找到第一个可用的序号
-        for i in range(1, max(save_numbers) + 2):
-            if i not in save_numbers:
-                return f"存档{i}"
+    def close(self):
+        """退出游戏时调用：写完所有修改并停止写线程"""
+        self.writer.close()
 
-        return f"存档{max(save_numbers) + 1}"
+    def generate_save_name(self):
+        """生成自动存档名称（最小的未被使用的序号）"""
+        return f"存档{self.writer.query(self.storage.first_free_number)}"
 
     def create_new_save(self):
         """创建新存档（自动生成名称）"""
@@ -96,10 +709,11 @@ class SaveSystem:
         }
 
         self.saves.setdefault("saves", []).append(new_save)
+        self.index[player_name.lower()] = new_save
         self.current_player_name = player_name
         self.current_save = new_save
 
-        if self.save_all_saves():
+        if self.append_record("create", player_name, save=new_save):
             print(f"已创建新存档: {player_name}")
             return True
         else:
@@ -107,12 +721,12 @@ class SaveSystem:
 
     def load_save(self, player_name):
         """加载指定玩家的存档"""
-        for save in self.saves.get("saves", []):
-            if save["player_name"].lower() == player_name.lower():
-                self.current_player_name = player_name
-                self.current_save = save
-                return True
-        return False
+        save = self.index.get(player_name.lower())
+        if save is None:
+            return False
+        self.current_player_name = player_name
+        self.current_save = save
+        return True
 
     def update_save(self, score=0, coins=0, character_id=1):
         """更新当前存档"""
@@ -145,7 +759,8 @@ class SaveSystem:
         # 检查成就
         self.check_achievements(score, coins)
 
-        return self.save_all_saves()
+        fields = {field: self.current_save[field] for field in self.UPDATED_FIELDS}
+        return self.append_record("update", self.current_save["player_name"], fields=fields)
 
     def check_achievements(self, score, coins):
         """检查并更新成就"""
@@ -176,16 +791,16 @@ class SaveSystem:
 
     def get_save_summary(self, player_name):
         """获取指定存档的摘要信息"""
-        for save in self.saves.get("saves", []):
-            if save["player_name"].lower() == player_name.lower():
-                return {
-                    "player_name": save["player_name"],
-                    "high_score": save["high_score"],
-                    "total_coins": save["total_coins"],
-                    "games_played": save["games_played"],
-                    "last_played": save["last_played"]
-                }
-        return None
+        save = self.index.get(player_name.lower())
+        if save is None:
+            return None
+        return {
+            "player_name": save["player_name"],
+            "high_score": save["high_score"],
+            "total_coins": save["total_coins"],
+            "games_played": save["games_played"],
+            "last_played": save["last_played"]
+        }
 
     def get_current_save_info(self):
         """获取当前存档信息"""
@@ -202,30 +817,25 @@ class SaveSystem:
 
     def get_leaderboard(self, limit=10):
         """获取排行榜（按最高分排序）"""
-        saves = self.saves.get("saves", [])
-        # 按最高分排序
-        sorted_saves = sorted(saves, key=lambda x: x["high_score"], reverse=True)
-        return sorted_saves[:limit]
+        names = self.writer.query(self.storage.top, "high_score", limit)
+        return [self.index[name.lower()] for name in names]
 
     def get_coins_leaderboard(self, limit=10):
         """获取金币排行榜（按总金币数排序）"""
-        saves = self.saves.get("saves", [])
-        # 按总金币数排序
-        sorted_saves = sorted(saves, key=lambda x: x["total_coins"], reverse=True)
-        return sorted_saves[:limit]
+        names = self.writer.query(self.storage.top, "total_coins", limit)
+        return [self.index[name.lower()] for name in names]
 
     def delete_save(self, player_name):
         """删除指定存档"""
-        saves = self.saves.get("saves", [])
-        for i, save in enumerate(saves):
-            if save["player_name"].lower() == player_name.lower():
-                # 如果要删除的是当前存档，清空当前存档
-                if self.current_player_name and self.current_player_name.lower() == player_name.lower():
-                    self.current_player_name = None
-                    self.current_save = None
-                saves.pop(i)
-                return self.save_all_saves()
-        return False
+        save = self.index.pop(player_name.lower(), None)
+        if save is None:
+            return False
+        # 如果要删除的是当前存档，清空当前存档
+        if self.current_player_name and self.current_player_name.lower() == player_name.lower():
+            self.current_player_name = None
+            self.current_save = None
+        self.saves["saves"].remove(save)
+        return self.append_record("delete", save["player_name"])
 
     def clear_all_saves(self):
         """清空所有存档"""
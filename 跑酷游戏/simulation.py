@@ -0,0 +1,288 @@
+# simulation.py
+"""无界面模拟模式。
+
+不打开窗口、不转换图片、不播放声音，也不限制帧率，用脚本或自动驾驶代替玩家输入，
+以 CPU 允许的最快速度驱动 update_playing / update_battle，并报告模拟帧率。
+可用于数值平衡、长时间稳定性测试和性能测试，也可以在没有显示器的服务器上运行。
+
+用法（在游戏目录下运行）:
+    python -m simulation                          # 自动驾驶跑 10000 帧
+    python -m simulation --frames 60000 --character 2
+    python -m simulation --script input.json      # 按脚本输入
+    python -m simulation --items extra_life coin_double
+    python -m simulation --seed 42               # 固定种子，结果可以完全重现
+    python -m simulation --record replays         # 每局结束后保存录像
+    python -m simulation --replay FILE            # 重放录像并校验最终分数
+    python -m simulation --replay FILE --seek 3000  # 跳转到第 3000 帧
+
+输入脚本为 JSON: {"jump": [帧号, ...], "shoot": [[开始帧, 结束帧], ...], "length": 脚本长度}
+有 length 时脚本按该长度循环。
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from main import Game
+from replay import INPUT_JUMP, GameSnapshot, Replay
+
+
+class AutoPilot:
+    """简单的自动驾驶：前方有障碍物、绵羊或怪物子弹时跳跃，有敌人时按住射击。"""
+
+    def __init__(self, jump_distance=60):
+        self.jump_distance = jump_distance
+
+    def is_threat_ahead(self, player, rect):
+        gap = rect.left - player.rect.right
+        return 0 <= gap <= self.jump_distance and rect.top < player.rect.bottom
+
+    def get_input(self, game, frame):
+        """返回这一帧的输入 (是否跳跃, 是否按住射击)"""
+        player = game.player
+        if not player:
+            return False, False
+
+        if game.state == "battle":
+            jump = player.on_ground and any(self.is_threat_ahead(player, bullet.rect)
+                                            for bullet in game.monster_bullets)
+            return jump, True
+
+        threats = [obstacle.get_rect() for obstacle in game.obstacle_manager.obstacles]
+        threats += [monster.rect for monster in game.enemy_manager.monsters]
+        jump = player.on_ground and any(self.is_threat_ahead(player, rect) for rect in threats)
+        shoot = bool(game.enemy_manager.monsters)
+        return jump, shoot
+
+
+class ScriptedInput:
+    """按脚本给出的帧号输入。"""
+
+    def __init__(self, jump_frames=(), shoot_ranges=(), length=None):
+        self.jump_frames = set(jump_frames)
+        self.shoot_ranges = [tuple(r) for r in shoot_ranges]
+        self.length = length
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data.get("jump", ()), data.get("shoot", ()), data.get("length"))
+
+    def get_input(self, game, frame):
+        if self.length:
+            frame %= self.length
+        shoot = any(start <= frame <= end for start, end in self.shoot_ranges)
+        return frame in self.jump_frames, shoot
+
+
+class Simulation:
+    """无界面地连续运行游戏，每局结束后立即开始新的一局。"""
+
+    def __init__(self, character=1, policy=None, items=(), seed=None, replay_dir=None):
+        self.game = Game(headless=True)
+        self.game.update()  # 取回同步加载好的游戏对象
+        self.game.replay_dir = replay_dir
+        self.policy = policy or AutoPilot()
+        self.character = character
+        self.seed = seed  # 第 i 局使用 seed + i，不指定时每局随机
+        self.items = [item for item in self.game.shop_items if item["type"] in items]
+
+        self.frame = 0
+        self.runs = []  # 每局结果
+        self.battles_won = 0
+        self.start_run()
+
+    def start_run(self):
+        game = self.game
+        game.reset_game()
+        game.selected_character = self.character
+        game.purchased_items = list(self.items)
+        game.start_game(None if self.seed is None else self.seed + len(self.runs))
+        self.run_start_frame = self.frame
+
+    def finish_run(self):
+        game = self.game
+        self.runs.append({
+            "seed": game.run_seed,
+            "score": int(game.score),
+            "coins": game.current_game_coins,
+            "frames": self.frame - self.run_start_frame,
+            "battles": len(game.completed_battles),
+        })
+        self.battles_won += len(game.completed_battles)
+
+    def step(self):
+        """模拟一帧"""
+        game = self.game
+        jump, shoot = self.policy.get_input(game, self.frame)
+        if jump:
+            game.pending_input |= INPUT_JUMP
+        game.held_keys = {pygame.K_f} if shoot else set()
+
+        game.update()
+        self.frame += 1
+
+        if game.state == "game_over":
+            self.finish_run()
+            self.start_run()
+
+    def run(self, frames):
+        """模拟 frames 帧，返回统计报告"""
+        start = time.perf_counter()
+        for _ in range(frames):
+            self.step()
+        elapsed = time.perf_counter() - start
+        return self.get_report(frames, elapsed)
+
+    def get_report(self, frames, elapsed):
+        scores = [run["score"] for run in self.runs]
+        fps = frames / elapsed if elapsed > 0 else 0.0
+        return {
+            "frames": frames,
+            "seconds": elapsed,
+            "fps": fps,
+            "realtime_factor": fps / self.game.target_fps,
+            "finished_runs": len(self.runs),
+            "best_score": max(scores) if scores else int(self.game.score),
+            "average_score": sum(scores) / len(scores) if scores else 0.0,
+            "average_run_frames": (sum(run["frames"] for run in self.runs) / len(self.runs)
+                                   if self.runs else 0.0),
+            "battles_won": self.battles_won,
+        }
+
+
+class ReplayPlayer:
+    """在无界面模式下快速重放录像。
+
+    重放时每隔 snapshot_interval 帧保存一次状态快照，
+    跳转时从目标帧之前最近的快照恢复，再向前模拟到目标帧。
+    """
+
+    def __init__(self, replay, snapshot_interval=600, game=None):
+        self.replay = replay
+        self.snapshot_interval = snapshot_interval
+        self.game = game or Game(headless=True)
+        self.game.update()
+        self.game.replay_dir = None  # 重放时不再录像
+
+        game = self.game
+        game.reset_game()
+        game.selected_character = replay.character
+        game.purchased_items = [item for item in game.shop_items if item["type"] in replay.items]
+        game.start_game(replay.seed)
+        self.snapshots = [GameSnapshot(game)]  # 按帧号递增
+
+    @property
+    def frame(self):
+        return self.game.simulation_frame
+
+    @property
+    def finished(self):
+        return self.frame >= len(self.replay) or self.game.state not in ("playing", "battle")
+
+    def step(self):
+        """重放一帧"""
+        game = self.game
+        game.pending_input = self.replay.inputs[self.frame]
+        game.update()
+        if self.frame % self.snapshot_interval == 0 and self.frame > self.snapshots[-1].frame:
+            self.snapshots.append(GameSnapshot(game))
+
+    def seek(self, frame):
+        """跳转到第 frame 帧（已经模拟过的位置从快照恢复）"""
+        frame = max(0, min(frame, len(self.replay)))
+        snapshot = None
+        for candidate in self.snapshots:
+            if candidate.frame > frame:
+                break
+            snapshot = candidate
+        if self.frame > frame or snapshot.frame > self.frame:
+            snapshot.restore(self.game)
+        while self.frame < frame and not self.finished:
+            self.step()
+
+    def verify(self):
+        """重放到结尾，和录像中记录的最终分数比较"""
+        while not self.finished:
+            self.step()
+        game = self.game
+        return {
+            "frames": self.frame,
+            "expected_frames": len(self.replay),
+            "score": game.score,
+            "expected_score": self.replay.final_score,
+            "coins": game.current_game_coins,
+            "expected_coins": self.replay.final_coins,
+            "ok": (self.frame == len(self.replay) and game.score == self.replay.final_score
+                   and game.current_game_coins == self.replay.final_coins),
+        }
+
+
+def play_replay(path, seek=None):
+    """命令行：重放录像文件，返回进程退出码"""
+    replay = Replay.load(path)
+    player = ReplayPlayer(replay)
+    print(f"录像: 种子 {replay.seed}，角色 {replay.character}，{len(replay)} 帧，"
+          f"分数 {int(replay.final_score)}")
+
+    if seek is not None:
+        start = time.perf_counter()
+        player.seek(seek)
+        print(f"跳转到第 {player.frame} 帧: 分数 {int(player.game.score)}，"
+              f"生命 {player.game.player_health}，用时 {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    start_frame = player.frame
+    result = player.verify()
+    elapsed = time.perf_counter() - start
+    fps = (result["frames"] - start_frame) / elapsed if elapsed > 0 else 0.0
+    print(f"重放完成: {result['frames']} 帧，{fps:.0f} FPS（实时的 {fps / player.game.target_fps:.0f} 倍）")
+    if result["ok"]:
+        print(f"校验通过: 分数 {int(result['score'])}，金币 {result['coins']}")
+        return 0
+    print(f"校验失败: 帧数 {result['frames']}/{result['expected_frames']}，"
+          f"分数 {result['score']}/{result['expected_score']}，金币 {result['coins']}/{result['expected_coins']}")
+    return 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="无界面运行游戏逻辑并报告模拟帧率")
+    parser.add_argument("--frames", type=int, default=10000, help="模拟帧数（默认: %(default)s）")
+    parser.add_argument("--character", type=int, choices=(1, 2), default=1, help="角色（默认: %(default)s）")
+    parser.add_argument("--script", help="输入脚本（JSON），不指定时使用自动驾驶")
+    parser.add_argument("--items", nargs="*", default=(),
+                        choices=("extra_life", "coin_double", "star_effect"), help="每局使用的商店物品")
+    parser.add_argument("--seed", type=int, help="随机种子（默认每局随机）")
+    parser.add_argument("--record", metavar="DIR", help="把每一局保存为录像文件")
+    parser.add_argument("--replay", metavar="FILE", help="重放录像文件并校验最终分数")
+    parser.add_argument("--seek", type=int, metavar="FRAME", help="重放时先跳转到指定帧")
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出报告")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        return play_replay(args.replay, args.seek)
+
+    policy = ScriptedInput.load(args.script) if args.script else AutoPilot()
+    simulation = Simulation(args.character, policy, args.items, args.seed, args.record)
+    report = simulation.run(args.frames)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(f"模拟 {report['frames']} 帧，用时 {report['seconds']:.2f} 秒，"
+              f"模拟帧率 {report['fps']:.0f} FPS（实时的 {report['realtime_factor']:.1f} 倍）")
+        print(f"完成 {report['finished_runs']} 局，最高分 {report['best_score']}，"
+              f"平均分 {report['average_score']:.0f}，击败怪物 {report['battles_won']} 次")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
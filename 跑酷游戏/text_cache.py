@@ -0,0 +1,69 @@
+# text_cache.py
+"""文字渲染缓存。
+
+font.render() 每次都要重新排版和光栅化文字，而界面上的大部分文字每帧都一样。
+TextCache 按 (字体, 文字, 抗锯齿, 颜色) 缓存渲染好的 Surface，
+静态标签只渲染一次，数字只有在数值变化时才会重新渲染。
+字体对象本身就对应一个固定的字号，所以键里不需要单独记录字号。
+
+注意：返回的 Surface 是共享的，调用方不能直接修改（需要修改时先 copy()）。
+"""
+
+from collections import OrderedDict
+
+
+class TextCache:
+    """带LRU淘汰和命中统计的文字渲染缓存。"""
+
+    def __init__(self, capacity=512):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+
+        # 统计信息
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font, text, antialias, color):
+        """与 font.render(text, antialias, color) 相同，但会缓存结果"""
+        key = (font, text, antialias, tuple(color))
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.entries[key] = surface
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        self.entries.clear()
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get_stats(self):
+        """获取缓存统计信息"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+            "entries": len(self.entries),
+        }
+
+
+# 全局共享的文字缓存
+text_cache = TextCache()
+
+
+def render_text(font, text, antialias, color):
+    """从全局文字缓存渲染文字"""
+    return text_cache.render(font, text, antialias, color)